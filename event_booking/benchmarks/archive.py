@@ -0,0 +1,68 @@
+"""
+Hot-table read latency as history grows, with and without archival.
+
+For each number of past days in `--history` it seeds that much history plus 30
+upcoming days, times the calendar and booking list reads, moves everything older
+than ARCHIVE_AFTER_DAYS to the archive tables (booking_app.archive) and times them
+again. Without archival the reads grow with the history; with it they stay flat:
+
+    python -m benchmarks.archive --history 0,365,1825
+"""
+import argparse
+import subprocess
+import sys
+from datetime import date, timedelta
+
+from benchmarks.common import PROJECT_DIR, measure, report, seed_calendar, setup_django
+
+UPCOMING_DAYS = 30
+
+
+def run(history, repeat):
+    from django.test import Client
+
+    from booking_app.archive import archive_cutoff, archive_history
+    from booking_app.models import EventAvailability, UserBooking
+
+    today = date.today()
+    calendar = seed_calendar(days=history + UPCOMING_DAYS, start=today - timedelta(days=history))
+    client = Client()
+    client.force_login(calendar['users'][0])
+    dates = ','.join(str(today + timedelta(days=offset)) for offset in range(7))
+    reads = [
+        ('availability, next 7 days', '/api/availability/', {'dates': dates}),
+        ('my bookings, first page', '/api/my-bookings/', {'page_size': 10}),
+        ('booking list, first page', '/api/user-bookings/', {'page_size': 10}),
+    ]
+
+    def time_reads(label):
+        hot = f'{EventAvailability.objects.count()} slots, {UserBooking.objects.count()} bookings'
+        print(f'history={history} days, {label} ({hot} in the hot tables)')
+        for name, path, query in reads:
+            assert client.get(path, query).status_code == 200, path
+            report(f'  {name}', measure(lambda: client.get(path, query), repeat))
+
+    time_reads('not archived')
+    archive_history(archive_cutoff())
+    time_reads('archived')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history', default='0,365,1825', help='Comma-separated days of past history.')
+    parser.add_argument('--repeat', type=int, default=100, help='Requests timed per read.')
+    args = parser.parse_args()
+
+    if ',' in args.history:
+        # A fresh database per history size.
+        for history in args.history.split(','):
+            subprocess.run([sys.executable, '-m', 'benchmarks.archive', '--history', history,
+                            '--repeat', str(args.repeat)], check=True, cwd=PROJECT_DIR)
+        return
+
+    setup_django(PERF_SERVER_TIMING=False)
+    run(int(args.history), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput of the sync read endpoints against their /api/async/ twins.
+
+Keeps `--concurrency` requests in flight against the project's ASGI application
+in this process, as uvicorn or daphne would with one worker, and reports requests
+per second and p50/p99 latency for each endpoint:
+
+    python -m benchmarks.async_views --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import asgi_request, percentile, seed_calendar, setup_django
+
+ENDPOINTS = ['availability', 'my-bookings', 'categories', 'timeslots', 'check-session']
+
+
+def prepare(days):
+    """
+    Seeds `days` days of slots and logs in a user who holds some of the bookings.
+
+    Returns:
+        tuple: The availability query string and the session cookie header.
+    """
+    from django.test import Client
+
+    calendar = seed_calendar(days=days, slots_per_day=24, users=1)
+    client = Client()
+    client.force_login(calendar['users'][0])
+    dates = ','.join(str(day) for day in calendar['dates'][:7])
+    return f'dates={dates}', f"sessionid={client.cookies['sessionid'].value}"
+
+
+async def load(application, path, query, cookie, concurrency, total):
+    """
+    Sends `total` requests with `concurrency` in flight.
+
+    Returns:
+        tuple: Wall-clock seconds and the latency of each request.
+    """
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client():
+        for _ in remaining:
+            started = time.perf_counter()
+            status, _ = await asgi_request(application, 'GET', path, query, [('cookie', cookie)])
+            latencies.append(time.perf_counter() - started)
+            assert status == 200, f'{path} returned {status}'
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies
+
+
+async def run(query, cookie, concurrency, total):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    for endpoint in ENDPOINTS:
+        endpoint_query = query if endpoint == 'availability' else ''
+        for prefix in ('/api/', '/api/async/'):
+            path = f'{prefix}{endpoint}/'
+            # Warm up connections and caches before timing.
+            await load(application, path, endpoint_query, cookie, concurrency, concurrency)
+            elapsed, latencies = await load(application, path, endpoint_query, cookie, concurrency, total)
+            print(f'{path:<28} {total / elapsed:8.1f} req/s  '
+                  f'p50={percentile(latencies, 50) * 1000:8.2f} ms  p99={percentile(latencies, 99) * 1000:8.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=64, help='Requests kept in flight.')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests timed per endpoint.')
+    parser.add_argument('--days', type=int, default=90, help='Days of availability to seed.')
+    args = parser.parse_args()
+
+    setup_django()
+    query, cookie = prepare(args.days)
+    asyncio.run(run(query, cookie, args.concurrency, args.requests))
+
+
+if __name__ == '__main__':
+    main()
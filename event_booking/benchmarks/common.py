@@ -0,0 +1,177 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Every script runs against a throw-away SQLite database built from the migrations,
+never against the project's db.sqlite3. Run them from the event_booking directory:
+
+    python -m benchmarks.indexes --rows 100000
+"""
+import asyncio
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, time as clock, timedelta
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None, migrate=True, **overrides):
+    """
+    Configures Django with event_booking.settings on a new SQLite file and migrates it.
+
+    Args:
+        db_path (str): Database file to use; a temporary one by default.
+        migrate (bool): Run the migrations.
+        overrides: Settings to override, e.g. BOOKING_STRATEGY='optimistic'.
+
+    Returns:
+        str: Path of the database file.
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_booking.settings')
+
+    from django.conf import settings
+    if db_path is None:
+        tmp_dir = tempfile.mkdtemp(prefix='booking-bench-')
+        atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+        db_path = os.path.join(tmp_dir, 'bench.sqlite3')
+    settings.DATABASES['default']['NAME'] = db_path
+    # DEBUG would keep every query in memory; benchmarks are not meant to be throttled.
+    for name, value in {'DEBUG': False, 'RATE_LIMITS': {}, **overrides}.items():
+        setattr(settings, name, value)
+
+    import django
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return db_path
+
+
+def seed_calendar(days, slots_per_day=24, booked_every=2, users=10, start=None, batch_size=10000):
+    """
+    Bulk-creates `days` days of single-seat availability from `start` (default today),
+    booking every `booked_every`-th slot for one of `users` users.
+
+    Returns:
+        dict: 'category', 'time_slots', 'users' and 'dates' created.
+    """
+    from booking_app.models import EventAvailability, EventCategory, TimeSlot, User
+
+    start = start or date.today()
+    category = EventCategory.objects.create(name=f'Benchmark {EventCategory.objects.count() + 1}')
+    TimeSlot.objects.bulk_create([
+        TimeSlot(start_time=clock(hour % 24, 0), end_time=clock(hour % 24, 59))
+        for hour in range(slots_per_day)
+    ])
+    time_slots = list(TimeSlot.objects.order_by('-id')[:slots_per_day])[::-1]
+    first_user = User.objects.count()
+    User.objects.bulk_create([User(username=f'bench{first_user + i}', password='!') for i in range(users)])
+    users = list(User.objects.order_by('-id')[:users])
+
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    pending, position = [], 0
+    for slot_date in dates:
+        for slot in time_slots:
+            booked = booked_every and position % booked_every == 0
+            pending.append(EventAvailability(
+                date=slot_date,
+                time_slot=slot,
+                category=category,
+                status='BOOKED' if booked else 'AVAILABLE',
+                booked_count=1 if booked else 0
+            ))
+            position += 1
+            if len(pending) >= batch_size:
+                _flush_calendar(pending, users, booked_every)
+                pending = []
+    if pending:
+        _flush_calendar(pending, users, booked_every)
+    return {'category': category, 'time_slots': time_slots, 'users': users, 'dates': dates}
+
+
+def _flush_calendar(events, users, booked_every):
+    from booking_app.models import EventAvailability, UserBooking
+
+    EventAvailability.objects.bulk_create(events)
+    if booked_every:
+        UserBooking.objects.bulk_create([
+            UserBooking(user=users[index % len(users)], event=event, status='ACTIVE')
+            for index, event in enumerate(events) if event.status == 'BOOKED'
+        ])
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def measure(func, repeat):
+    """
+    Calls `func` `repeat` times.
+
+    Returns:
+        list: Duration of each call in seconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(label, samples):
+    print(
+        f'{label:<40} n={len(samples):<6} '
+        f'p50={percentile(samples, 50) * 1000:9.2f} ms  p99={percentile(samples, 99) * 1000:9.2f} ms'
+    )
+
+
+async def asgi_request(application, method, path, query='', headers=(), body=b''):
+    """
+    Sends one HTTP request through an ASGI application in this process.
+
+    Args:
+        headers (iterable): (name, value) string pairs besides Host.
+
+    Returns:
+        Tuple (int, bytes): Response status and body.
+    """
+    request_sent = False
+    status, chunks = None, []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await application({
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'localhost')] + [(name.encode(), value.encode()) for name, value in headers],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }, receive, send)
+    return status, b''.join(chunks)
@@ -0,0 +1,83 @@
+"""
+Per-request cost of opening the database connection.
+
+Sends `--requests` requests to `--path` through Django's WSGI handler with
+CONN_MAX_AGE = 0 (settings.py: a new connection, and the SQLite PRAGMAs, every
+request) and then with the settings_prod default of 60 seconds with
+CONN_HEALTH_CHECKS, and reports requests per second, latency and connections
+opened per request:
+
+    python -m benchmarks.connections --requests 5000
+
+SQLite connects in-process, so this is the lower bound; a PostgreSQL connection
+adds a network round trip, authentication and a backend process fork.
+"""
+import argparse
+import time
+
+from benchmarks.common import percentile, setup_django
+
+
+def run(handler, environ, conn_max_age, requests):
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def get():
+        status = []
+        response = handler(dict(environ), lambda code, headers: status.append(code))
+        b''.join(response)
+        # Closing the response sends request_finished, which closes expired connections.
+        response.close()
+        assert status[0].startswith('200'), status
+
+    connections.close_all()
+    settings_dict = connections['default'].settings_dict
+    settings_dict['CONN_MAX_AGE'] = conn_max_age
+    settings_dict['CONN_HEALTH_CHECKS'] = bool(conn_max_age)
+    for _ in range(10):
+        get()
+
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    connection_created.connect(count)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        get()
+        latencies.append(time.perf_counter() - request_started)
+    elapsed = time.perf_counter() - started
+    connection_created.disconnect(count)
+
+    label = f'CONN_MAX_AGE={conn_max_age}'
+    print(f'{label:<18} {requests / elapsed:8.0f} req/s  connections/request={len(opened) / requests:.2f}  '
+          f'p50={percentile(latencies, 50) * 1000:.2f} ms  p99={percentile(latencies, 99) * 1000:.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--path', default='/api/check-session/', help='Endpoint to request, logged in.')
+    args = parser.parse_args()
+
+    setup_django(PERF_SERVER_TIMING=False)
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import Client, RequestFactory
+
+    from booking_app.models import User
+
+    # The test client keeps connections open across requests, so it only logs in.
+    client = Client()
+    client.force_login(User.objects.create_user(username='member', password='member'))
+    cookie = f"sessionid={client.cookies['sessionid'].value}"
+    environ = RequestFactory().get(args.path, HTTP_COOKIE=cookie).environ
+    handler = WSGIHandler()
+    for conn_max_age in (0, 60):
+        run(handler, environ, conn_max_age, args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Booking contention: `--threads` users race for the same `--slots` slots, each
+trying every slot in its own random order. For every BOOKING_STRATEGY it checks
+that each slot ended up with exactly one ACTIVE booking and reports bookings and
+attempts per second:
+
+    python -m benchmarks.contention --threads 16 --slots 200
+"""
+import argparse
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import PROJECT_DIR, seed_calendar, setup_django
+
+
+def run(strategy, threads, slots):
+    from django.db import close_old_connections
+    from django.db.models import Count, Q
+
+    from booking_app.managers.user_manager import UserBookingManager
+    from booking_app.models import EventAvailability, User
+
+    seed_calendar(days=(slots + 23) // 24, slots_per_day=24, booked_every=0)
+    targets = list(EventAvailability.objects.order_by('id').values_list('date', 'time_slot_id', 'category_id')[:slots])
+    users = [User.objects.create_user(username=f'racer{index}', password='racer') for index in range(threads)]
+
+    outcomes = Counter()
+    outcomes_lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def racer(user, seed):
+        order = targets[:]
+        random.Random(seed).shuffle(order)
+        barrier.wait()
+        try:
+            for slot_date, slot_id, category_id in order:
+                _, code = UserBookingManager.create_booking(user, {
+                    'date': slot_date.isoformat(), 'time_slot': slot_id, 'categoryId': category_id
+                })
+                with outcomes_lock:
+                    outcomes[code] += 1
+        finally:
+            close_old_connections()
+
+    workers = [threading.Thread(target=racer, args=(user, index)) for index, user in enumerate(users)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    per_slot = EventAvailability.objects.order_by('id').annotate(
+        active=Count('user_booking', filter=Q(user_booking__status='ACTIVE'))
+    ).values_list('active', 'booked_count')[:slots]
+    oversold = sum(1 for active, booked in per_slot if active > 1 or active != booked)
+    unsold = sum(1 for active, _ in per_slot if active == 0)
+    attempts = sum(outcomes.values())
+
+    print(f'{strategy:<11} threads={threads:<3} slots={slots:<5} '
+          f'bookings={outcomes[201]:<5} ({outcomes[201] / elapsed:7.1f}/s)  '
+          f'attempts={attempts} ({attempts / elapsed:7.1f}/s)  '
+          f'oversold={oversold} unsold={unsold}')
+    if oversold or outcomes[201] != slots - unsold:
+        sys.exit(f'{strategy}: more than one winner for a slot')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--slots', type=int, default=200)
+    parser.add_argument('--strategy', choices=['locking', 'optimistic', 'all'], default='all')
+    args = parser.parse_args()
+
+    if args.strategy == 'all':
+        for strategy in ('locking', 'optimistic'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.contention', '--threads', str(args.threads),
+                            '--slots', str(args.slots), '--strategy', strategy], check=True, cwd=PROJECT_DIR)
+        return
+
+    setup_django(BOOKING_STRATEGY=args.strategy)
+    run(args.strategy, args.threads, args.slots)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Admission fairness under a booking flood.
+
+`--greedy` clients each hammer POST /api/user-bookings/ from `--greedy-threads`
+threads while `--clients` ordinary clients send `--client-rate` requests per second
+from one thread each, every client with its own user and IP. For each run (rate limits off, then on) it reports how the
+admitted requests were shared out (Jain's fairness index, 1.0 = equal shares), the
+part of the ordinary clients' requests that got through and their latency, how many requests were refused with 429 and
+how many failed because the SQLite writer lock timed out:
+
+    python -m benchmarks.fairness --duration 10
+"""
+import argparse
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import PROJECT_DIR, percentile, seed_calendar, setup_django
+
+
+def jain_index(values):
+    values = list(values)
+    return sum(values) ** 2 / (len(values) * sum(value * value for value in values)) if any(values) else 1.0
+
+
+def run(label, clients, client_rate, greedy, greedy_threads, duration):
+    from django.db import OperationalError, close_old_connections
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from booking_app.models import EventAvailability, User
+    from booking_app.views import UserBookingAPIView
+
+    seed_calendar(days=2000, slots_per_day=24, booked_every=0)
+    free = list(EventAvailability.objects.values_list('date', 'time_slot_id', 'category_id'))
+    random.Random(0).shuffle(free)
+    slots = iter(free)
+    slots_lock = threading.Lock()
+
+    users = [User.objects.create_user(username=f'client{index}', password='client')
+             for index in range(clients + greedy)]
+    factory = APIRequestFactory()
+    view = UserBookingAPIView.as_view()
+    admitted, refused, failed = Counter(), Counter(), Counter()
+    latencies = {user.pk: [] for user in users}
+    stats_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(user, address, interval):
+        try:
+            while time.perf_counter() < deadline:
+                next_request = time.perf_counter() + interval
+                with slots_lock:
+                    slot_date, slot_id, category_id = next(slots)
+                request = factory.post('/api/user-bookings/', {
+                    'date': slot_date.isoformat(), 'time_slot': slot_id, 'categoryId': category_id
+                }, format='json', REMOTE_ADDR=address)
+                force_authenticate(request, user)
+                started = time.perf_counter()
+                try:
+                    code = view(request).status_code
+                except OperationalError:
+                    # The writer lock was not granted within busy_timeout.
+                    code = 500
+                elapsed = time.perf_counter() - started
+                with stats_lock:
+                    if code == 429:
+                        refused[user.pk] += 1
+                    elif code >= 500:
+                        failed[user.pk] += 1
+                    else:
+                        admitted[user.pk] += 1
+                        latencies[user.pk].append(elapsed)
+                # Greedy clients retry refused requests after a short pause.
+                time.sleep(max(next_request - time.perf_counter(), 0.05 if code == 429 else 0))
+        finally:
+            close_old_connections()
+
+    workers = []
+    for index, user in enumerate(users):
+        threads, interval = (greedy_threads, 0) if index >= clients else (1, 1 / client_rate)
+        address = f'10.0.{index // 256}.{index % 256}'
+        workers += [threading.Thread(target=client, args=(user, address, interval)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    ordinary = [user.pk for user in users[:clients]]
+    total = sum(admitted.values())
+    ordinary_latency = [sample for pk in ordinary for sample in latencies[pk]]
+    print(f'{label:<12} admitted={total:<6} ({total / duration:6.1f}/s)  refused={sum(refused.values()):<6} '
+          f'failed={sum(failed.values())} (ordinary {sum(failed[pk] for pk in ordinary)})  '
+          f'fairness={jain_index(admitted[user.pk] for user in users):.2f}  '
+          f'ordinary demand served={sum(admitted[pk] for pk in ordinary) / (clients * client_rate * duration):5.1%}  '
+          f'ordinary p50={percentile(ordinary_latency, 50) * 1000:.1f} ms '
+          f'p99={percentile(ordinary_latency, 99) * 1000:.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16, help='Ordinary clients, one thread each.')
+    parser.add_argument('--client-rate', type=float, default=2.0, help='Requests per second per ordinary client.')
+    parser.add_argument('--greedy', type=int, default=2, help='Clients flooding the endpoint.')
+    parser.add_argument('--greedy-threads', type=int, default=16, help='Threads per greedy client.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run.')
+    parser.add_argument('--rate', default='5/s', help="Per-user budget when limits are on; the IP budget is twice it.")
+    parser.add_argument('--limits', choices=['off', 'on', 'both'], default='both')
+    args = parser.parse_args()
+
+    if args.limits == 'both':
+        for limits in ('off', 'on'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.fairness', '--clients', str(args.clients),
+                            '--client-rate', str(args.client_rate),
+                            '--greedy', str(args.greedy), '--greedy-threads', str(args.greedy_threads),
+                            '--duration', str(args.duration), '--rate', args.rate, '--limits', limits],
+                           check=True, cwd=PROJECT_DIR)
+        return
+
+    count, period = args.rate.split('/')
+    rate_limits = {'booking': {'user': args.rate, 'ip': f'{int(count) * 2}/{period}'}} if args.limits == 'on' else {}
+    setup_django(RATE_LIMITS=rate_limits)
+    run(f'limits {args.limits}', args.clients, args.client_rate, args.greedy, args.greedy_threads, args.duration)
+
+
+if __name__ == '__main__':
+    main()
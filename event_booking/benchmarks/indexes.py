@@ -0,0 +1,120 @@
+"""
+Create-booking and fetch-availability latency with and without the hot-path
+indexes and constraints of migration 0005.
+
+Seeds `--rows` availability slots (half of them booked) into a fresh database for
+each schema and reports p50/p99 latency:
+
+    python -m benchmarks.indexes --rows 1000000
+"""
+import argparse
+import random
+import re
+
+from benchmarks.common import PROJECT_DIR, measure, report, seed_calendar, setup_django
+
+SLOTS_PER_DAY = 24
+
+# Added by 0005 (the one-ACTIVE-booking constraint is now per event and user).
+HOT_PATH_INDEXES = [
+    'user_booking_event_status_idx',
+    'user_booking_user_booked_idx',
+    'unique_active_booking_per_event_user',
+]
+HOT_PATH_TABLE_CONSTRAINT = r',\s*CONSTRAINT "unique_availability_date_slot" UNIQUE \("date", "time_slot_id"\)'
+
+
+def drop_hot_path_indexes(connection):
+    """
+    Returns the schema to its state before 0005: drops its indexes and rebuilds
+    event_availability without the inline (date, time_slot) unique constraint.
+    """
+    with connection.cursor() as cursor:
+        for name in HOT_PATH_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'event_availability'")
+        table_sql = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'event_availability' AND sql IS NOT NULL"
+        )
+        index_sql = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute('PRAGMA foreign_keys = OFF')
+        cursor.execute(re.sub(HOT_PATH_TABLE_CONSTRAINT, '', table_sql).replace(
+            'CREATE TABLE "event_availability"', 'CREATE TABLE "new__event_availability"'
+        ))
+        cursor.execute('INSERT INTO new__event_availability SELECT * FROM event_availability')
+        cursor.execute('DROP TABLE event_availability')
+        cursor.execute('ALTER TABLE new__event_availability RENAME TO event_availability')
+        for sql in index_sql:
+            cursor.execute(sql)
+        cursor.execute('PRAGMA foreign_keys = ON')
+
+
+def run(rows, samples, with_indexes):
+    from django.db import connection
+    from django.test import RequestFactory
+
+    from booking_app.managers.booking_manager import EventBookingManager
+    from booking_app.managers.user_manager import UserBookingManager
+    from booking_app.models import EventAvailability, User
+
+    if not with_indexes:
+        drop_hot_path_indexes(connection)
+
+    calendar = seed_calendar(rows // SLOTS_PER_DAY, SLOTS_PER_DAY)
+    label = 'with indexes' if with_indexes else 'without indexes'
+    rng = random.Random(0)
+
+    free = list(EventAvailability.objects.filter(status='AVAILABLE').values_list(
+        'date', 'time_slot_id', 'category_id'
+    ))
+    rng.shuffle(free)
+    bookings = iter(free[:samples])
+    booker = User.objects.create_user(username='benchmark', password='benchmark')
+
+    def book():
+        slot_date, slot_id, category_id = next(bookings)
+        body, code = UserBookingManager.create_booking(booker, {
+            'date': slot_date.isoformat(), 'time_slot': slot_id, 'categoryId': category_id
+        })
+        assert code == 201, body
+
+    report(f'create booking ({label})', measure(book, samples))
+
+    factory = RequestFactory()
+    dates = calendar['dates']
+
+    def fetch():
+        start = rng.randrange(len(dates) - 7)
+        request = factory.get('/api/availability/', {'dates': ','.join(str(day) for day in dates[start:start + 7])})
+        request.user = booker
+        result = EventBookingManager.fetch_availability(request)
+        assert result['status'] == 200
+
+    report(f'fetch availability, 7 days ({label})', measure(fetch, samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Availability rows to seed.')
+    parser.add_argument('--samples', type=int, default=200, help='Requests timed per path.')
+    parser.add_argument('--schema', choices=['before', 'after', 'both'], default='both')
+    args = parser.parse_args()
+
+    if args.schema == 'both':
+        # A fresh process per schema, so each gets its own database and connection.
+        import subprocess
+        import sys
+        for schema in ('before', 'after'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.indexes', '--rows', str(args.rows),
+                            '--samples', str(args.samples), '--schema', schema], check=True, cwd=PROJECT_DIR)
+        return
+
+    setup_django()
+    run(args.rows, args.samples, with_indexes=args.schema == 'after')
+
+
+if __name__ == '__main__':
+    main()
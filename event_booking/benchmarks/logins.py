@@ -0,0 +1,119 @@
+"""
+Logins per second per core.
+
+First times booking_app.hashing.verify_password on one core for each
+PASSWORD_HASH_ITERATIONS in `--iterations`; that is the ceiling for logins per
+second per core. Then sends `--logins` concurrent logins to /api/async/login/
+through the ASGI application for each PASSWORD_HASH_WORKERS in `--workers`
+(0 hashes on threads), while a probe requests /api/async/check-session/ every
+10 ms to show whether hashing stalls other requests:
+
+    python -m benchmarks.logins --iterations 600000,100000 --workers 0,1,2
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_DIR, asgi_request, percentile, setup_django
+
+CSRF_TOKEN = 'benchmarkcsrftokenbenchmarkcsrft'
+PASSWORD = 'correct horse battery staple'
+
+
+def hash_rate(iterations, seconds=3.0):
+    from django.conf import settings
+
+    from booking_app.hashing import hash_password, verify_password
+
+    settings.PASSWORD_HASH_ITERATIONS = iterations
+    encoded = hash_password(PASSWORD)
+    checks, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        assert verify_password(PASSWORD, encoded)[0]
+        checks += 1
+    rate = checks / (time.perf_counter() - started)
+    print(f'iterations={iterations:<8} {rate:8.1f} logins/s/core  ({1000 / rate:.1f} ms per hash)')
+
+
+async def login_burst(logins, concurrency):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    headers = [
+        ('content-type', 'application/json'),
+        ('cookie', f'csrftoken={CSRF_TOKEN}'),
+        ('x-csrftoken', CSRF_TOKEN),
+    ]
+    body = json.dumps({'email': 'member', 'password': PASSWORD}).encode()
+    remaining = iter(range(logins))
+    done = asyncio.Event()
+    probes = []
+
+    async def client():
+        for _ in remaining:
+            status, content = await asgi_request(application, 'POST', '/api/async/login/', headers=headers, body=body)
+            assert status == 200, content
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asgi_request(application, 'GET', '/api/async/check-session/')
+            probes.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    # Warm up the pool and the connection.
+    await asgi_request(application, 'POST', '/api/async/login/', headers=headers, body=body)
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return elapsed, probes
+
+
+def run_logins(workers, logins, concurrency):
+    from booking_app.models import User
+
+    User.objects.create_user(username='member', password=PASSWORD)
+    elapsed, probes = asyncio.run(login_burst(logins, concurrency))
+    cores = min(workers, len(os.sched_getaffinity(0))) if workers else len(os.sched_getaffinity(0))
+    label = f'{workers} hash processes' if workers else 'hashing on threads'
+    print(f'{label:<20} {logins / elapsed:7.1f} logins/s  {logins / elapsed / cores:7.1f} logins/s/core  '
+          f'check-session during burst p50={percentile(probes, 50) * 1000:.1f} ms '
+          f'p99={percentile(probes, 99) * 1000:.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', default='600000,260000,100000',
+                        help='Comma-separated PBKDF2 iteration counts for the hash rate.')
+    parser.add_argument('--workers', default='0,1,2', help='Comma-separated PASSWORD_HASH_WORKERS values.')
+    parser.add_argument('--logins', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--run-workers', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    iterations = [int(value) for value in args.iterations.split(',')]
+
+    if args.run_workers is not None:
+        setup_django(PASSWORD_HASH_WORKERS=args.run_workers, PASSWORD_HASH_ITERATIONS=iterations[0])
+        run_logins(args.run_workers, args.logins, args.concurrency)
+        return
+
+    setup_django(migrate=False)
+    print(f'{len(os.sched_getaffinity(0))} CPU core(s) available')
+    for count in iterations:
+        hash_rate(count)
+    # A fresh process per pool size, as the hashing pool is created once per process.
+    for workers in args.workers.split(','):
+        subprocess.run([sys.executable, '-m', 'benchmarks.logins', '--iterations', str(iterations[0]),
+                        '--logins', str(args.logins), '--concurrency', str(args.concurrency),
+                        '--run-workers', workers], check=True, cwd=PROJECT_DIR)
+
+
+if __name__ == '__main__':
+    main()
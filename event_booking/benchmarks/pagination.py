@@ -0,0 +1,69 @@
+"""
+/api/user-bookings/ page latency by depth, page number (OFFSET) against cursor
+(keyset) pagination.
+
+Seeds `--rows` bookings and times pages starting at several depths into the list:
+
+    python -m benchmarks.pagination --rows 1000000
+"""
+import argparse
+
+from benchmarks.common import measure, report, seed_calendar, setup_django
+
+SLOTS_PER_DAY = 24
+DEPTHS = (0, 0.01, 0.1, 0.5, 0.9)
+
+
+def run(rows, page_size, samples):
+    from django.db import connection
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from booking_app.models import UserBooking
+    from booking_app.paginator import encode_cursor
+    from booking_app.views import UserBookingAPIView
+
+    calendar = seed_calendar(rows // SLOTS_PER_DAY, SLOTS_PER_DAY, booked_every=1)
+    # bulk_create stamps every booking with nearly the same booked_at; spread them out
+    # a second apart, as real bookings would be.
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE user_booking SET booked_at = datetime('2024-01-01', '+' || id || ' seconds')")
+    user = calendar['users'][0]
+    total = UserBooking.objects.count()
+    factory = APIRequestFactory()
+    view = UserBookingAPIView.as_view()
+
+    def timed_page(params):
+        def fetch():
+            request = factory.get('/api/user-bookings/', params)
+            force_authenticate(request, user)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            assert len(response.data['data']) == page_size
+        return measure(fetch, samples)
+
+    newest_first = UserBooking.objects.order_by('-booked_at', '-id')
+    for depth in DEPTHS:
+        offset = min(int(total * depth), total - page_size - 1)
+        page = offset // page_size + 1
+        report(f'offset page {page:<8} ({depth:>4.0%} deep)', timed_page({'page': page, 'page_size': page_size}))
+
+        params = {'pagination': 'cursor', 'page_size': page_size}
+        if offset:
+            # The cursor a client would hold after reading `offset` rows.
+            params['cursor'] = encode_cursor(list(newest_first.values_list('booked_at', 'id')[offset - 1]))
+        report(f'cursor at row {offset:<7} ({depth:>4.0%} deep)', timed_page(params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Bookings to seed.')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=50, help='Requests timed per depth.')
+    args = parser.parse_args()
+
+    setup_django(FAST_SERIALIZATION=True)
+    run(args.rows, args.page_size, args.samples)
+
+
+if __name__ == '__main__':
+    main()
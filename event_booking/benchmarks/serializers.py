@@ -0,0 +1,76 @@
+"""
+Serialization throughput of booking_app.fast_serializers against the DRF serializers
+they replace, including the queries each one needs.
+
+Seeds `--rows` booked slots and reports the time per 10k rows and rows per second
+for availability, booking list and my-bookings responses:
+
+    python -m benchmarks.serializers --rows 50000
+"""
+import argparse
+
+from benchmarks.common import measure, seed_calendar, setup_django
+
+SLOTS_PER_DAY = 24
+
+
+def compare(label, rows, drf, fast, repeat):
+    results = {}
+    for name, func in (('drf', drf), ('fast', fast)):
+        best = min(measure(func, repeat))
+        results[name] = best
+        print(f'{label:<14} {name:<5} {best / rows * 10000 * 1000:9.1f} ms/10k rows  {rows / best:12,.0f} rows/s')
+    print(f'{label:<14} speed-up x{results["drf"] / results["fast"]:.1f}')
+
+
+def run(rows, repeat):
+    from booking_app import fast_serializers
+    from booking_app.managers.booking_manager import EventBookingManager
+    from booking_app.managers.user_manager import UserBookingManager
+    from booking_app.models import EventAvailability, UserBooking
+    from booking_app.serializers import EventAvailabilitySerializer, UserBookingSerializer, UserMyBookingSerializer
+
+    # Every slot booked, all by one user, so each response below has `rows` rows.
+    calendar = seed_calendar(rows // SLOTS_PER_DAY, SLOTS_PER_DAY, booked_every=1, users=1)
+    dates, user = calendar['dates'], calendar['users'][0]
+    rows = UserBooking.objects.count()
+
+    slots = EventAvailability.objects.filter(date__in=dates)
+    compare(
+        'availability', rows,
+        lambda: EventAvailabilitySerializer(EventBookingManager.availability_queryset(dates, user), many=True).data,
+        lambda: fast_serializers.serialize_availability(
+            fast_serializers.availability_values(slots, user), fast_serializers.active_booker_values(slots)
+        ),
+        repeat
+    )
+
+    bookings = UserBooking.objects.select_related('event__category', 'event__time_slot', 'user').order_by('-id')
+    compare(
+        'bookings', rows,
+        lambda: UserBookingSerializer(bookings, many=True).data,
+        lambda: fast_serializers.serialize_bookings(fast_serializers.booking_values(bookings)),
+        repeat
+    )
+
+    my_bookings = UserBookingManager.get_user_bookings(user).order_by('-id')
+    compare(
+        'my bookings', rows,
+        lambda: UserMyBookingSerializer(list(my_bookings), many=True).data,
+        lambda: fast_serializers.serialize_my_bookings(list(my_bookings)),
+        repeat
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help='Booked slots to seed.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per serializer; the best is reported.')
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+/api/check-session/ throughput and queries per request for each session engine,
+with and without the per-process user cache (booking_app.auth_backends):
+
+    python -m benchmarks.sessions --requests 5000
+
+cached_db runs on the default LocMemCache here, which is only sound for a single
+process; deployments point it at a shared cache (see settings_prod).
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_DIR, percentile, setup_django
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+CONFIGURATIONS = [('db', 0), ('db', 30), ('cached_db', 30), ('signed_cookies', 30)]
+
+
+def run(label, requests):
+    from django.db import connection
+    from django.test import Client
+
+    from booking_app.models import User
+
+    client = Client()
+    client.force_login(User.objects.create_user(username='member', password='member'))
+    for _ in range(10):
+        client.get('/api/check-session/')
+
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = client.get('/api/check-session/')
+    assert response.json()['authenticated'], response.content
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        client.get('/api/check-session/')
+        latencies.append(time.perf_counter() - request_started)
+    elapsed = time.perf_counter() - started
+    print(f'{label:<36} {requests / elapsed:8.0f} req/s  queries/request={len(queries)}  '
+          f'p50={percentile(latencies, 50) * 1000:.2f} ms  p99={percentile(latencies, 99) * 1000:.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--engine', choices=list(ENGINES))
+    parser.add_argument('--user-cache-ttl', type=int, default=30, help='USER_CACHE_TTL; 0 disables the user cache.')
+    args = parser.parse_args()
+
+    if args.engine is None:
+        # A fresh process per configuration: SessionMiddleware reads SESSION_ENGINE once.
+        for engine, ttl in CONFIGURATIONS:
+            subprocess.run([sys.executable, '-m', 'benchmarks.sessions', '--requests', str(args.requests),
+                            '--engine', engine, '--user-cache-ttl', str(ttl)], check=True, cwd=PROJECT_DIR)
+        return
+
+    setup_django(SESSION_ENGINE=ENGINES[args.engine], USER_CACHE_TTL=args.user_cache_ttl,
+                 PERF_SERVER_TIMING=False)
+    cache = 'user cache' if args.user_cache_ttl else 'no user cache'
+    run(f'{args.engine} sessions, {cache}', args.requests)
+
+
+if __name__ == '__main__':
+    main()
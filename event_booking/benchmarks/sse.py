@@ -0,0 +1,167 @@
+"""
+Idle Server-Sent Events subscribers on one ASGI worker.
+
+Opens `--subscribers` concurrent /api/availability/events/ streams against the
+project's ASGI application in this process (one event loop, as under a single
+uvicorn worker). It reports memory per subscriber, the CPU used while they idle,
+and how long each published slot change takes to reach all of them:
+
+    python -m benchmarks.sse --subscribers 5000
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from benchmarks.common import seed_calendar, setup_django
+
+
+def rss_kib():
+    """
+    Resident set size of this process in KiB (Linux), or None elsewhere.
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class Streams:
+    """
+    Drives SSE requests through an ASGI application and counts what they receive.
+    """
+
+    def __init__(self, application, path, cookie):
+        self.application = application
+        self.path, _, self.query = path.partition('?')
+        self.cookie = cookie
+        self.opened = 0
+        self.events = 0
+        self.changed = asyncio.Event()
+
+    async def open(self):
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Idle client: never disconnects until cancelled.
+            await asyncio.Future()
+
+        async def send(message):
+            body = message.get('body', b'') if message['type'] == 'http.response.body' else b''
+            if body.startswith(b'retry:'):
+                self.opened += 1
+            elif body.startswith(b'event: slot'):
+                self.events += 1
+            else:
+                return
+            self.changed.set()
+
+        await self.application({
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': self.path,
+            'raw_path': self.path.encode(),
+            'query_string': self.query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'cookie', self.cookie.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }, receive, send)
+
+    async def wait_for(self, condition, timeout=120):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            self.changed.clear()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError('subscribers did not catch up')
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+
+def prepare():
+    """
+    Seeds a week of slots and logs a user in.
+
+    Returns:
+        tuple: The seeded calendar and the session cookie header of the user.
+    """
+    from django.test import Client
+
+    from booking_app.models import User
+
+    calendar = seed_calendar(days=7, slots_per_day=8, booked_every=0)
+    client = Client()
+    client.force_login(User.objects.create_user(username='subscriber', password='subscriber'))
+    return calendar, f"sessionid={client.cookies['sessionid'].value}"
+
+
+async def run(calendar, cookie, subscribers, events, idle_seconds):
+    from django.core.asgi import get_asgi_application
+
+    from booking_app.broadcaster import get_broadcaster
+
+    dates = ','.join(str(day) for day in calendar['dates'])
+
+    streams = Streams(get_asgi_application(), f'/api/availability/events/?dates={dates}', cookie)
+    baseline = rss_kib()
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(streams.open()) for _ in range(subscribers)]
+    await streams.wait_for(lambda: streams.opened == subscribers)
+    print(f'{subscribers} subscribers connected in {time.perf_counter() - started:.1f} s')
+    if baseline is not None:
+        print(f'memory: +{(rss_kib() - baseline) / 1024:.1f} MiB, '
+              f'{(rss_kib() - baseline) / subscribers:.1f} KiB per subscriber')
+
+    cpu_before = time.process_time()
+    await asyncio.sleep(idle_seconds)
+    print(f'idle CPU: {(time.process_time() - cpu_before) / idle_seconds * 100:.1f}% '
+          f'over {idle_seconds} s')
+
+    broadcaster = get_broadcaster()
+    latencies = []
+    for index in range(events):
+        event = {'date': str(calendar['dates'][0]), 'time_slot': calendar['time_slots'][0].id,
+                 'category': calendar['category'].id, 'status': 'BOOKED' if index % 2 else 'AVAILABLE'}
+        published = time.perf_counter()
+        # Published from another thread, as the booking views do after commit.
+        threading.Thread(target=broadcaster.publish, args=(event,)).start()
+        await streams.wait_for(lambda: streams.events == subscribers * (index + 1))
+        latencies.append(time.perf_counter() - published)
+    print(f'fan-out to all subscribers: avg {sum(latencies) / len(latencies) * 1000:.1f} ms, '
+          f'max {max(latencies) * 1000:.1f} ms over {events} events')
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    remaining = sum(len(subscriptions) for subscriptions in broadcaster._subscriptions.values())
+    print(f'subscriptions left after disconnect: {remaining}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=10, help='Slot changes to publish.')
+    parser.add_argument('--idle', type=float, default=5.0, help='Seconds to measure idle CPU for.')
+    args = parser.parse_args()
+
+    setup_django(SLOT_EVENTS_KEEPALIVE=15, SLOT_EVENTS_MAX_AGE=3600)
+    calendar, cookie = prepare()
+    asyncio.run(run(calendar, cookie, args.subscribers, args.events, args.idle))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Multi-process write contention on one SQLite file.
+
+`--processes` processes, as separate web workers would be, each book and then
+cancel their own slots through UserBookingManager for `--duration` seconds, so
+they only compete for SQLite's single writer lock. For each profile it reports
+writes per second, p99 write latency and the writes that failed to get the lock:
+
+- default: Django's SQLite backend with no PRAGMAs (rollback journal, deferred
+  transactions that fail when they try to upgrade to a write lock);
+- tuned:   booking_app.db_backends.sqlite3 with BEGIN IMMEDIATE and the
+  settings_prod PRAGMAs (WAL, synchronous=NORMAL, busy_timeout, mmap, cache).
+
+    python -m benchmarks.writes --processes 8 --duration 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_DIR, percentile, seed_calendar, setup_django
+
+PROFILES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'SQLITE_PRAGMAS': {},
+    },
+    'tuned': {
+        'ENGINE': 'booking_app.db_backends.sqlite3',
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'mmap_size': 134217728,
+            'cache_size': -20000,
+        },
+    },
+}
+
+
+def configure(profile, db_path=None, migrate=True):
+    engine = PROFILES[profile]['ENGINE']
+    path = setup_django(db_path=db_path, migrate=False, SQLITE_PRAGMAS=PROFILES[profile]['SQLITE_PRAGMAS'])
+    from django.conf import settings
+    settings.DATABASES['default']['ENGINE'] = engine
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return path
+
+
+def worker(index, processes, start_at, duration):
+    """
+    Books and cancels this worker's share of the slots until the deadline.
+
+    Prints:
+        JSON with the number of writes, the lock failures and each write's latency.
+    """
+    from django.db import OperationalError
+
+    from booking_app.managers.user_manager import UserBookingManager
+    from booking_app.models import EventAvailability, User, UserBooking
+
+    user = User.objects.get(username=f'writer{index}')
+    slots = list(EventAvailability.objects.order_by('id').values_list('id', 'date', 'time_slot_id', 'category_id'))
+    slots = slots[index::processes]
+    writes, failed, latencies = 0, 0, []
+
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = time.perf_counter() + duration
+    position = 0
+    while time.perf_counter() < deadline:
+        event_id, slot_date, slot_id, category_id = slots[position % len(slots)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            body, _ = UserBookingManager.create_booking(user, {
+                'date': slot_date.isoformat(), 'time_slot': slot_id, 'categoryId': category_id
+            })
+            if body.get('result') != 'Success':
+                # create_booking reports a lock it could not get as a failed booking.
+                failed += 1
+                continue
+            booking_id = UserBooking.objects.filter(user=user, event_id=event_id, status='ACTIVE').values_list(
+                'id', flat=True
+            ).first()
+            UserBookingManager.cancel_booking(user, booking_id)
+        except OperationalError:
+            failed += 1
+            continue
+        writes += 2
+        latencies.append((time.perf_counter() - started) / 2)
+    print(json.dumps({'writes': writes, 'failed': failed, 'latencies': latencies}))
+
+
+def run(profile, processes, duration, slots):
+    db_path = configure(profile)
+    seed_calendar(days=(slots + 23) // 24, slots_per_day=24, booked_every=0)
+    from booking_app.models import User
+    User.objects.bulk_create([User(username=f'writer{index}', password='!') for index in range(processes)])
+
+    from django.db import connections
+    connections.close_all()
+    start_at = time.time() + 3
+    workers = [
+        subprocess.Popen([sys.executable, '-m', 'benchmarks.writes', '--profile', profile, '--db', db_path,
+                          '--worker', str(index), '--processes', str(processes), '--start-at', str(start_at),
+                          '--duration', str(duration)], stdout=subprocess.PIPE, text=True, cwd=PROJECT_DIR)
+        for index in range(processes)
+    ]
+    results = []
+    for process in workers:
+        output, _ = process.communicate()
+        if process.returncode:
+            sys.exit(f'{profile}: a worker failed')
+        results.append(json.loads(output.splitlines()[-1]))
+
+    writes = sum(result['writes'] for result in results)
+    failed = sum(result['failed'] for result in results)
+    latencies = [sample for result in results for sample in result['latencies']]
+    print(f'{profile:<8} processes={processes:<3} writes={writes:<6} ({writes / duration:7.1f}/s)  '
+          f'lock failures={failed:<6} ({failed / max(writes + failed, 1):5.1%})  '
+          f'p50={percentile(latencies or [0], 50) * 1000:.1f} ms  p99={percentile(latencies or [0], 99) * 1000:.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per profile.')
+    parser.add_argument('--slots', type=int, default=2400)
+    parser.add_argument('--profile', choices=[*PROFILES, 'all'], default='all')
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        configure(args.profile, args.db, migrate=False)
+        worker(args.worker, args.processes, args.start_at, args.duration)
+        return
+
+    # A fresh process and database per profile: journal_mode=WAL is stored in the file.
+    if args.profile == 'all':
+        for profile in PROFILES:
+            subprocess.run([sys.executable, '-m', 'benchmarks.writes', '--processes', str(args.processes),
+                            '--duration', str(args.duration), '--slots', str(args.slots), '--profile', profile],
+                           check=True, cwd=PROJECT_DIR)
+        return
+
+    run(args.profile, args.processes, args.duration, args.slots)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class BookingAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'booking_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
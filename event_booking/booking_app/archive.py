@@ -0,0 +1,78 @@
+"""
+Archival of past availability and bookings.
+
+Slots dated before the cutoff are moved, together with their bookings, from
+event_availability and user_booking into event_availability_archive and
+user_booking_archive, so the hot tables read by the calendar and the booking lists
+only hold recent and upcoming dates. Rows move in small batches, each in its own
+short transaction, so bookings are never held up for long.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from .db import write_atomic
+from .models import ArchivedEventAvailability, ArchivedUserBooking, EventAvailability, UserBooking, Waitlist
+
+
+def archive_cutoff(days=None):
+    """
+    First date kept in the hot tables: today minus `days` (settings.ARCHIVE_AFTER_DAYS).
+    """
+    if days is None:
+        days = getattr(settings, 'ARCHIVE_AFTER_DAYS', 90)
+    return now().date() - timedelta(days=days)
+
+
+def archive_batch(cutoff, batch_size=500):
+    """
+    Moves up to `batch_size` slots dated before `cutoff`, and their bookings, to the archive.
+
+    Returns:
+        Tuple (int, int): Number of slots and bookings moved.
+    """
+    with write_atomic():
+        slots = list(
+            EventAvailability.objects.filter(date__lt=cutoff).order_by('date', 'time_slot_id').values(
+                'id', 'category_id', 'time_slot_id', 'status', 'date', 'capacity', 'booked_count', 'updated_at'
+            )[:batch_size]
+        )
+        if not slots:
+            return 0, 0
+        slot_ids = [slot['id'] for slot in slots]
+        bookings = list(UserBooking.objects.filter(event_id__in=slot_ids).values(
+            'id', 'user_id', 'event_id', 'booked_at', 'status', 'cancelled_at', 'updated_at'
+        ))
+
+        ArchivedEventAvailability.objects.bulk_create(
+            [ArchivedEventAvailability(**slot) for slot in slots]
+        )
+        ArchivedUserBooking.objects.bulk_create(
+            [ArchivedUserBooking(**booking) for booking in bookings]
+        )
+
+        UserBooking.objects.filter(event_id__in=slot_ids).delete()
+        Waitlist.objects.filter(event_id__in=slot_ids).delete()
+        EventAvailability.objects.filter(id__in=slot_ids).delete()
+    return len(slots), len(bookings)
+
+
+def archive_history(cutoff, batch_size=500, pause=0.0):
+    """
+    Archives everything dated before `cutoff`, batch by batch, sleeping `pause`
+    seconds between batches to leave room for other writers.
+
+    Returns:
+        Tuple (int, int): Number of slots and bookings moved.
+    """
+    total_slots = total_bookings = 0
+    while True:
+        slots, bookings = archive_batch(cutoff, batch_size)
+        total_slots += slots
+        total_bookings += bookings
+        if slots < batch_size:
+            return total_slots, total_bookings
+        if pause:
+            time.sleep(pause)
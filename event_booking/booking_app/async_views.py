@@ -0,0 +1,284 @@
+"""
+ASGI-native versions of the read-heavy endpoints in views.py.
+
+They return the same JSON as their DRF counterparts but use Django's async ORM,
+so under ASGI a request does not hold a worker thread while waiting on the database.
+"""
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import login
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+
+from . import fast_serializers
+from .hashing import ahash_password, averify_password
+from .managers.booking_manager import EventBookingManager
+from .managers.user_manager import UserBookingManager
+from .models import EventAvailability, User
+from .paginator import keyset_merge, keyset_page, keyset_queryset
+from .reference_cache import get_reference_data, not_modified_response, set_validators
+from .routers import read_from_replica
+from .serializers import EventAvailabilitySerializer, UserMyBookingSerializer
+from .throttling import LoginRateThrottle
+
+
+def _not_authenticated():
+    return JsonResponse(
+        {'detail': 'Authentication credentials were not provided.'},
+        status=status.HTTP_403_FORBIDDEN
+    )
+
+
+async def _get_user(request):
+    """
+    Resolves the session user off the event loop; returns None for anonymous requests.
+    """
+    return await sync_to_async(lambda: request.user if request.user.is_authenticated else None)()
+
+
+@read_from_replica
+async def availability(request):
+    """
+    Async version of EventAvailabilityView.get.
+    """
+    user = await _get_user(request)
+    if user is None:
+        return _not_authenticated()
+
+    try:
+        dates = EventBookingManager.requested_dates(request)
+        if not dates:
+            return JsonResponse(
+                {'result': 'Failed', 'message': 'Date range required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        versions = [
+            await queryset.aaggregate(**EventBookingManager.version_aggregates())
+            for queryset in EventBookingManager.availability_version_querysets(dates)
+        ]
+        etag = await sync_to_async(EventBookingManager.build_availability_etag)(user.pk, dates, versions)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        if getattr(settings, 'FAST_SERIALIZATION', False):
+            slots = EventAvailability.objects.filter(date__in=dates)
+            data = fast_serializers.serialize_availability(
+                [row async for row in fast_serializers.availability_values(slots, user)],
+                [row async for row in fast_serializers.active_booker_values(slots)]
+            )
+        else:
+            slots = [slot async for slot in EventBookingManager.availability_queryset(dates, user)]
+            data = EventAvailabilitySerializer(slots, many=True).data
+        response = JsonResponse({'result': 'Success', 'data': data}, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        return response
+    except Exception as err:
+        return JsonResponse({
+            'result': 'Failed',
+            'message': 'Something went wrong',
+            'error': str(err)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@read_from_replica
+async def my_bookings(request):
+    """
+    Async version of MyBookingsView.get.
+    """
+    user = await _get_user(request)
+    if user is None:
+        return _not_authenticated()
+
+    filters = request.GET
+    try:
+        bookings, page_size = keyset_queryset(filters, UserBookingManager.get_user_bookings(user, filters))
+    except ValueError as err:
+        return JsonResponse({'result': 'Failed', 'message': str(err)}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = [booking async for booking in bookings]
+    if await sync_to_async(UserBookingManager.needs_archived_bookings)(filters, rows, page_size):
+        archived, _ = keyset_queryset(filters, UserBookingManager.get_archived_user_bookings(user, filters))
+        rows = keyset_merge([rows, [booking async for booking in archived]], page_size)
+    data, next_cursor = keyset_page(rows, page_size)
+    if getattr(settings, 'FAST_SERIALIZATION', False):
+        data = fast_serializers.serialize_my_bookings(data)
+    else:
+        data = UserMyBookingSerializer(data, many=True).data
+    return JsonResponse({
+        'result': 'Success',
+        'data': data,
+        'next_cursor': next_cursor
+    }, status=status.HTTP_200_OK)
+
+
+async def categories(request):
+    """
+    Async version of EventCategoryView.get.
+    """
+    try:
+        entry = await sync_to_async(get_reference_data)('categories')
+        not_modified = not_modified_response(request, entry)
+        if not_modified:
+            return not_modified
+        response = JsonResponse({'data': entry['data'], 'result': 'Success'}, status=status.HTTP_200_OK)
+        return set_validators(response, entry)
+    except Exception as e:
+        return JsonResponse({
+            'result': 'Failed',
+            'message': 'Internal Server Error',
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+async def timeslots(request):
+    """
+    Async version of TimeSlotView.get.
+    """
+    if await _get_user(request) is None:
+        return _not_authenticated()
+
+    try:
+        entry = await sync_to_async(get_reference_data)('timeslots')
+        not_modified = not_modified_response(request, entry)
+        if not_modified:
+            return not_modified
+        response = JsonResponse({'status': 'Success', 'data': entry['data']}, status=status.HTTP_200_OK)
+        return set_validators(response, entry)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'Failed',
+            'message': 'Error fetching time slots',
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+async def check_session(request):
+    """
+    Async version of CheckSessionView.get.
+    """
+    try:
+        user = await _get_user(request)
+        if user is None:
+            return JsonResponse({'authenticated': False}, status=status.HTTP_200_OK)
+        return JsonResponse({
+            'authenticated': True,
+            'username': user.username,
+            'is_admin': user.is_admin,
+            'name': user.first_name,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+async def _throttled(request, throttle):
+    """
+    Applies a DRF throttle to a plain async view; returns the 429 response when over budget.
+    """
+    allowed = await sync_to_async(throttle.allow_request)(request, None)
+    if allowed:
+        return None
+    response = JsonResponse(
+        {'detail': 'Request was throttled.'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS
+    )
+    response['Retry-After'] = str(math.ceil(throttle.wait()))
+    return response
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def login_view(request):
+    """
+    Async version of LoginView.post. The password is checked in the hashing
+    process pool, and an outdated hash is replaced on success.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+    throttled = await _throttled(request, LoginRateThrottle())
+    if throttled:
+        return throttled
+
+    try:
+        data = _json_body(request)
+        email = data.get('email')
+        password = data.get('password')
+        user = await User.objects.filter(username=email).afirst() if email else None
+
+        if user is None:
+            # Hash anyway so that unknown emails take as long as wrong passwords.
+            await ahash_password(password or '')
+            valid, needs_update = False, False
+        else:
+            valid, needs_update = await averify_password(password or '', user.password)
+            valid = valid and user.is_active
+
+        if not valid:
+            return JsonResponse({
+                'authenticated': False,
+                'error': 'Invalid credentials'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
+        if needs_update:
+            user.password = await ahash_password(password)
+            await user.asave(update_fields=['password'])
+
+        user.backend = settings.AUTHENTICATION_BACKENDS[0]
+        await sync_to_async(login)(request, user)
+        return JsonResponse({
+            'message': 'Login successful',
+            'authenticated': True,
+            'username': user.username,
+            'is_admin': user.is_admin,
+            'name': user.first_name,
+        })
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Something went wrong.',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+async def register_view(request):
+    """
+    Async version of RegisterView.post, hashing the password in the hashing process pool.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+    try:
+        data = _json_body(request)
+        name = data.get('name')
+        email = data.get('email')
+        password = data.get('password')
+        if not email:
+            raise ValueError('The given username must be set')
+        if await User.objects.filter(username=email).aexists():
+            return JsonResponse({'error': 'Email already exists'}, status=status.HTTP_400_BAD_REQUEST)
+
+        email = User.objects.normalize_email(email)
+        await User.objects.acreate(
+            username=User.normalize_username(email),
+            email=email,
+            first_name=name,
+            password=await ahash_password(password)
+        )
+        return JsonResponse(
+            {'message': 'User registered successfully', 'result': 'Success'},
+            status=status.HTTP_201_CREATED
+        )
+    except Exception as e:
+        return JsonResponse({'error': str(e), 'result': 'Failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,59 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.backends import ModelBackend
+
+# Per-process cache of users loaded for request.user: {user_id: (expires_at, user)}.
+_users = {}
+_users_lock = threading.Lock()
+
+# Backends that sessions may still name from before CachedModelBackend; see get_session_user.
+LEGACY_SESSION_BACKENDS = {'django.contrib.auth.backends.ModelBackend'}
+
+
+def invalidate_cached_user(user_id):
+    with _users_lock:
+        _users.pop(user_id, None)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that keeps the users it loads for request.user in a short-lived
+    per-process cache, so authenticated requests skip the user query.
+
+    Entries live for settings.USER_CACHE_TTL seconds and are dropped when the user
+    is saved or deleted in this process (see signals.py); other processes may serve
+    a stale user until the TTL expires.
+    """
+
+    def get_user(self, user_id):
+        ttl = getattr(settings, 'USER_CACHE_TTL', 30)
+        now = time.monotonic()
+        with _users_lock:
+            cached = _users.get(user_id)
+        if cached and cached[0] > now:
+            # Each request gets its own copy, so changes made while handling one don't leak.
+            return copy.copy(cached[1])
+
+        user = super().get_user(user_id)
+        if user is not None and ttl:
+            with _users_lock:
+                if len(_users) >= getattr(settings, 'USER_CACHE_MAX_ENTRIES', 10000):
+                    _users.clear()
+                _users[user_id] = (now + ttl, copy.copy(user))
+        return user
+
+
+def get_session_user(request):
+    """
+    django.contrib.auth.get_user, after pointing sessions logged in through a legacy
+    backend at CachedModelBackend. Only one backend is configured, so a failed login
+    hashes the password once instead of once per backend, and old sessions stay valid.
+    """
+    backend = f'{CachedModelBackend.__module__}.{CachedModelBackend.__qualname__}'
+    if request.session.get(auth.BACKEND_SESSION_KEY) in LEGACY_SESSION_BACKENDS:
+        request.session[auth.BACKEND_SESSION_KEY] = backend
+    return auth.get_user(request)
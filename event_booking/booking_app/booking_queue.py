@@ -0,0 +1,129 @@
+"""
+Queued booking mode (settings.BOOKING_STRATEGY = 'queued').
+
+UserBookingAPIView.post stores a BookingIntent and answers with its id as a ticket;
+a single worker then books the intents one at a time in arrival order, so requests
+for the same slot are served first come, first served instead of racing for the
+row lock. The outcome is stored on the intent for the status endpoint.
+
+The worker runs either as `manage.py process_booking_queue` (settings.BOOKING_QUEUE_WORKER
+= None, the production default) or as a daemon thread of the web process ('thread', for
+the single-process development server). Run one worker per database: FIFO order only
+holds for a single consumer, and every web process would start its own thread.
+Either worker first books the intents still pending from before a restart.
+"""
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.timezone import now
+
+from .db import write_atomic
+from .managers.user_manager import UserBookingManager
+from .models import BookingIntent
+
+_wakeup = threading.Event()
+_worker_thread = None
+_worker_lock = threading.Lock()
+
+
+def process_intent(intent_id):
+    """
+    Books a single pending intent and records the outcome in the same transaction.
+
+    Returns:
+        bool: False if the intent was no longer pending.
+    """
+    with write_atomic():
+        intent = BookingIntent.objects.select_for_update().select_related('user').filter(
+            id=intent_id,
+            status='PENDING'
+        ).first()
+        if intent is None:
+            return False
+
+        body, code = UserBookingManager.create_booking_locking(intent.user, {
+            'date': intent.date.isoformat(),
+            'time_slot': intent.time_slot,
+            'categoryId': intent.category,
+        })
+        intent.status = 'SUCCEEDED' if code == 201 else 'FAILED'
+        intent.result = body
+        intent.result_code = code
+        intent.processed_at = now()
+        intent.save(update_fields=['status', 'result', 'result_code', 'processed_at'])
+    return True
+
+
+def process_pending(limit=100):
+    """
+    Processes up to `limit` pending intents, oldest first.
+
+    Returns:
+        int: Number of intents processed.
+    """
+    intent_ids = list(
+        BookingIntent.objects.filter(status='PENDING').order_by('id').values_list('id', flat=True)[:limit]
+    )
+    processed = 0
+    for intent_id in intent_ids:
+        try:
+            processed += process_intent(intent_id)
+        except Exception as err:
+            BookingIntent.objects.filter(id=intent_id, status='PENDING').update(
+                status='FAILED',
+                result={'result': 'Failed', 'error': str(err)},
+                result_code=500,
+                processed_at=now()
+            )
+            processed += 1
+    return processed
+
+
+def run_worker(poll_interval=1.0, stop_event=None):
+    """
+    Drains the queue until `stop_event` is set, sleeping up to `poll_interval`
+    seconds (or until notify_worker is called) whenever it is empty.
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        close_old_connections()
+        if process_pending():
+            continue
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+
+
+def notify_worker():
+    """
+    Wakes the in-process worker once the current transaction commits,
+    starting it first when settings.BOOKING_QUEUE_WORKER is 'thread'.
+    """
+    def _notify():
+        ensure_worker()
+        _wakeup.set()
+
+    transaction.on_commit(_notify)
+
+
+def ensure_worker():
+    """
+    Starts the in-process worker if settings.BOOKING_QUEUE_WORKER is 'thread' and it
+    is not running yet, e.g. when a ticket is still pending after a restart.
+    """
+    if getattr(settings, 'BOOKING_QUEUE_WORKER', 'thread') == 'thread':
+        start_worker_thread()
+
+
+def start_worker_thread():
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(
+                target=run_worker,
+                kwargs={'poll_interval': getattr(settings, 'BOOKING_QUEUE_POLL_INTERVAL', 1.0)},
+                name='booking-queue-worker',
+                daemon=True
+            )
+            _worker_thread.start()
+    return _worker_thread
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    A single client's subscription to slot changes on a set of dates.
+
+    Events are pushed from any thread onto an asyncio queue owned by the
+    subscriber's event loop; when the queue is full, new events are dropped.
+    """
+
+    def __init__(self, dates, loop, max_pending=100):
+        self.dates = set(dates)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # The subscriber's loop is already closed.
+            pass
+
+    def _deliver(self, event):
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """
+        Waits for the next event, returning None if none arrives within timeout seconds.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BaseBroadcaster:
+    """
+    Interface for publishing slot status changes to subscribers.
+
+    Backends for multi-node deployments (e.g. Redis or Postgres LISTEN/NOTIFY)
+    implement the same three methods.
+    """
+
+    def subscribe(self, dates):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def publish(self, event):
+        raise NotImplementedError
+
+
+class InMemoryBroadcaster(BaseBroadcaster):
+    """
+    Single-process broadcaster keeping subscriptions indexed by date.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, dates):
+        subscription = Subscription(dates, asyncio.get_running_loop())
+        with self._lock:
+            for date in subscription.dates:
+                self._subscriptions[date].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for date in subscription.dates:
+                subscribers = self._subscriptions.get(date)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[date]
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(event['date'], ()))
+        for subscription in subscribers:
+            subscription.push(event)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    """
+    Returns the process-wide broadcaster configured by settings.SLOT_EVENTS_BROADCASTER.
+    """
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                backend = getattr(settings, 'SLOT_EVENTS_BROADCASTER', 'booking_app.broadcaster.InMemoryBroadcaster')
+                _broadcaster = import_string(backend)()
+    return _broadcaster
+
+
+def publish_slot_changes(events):
+    """
+    Publishes slot status changes once the surrounding transaction commits.
+
+    Args:
+        events (list): Dicts with 'date' (ISO string), 'time_slot', 'category' and 'status'
+            ('AVAILABLE', 'BOOKED' or 'DELETED').
+    """
+    events = list(events)
+    if not events:
+        return
+
+    def _publish():
+        broadcaster = get_broadcaster()
+        for event in events:
+            broadcaster.publish(event)
+
+    transaction.on_commit(_publish)
+
+
+def publish_slot_change(date, time_slot, category, slot_status):
+    """
+    Publishes a single slot status change once the surrounding transaction commits.
+    """
+    publish_slot_changes([{
+        'date': str(date),
+        'time_slot': time_slot,
+        'category': category,
+        'status': slot_status,
+    }])
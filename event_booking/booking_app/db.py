@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+
+def apply_sqlite_pragmas(connection):
+    """
+    Applies settings.SQLITE_PRAGMAS (e.g. journal_mode, synchronous, busy_timeout,
+    mmap_size, cache_size) to a new SQLite connection.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def write_atomic(using=None):
+    """
+    transaction.atomic for blocks that write. On the SQLite backend in
+    booking_app.db_backends.sqlite3 the outermost block starts with BEGIN IMMEDIATE;
+    elsewhere, and for nested blocks, it is a plain atomic block.
+
+    Usable as a decorator or a context manager.
+    """
+    connection = transaction.get_connection(using)
+    immediate = hasattr(connection, 'begin_immediate') and not connection.in_atomic_block
+    if immediate:
+        connection.begin_immediate = True
+    try:
+        with transaction.atomic(using=using):
+            if immediate:
+                connection.begin_immediate = False
+            yield
+    finally:
+        if immediate:
+            connection.begin_immediate = False
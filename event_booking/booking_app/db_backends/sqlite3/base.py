@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend whose transactions can start with BEGIN IMMEDIATE.
+
+    A plain BEGIN only takes the write lock at the first write, so two transactions
+    that both read first deadlock on upgrade and one fails with "database is locked"
+    regardless of busy_timeout. BEGIN IMMEDIATE takes the write lock up front, so
+    writers queue on busy_timeout instead. booking_app.db.write_atomic sets
+    `begin_immediate` for the transactions it opens.
+    """
+
+    begin_immediate = False
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE' if self.begin_immediate else 'BEGIN')
@@ -0,0 +1,155 @@
+"""
+Lightweight serialization for large read responses.
+
+Builds the same JSON as EventAvailabilitySerializer, UserBookingSerializer and
+UserMyBookingSerializer from `.values()` rows with plain dicts, skipping DRF's
+per-field machinery and model instantiation. Views use it when
+settings.FAST_SERIALIZATION is enabled.
+"""
+from functools import lru_cache
+
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
+
+from .models import UserBooking
+
+_date_field = serializers.DateField()
+_time_field = serializers.TimeField()
+_datetime_field = serializers.DateTimeField()
+
+
+@lru_cache(maxsize=256)
+def format_time(value):
+    return _time_field.to_representation(value)
+
+
+@lru_cache(maxsize=4096)
+def format_date(value):
+    return None if value is None else _date_field.to_representation(value)
+
+
+def format_datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def availability_values(queryset, user):
+    """
+    Projects an EventAvailability queryset to the flat rows read by serialize_availability,
+    annotated with whether `user` booked each slot.
+    """
+    return queryset.annotate(
+        is_self_booked=Exists(UserBooking.objects.filter(user=user, event=OuterRef('pk'), status='ACTIVE'))
+    ).values(
+        'id', 'status', 'date', 'capacity', 'booked_count', 'is_self_booked', 'category_id', 'category__name',
+        'time_slot_id', 'time_slot__start_time', 'time_slot__end_time',
+    )
+
+
+def active_booker_values(queryset):
+    """
+    Rows of the ACTIVE booking's user for each slot in an EventAvailability queryset,
+    newest booking first.
+    """
+    return UserBooking.objects.filter(
+        event__in=queryset.values('id'), status='ACTIVE'
+    ).order_by('-id').values(
+        'event_id', 'user_id', 'user__username', 'user__first_name', 'user__last_name', 'user__email'
+    )
+
+
+def serialize_availability(rows, booker_rows):
+    """
+    Same output as EventAvailabilitySerializer, from availability_values and
+    active_booker_values rows.
+
+    Returns:
+        list: Serialized availability slots.
+    """
+    bookers = {}
+    for booking in booker_rows:
+        # Rows come newest first, so the oldest ACTIVE booking wins, as with .first().
+        bookers[booking['event_id']] = {
+            'id': booking['user_id'],
+            'name': f"{booking['user__first_name']} {booking['user__last_name']}".strip() or booking['user__username'],
+            'email': booking['user__email'],
+        }
+
+    return [{
+        'category': {'id': row['category_id'], 'name': row['category__name']},
+        'time_slot': {
+            'id': row['time_slot_id'],
+            'start_time': format_time(row['time_slot__start_time']),
+            'end_time': format_time(row['time_slot__end_time']),
+        },
+        'status': row['status'],
+        'date': format_date(row['date']),
+        'capacity': row['capacity'],
+        'remaining_seats': row['capacity'] - row['booked_count'],
+        'user': bookers.get(row['id']),
+        'is_self_booked': row['is_self_booked'],
+    } for row in rows]
+
+
+BOOKING_FIELDS = (
+    'id', 'status', 'booked_at', 'cancelled_at',
+    'user_id', 'user__username', 'user__email', 'user__first_name',
+    'event__status', 'event__date', 'event__category_id', 'event__category__name',
+    'event__time_slot_id', 'event__time_slot__start_time', 'event__time_slot__end_time',
+)
+
+
+def booking_values(queryset):
+    """
+    Projects a UserBooking queryset to the flat rows read by serialize_bookings.
+    """
+    return queryset.values(*BOOKING_FIELDS)
+
+
+def serialize_bookings(rows):
+    """
+    Same output as UserBookingSerializer, from booking_values rows.
+
+    Returns:
+        list: Serialized bookings.
+    """
+    return [{
+        'id': row['id'],
+        'user': {
+            'id': row['user_id'],
+            'username': row['user__username'],
+            'email': row['user__email'],
+            'first_name': row['user__first_name'],
+        },
+        'event': {
+            'category': {'id': row['event__category_id'], 'name': row['event__category__name']},
+            'time_slot': {
+                'id': row['event__time_slot_id'],
+                'start_time': format_time(row['event__time_slot__start_time']),
+                'end_time': format_time(row['event__time_slot__end_time']),
+            },
+            'status': row['event__status'],
+            'date': format_date(row['event__date']),
+        },
+        'status': row['status'],
+        'booked_at': format_datetime(row['booked_at']),
+        'cancelled_at': format_datetime(row['cancelled_at']),
+    } for row in rows]
+
+
+def serialize_my_bookings(rows):
+    """
+    Same output as UserMyBookingSerializer, from UserBookingManager.get_user_bookings rows.
+
+    Returns:
+        list: Serialized bookings.
+    """
+    return [{
+        'id': row['id'],
+        'category': row['category'],
+        'start_time': format_time(row['start_time']),
+        'end_time': format_time(row['end_time']),
+        'date': format_date(row['date']),
+        'status': row['status'],
+        'booked_at': format_datetime(row['booked_at']),
+        'cancelled_at': format_datetime(row['cancelled_at']),
+    } for row in rows]
@@ -0,0 +1,87 @@
+"""
+Password hashing policy and off-thread hashing for the async login and
+registration views.
+
+PBKDF2 costs tens of milliseconds of CPU per hash. The async views run it in a
+small process pool (settings.PASSWORD_HASH_WORKERS) so that a burst of logins
+neither blocks the event loop nor competes for the GIL with other requests.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher, \
+    make_password
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with its work factor taken from settings.PASSWORD_HASH_ITERATIONS.
+
+    Stored hashes whose iteration count differs are upgraded the next time the
+    user logs in, as Django rehashes whenever the preferred hasher's must_update()
+    says so.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+def hash_password(password):
+    return make_password(password)
+
+
+def verify_password(password, encoded):
+    """
+    Checks a password against a stored hash.
+
+    Returns:
+        Tuple (bool, bool): Whether the password matches, and whether the stored
+        hash should be replaced because the hashing policy changed.
+    """
+    if not check_password(password, encoded):
+        return False, False
+    preferred = get_hasher('default')
+    hasher = identify_hasher(encoded)
+    return True, hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    """
+    Returns the process pool used for hashing, or None to use the event loop's
+    default thread pool when settings.PASSWORD_HASH_WORKERS is 0.
+    """
+    global _pool
+    workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+    if not workers:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'event_booking.settings'),)
+                )
+    return _pool
+
+
+async def ahash_password(password):
+    return await asyncio.get_running_loop().run_in_executor(get_hash_pool(), hash_password, password)
+
+
+async def averify_password(password, encoded):
+    return await asyncio.get_running_loop().run_in_executor(get_hash_pool(), verify_password, password, encoded)
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from booking_app.archive import archive_cutoff, archive_history
+
+
+class Command(BaseCommand):
+    help = ('Moves availability and bookings older than ARCHIVE_AFTER_DAYS into the archive tables. '
+            'Schedule it (e.g. nightly from cron) or run it with --every to repeat.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive dates older than this many days (default: ARCHIVE_AFTER_DAYS).')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Slots moved per transaction.')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Seconds to sleep between batches.')
+        parser.add_argument('--every', type=float, default=None,
+                            help='Keep running, archiving again every this many seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            cutoff = archive_cutoff(options['days'])
+            slots, bookings = archive_history(cutoff, options['batch_size'], options['pause'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Archived {slots} slots and {bookings} bookings dated before {cutoff}.'
+            ))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from booking_app.booking_queue import process_pending, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Processes queued booking intents in arrival order (BOOKING_STRATEGY = "queued").'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the pending intents and exit.')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait between polls when the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            processed = 0
+            while True:
+                batch = process_pending()
+                if not batch:
+                    break
+                processed += batch
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} booking intents.'))
+            return
+
+        self.stdout.write('Processing booking queue (Ctrl+C to stop)...')
+        try:
+            run_worker(poll_interval=options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
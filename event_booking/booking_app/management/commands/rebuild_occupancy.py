@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from booking_app.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily occupancy summary from event availability.'
+
+    def handle(self, *args, **options):
+        rows = rebuild_occupancy()
+        self.stdout.write(self.style.SUCCESS(f'Daily occupancy rebuilt ({rows} rows).'))
@@ -0,0 +1,26 @@
+from datetime import time
+
+from django.core.management.base import BaseCommand
+
+from booking_app.models import TimeSlot
+from booking_app.reference_cache import invalidate_reference_data
+
+
+class Command(BaseCommand):
+    help = 'Creates the predefined time slots if no time slots exist yet.'
+
+    def handle(self, *args, **options):
+        if TimeSlot.objects.exists():
+            self.stdout.write('Time slots already exist, nothing to do.')
+            return
+
+        predefined_slots = [
+            {"start": time(9, 0), "end": time(12, 0)},
+            {"start": time(12, 0), "end": time(15, 0)},
+            {"start": time(15, 0), "end": time(18, 0)},
+        ]
+        TimeSlot.objects.bulk_create([
+            TimeSlot(start_time=slot["start"], end_time=slot["end"]) for slot in predefined_slots
+        ])
+        invalidate_reference_data('timeslots')
+        self.stdout.write(self.style.SUCCESS('Time slots inserted successfully.'))
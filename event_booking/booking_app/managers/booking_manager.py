@@ -1,9 +1,17 @@
-from datetime import datetime
+import hashlib
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.utils.http import quote_etag
 from django.utils.timezone import now
-from django.db.models import Exists, OuterRef
+from django.db.models import Case, Count, Exists, Max, OuterRef, Prefetch, Q, Sum, Value, When
 from rest_framework import status
 
-from booking_app.models import EventAvailability, UserBooking
+from booking_app import fast_serializers
+from booking_app.broadcaster import publish_slot_change, publish_slot_changes
+from booking_app.db import write_atomic
+from booking_app.models import DailyOccupancy, EventAvailability, EventCategory, TimeSlot, UserBooking
+from booking_app.occupancy import record_occupancy_change, record_occupancy_changes
+from booking_app.reference_cache import reference_version
 from booking_app.serializers import EventAvailabilitySerializer
 
 
@@ -14,31 +22,120 @@ class EventBookingManager:
     """
 
     @staticmethod
-    def fetch_availability(request):
+    def requested_dates(request):
+        """
+                Reads the requested dates from the 'dates[]' or comma separated 'dates' query param.
+
+                Returns:
+                    list: Date strings, empty when none were given.
+                """
+
+        dates = request.GET.getlist('dates[]') or request.GET.get('dates', '').split(',')
+        return [] if dates == [''] else dates
 
+    @staticmethod
+    def requested_capacity(data):
         """
-                Retrieves event availability for the given date(s), including whether the current
-                user has booked each slot.
+                Reads the optional 'capacity' (number of seats) from the request data.
+
+                Returns:
+                    int or None: The capacity, None when not given.
+
+                Raises:
+                    ValueError: If it is not a positive integer.
+                """
+
+        capacity = data.get('capacity')
+        if capacity in (None, ''):
+            return None
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1.')
+        return capacity
+
+    @staticmethod
+    def availability_version_querysets(dates):
+        """
+                Returns the querysets whose latest update time and row count version the
+                availability of the given dates.
+
+                Returns:
+                    tuple: (EventAvailability QuerySet, UserBooking QuerySet)
+                """
+
+        return (
+            EventAvailability.objects.filter(date__in=dates),
+            UserBooking.objects.filter(event__date__in=dates)
+        )
+
+    @staticmethod
+    def version_aggregates():
+        """
+                Aggregates applied to each of availability_version_querysets.
+                """
+
+        return {'last_updated': Max('updated_at'), 'total': Count('id')}
+
+    @staticmethod
+    def build_availability_etag(user_id, dates, versions):
+        """
+                Builds the availability ETag from the requesting user, the dates, the
+                aggregated versions of availability_version_querysets and the versions of
+                the category and time slot reference data, whose names and times the
+                response embeds.
+
+                Returns:
+                    str: Quoted ETag.
+                """
+
+        parts = [user_id, sorted(dates)]
+        for version in versions:
+            parts.extend([version['last_updated'], version['total']])
+        parts.extend(reference_version(name) for name in ('categories', 'timeslots'))
+        return quote_etag(hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest())
+
+    @staticmethod
+    def availability_etag(request):
+        """
+                Computes an ETag for the availability of the requested dates as seen by the
+                current user, from the latest update time and row counts of the availability
+                and booking rows in range.
 
                 Args:
                     request (HttpRequest): The HTTP GET request containing 'dates' query params.
 
                 Returns:
-                    dict: Response body and HTTP status code.
+                    str or None: Quoted ETag, or None when no dates were requested.
                 """
 
-        dates = request.GET.getlist('dates[]') or request.GET.get('dates', '').split(',')
-        user = request.user
-        if not dates or dates == ['']:
-            return {
-                'body': {'result': 'Failed', 'message': 'Date range required'},
-                'status': status.HTTP_400_BAD_REQUEST
-            }
+        dates = EventBookingManager.requested_dates(request)
+        if not dates:
+            return None
+
+        versions = [
+            queryset.aggregate(**EventBookingManager.version_aggregates())
+            for queryset in EventBookingManager.availability_version_querysets(dates)
+        ]
+        return EventBookingManager.build_availability_etag(request.user.pk, dates, versions)
 
-        availability = EventAvailability.objects.filter(date__in=dates).select_related(
+    @staticmethod
+    def availability_queryset(dates, user):
+        """
+                Returns the availability for the given dates with category, time slot and the
+                ACTIVE booking's user loaded, annotated with whether `user` booked each slot.
+
+                Returns:
+                    QuerySet: EventAvailability queryset.
+                """
+
+        return EventAvailability.objects.filter(date__in=dates).select_related(
             'category', 'time_slot'
         ).prefetch_related(
-            'user_booking__user'
+            Prefetch(
+                'user_booking',
+                queryset=UserBooking.objects.filter(status='ACTIVE').select_related('user').order_by('id'),
+                to_attr='active_bookings'
+            )
         ).annotate(
             is_self_booked=Exists(
                 UserBooking.objects.filter(
@@ -48,20 +145,52 @@ class EventBookingManager:
                 )
             )
         )
-        serializer = EventAvailabilitySerializer(availability, many=True)
+
+    @staticmethod
+    def fetch_availability(request):
+
+        """
+                Retrieves event availability for the given date(s), including whether the current
+                user has booked each slot.
+
+                Args:
+                    request (HttpRequest): The HTTP GET request containing 'dates' query params.
+
+                Returns:
+                    dict: Response body and HTTP status code.
+                """
+
+        dates = EventBookingManager.requested_dates(request)
+        user = request.user
+        if not dates:
+            return {
+                'body': {'result': 'Failed', 'message': 'Date range required'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        if getattr(settings, 'FAST_SERIALIZATION', False):
+            slots = EventAvailability.objects.filter(date__in=dates)
+            data = fast_serializers.serialize_availability(
+                fast_serializers.availability_values(slots, user),
+                fast_serializers.active_booker_values(slots)
+            )
+        else:
+            data = EventAvailabilitySerializer(EventBookingManager.availability_queryset(dates, user), many=True).data
         return {
-            'body': {'result': 'Success', 'data': serializer.data},
+            'body': {'result': 'Success', 'data': data},
             'status': status.HTTP_200_OK
         }
 
     @staticmethod
     def create_or_update_availability(request):
         """
-                Creates a new event availability slot or updates the category of an existing one,
-                ensuring the date is not in the past and the slot is not already booked.
+                Creates a new event availability slot or updates the category and capacity of an
+                existing one, ensuring the date is not in the past, the category of a booked slot
+                is kept, and the capacity does not drop below the seats already booked.
 
                 Args:
-                    request (HttpRequest): The HTTP POST request containing 'date', 'time_slot', and 'category'.
+                    request (HttpRequest): The HTTP POST request containing 'date', 'time_slot', 'category'
+                        and optional 'capacity' (seats, default 1).
 
                 Returns:
                     dict: Response body and HTTP status code.
@@ -81,6 +210,14 @@ class EventBookingManager:
                 'status': status.HTTP_400_BAD_REQUEST
             }
 
+        try:
+            capacity = EventBookingManager.requested_capacity(data)
+        except (TypeError, ValueError):
+            return {
+                'body': {'result': 'Failed', 'message': 'Capacity must be a positive number.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
         selected_date = datetime.strptime(date_str, '%Y-%m-%d').date()
         if selected_date < now().date():
             return {
@@ -97,8 +234,8 @@ class EventBookingManager:
         ).first()
 
         if availability:
-            has_booking = UserBooking.objects.filter(event=availability, status='ACTIVE').exists()
-            if has_booking:
+            if int(category_id) != availability.category_id and \
+                    UserBooking.objects.filter(event=availability, status='ACTIVE').exists():
                 return {
                     'body': {
                         'result': 'Failed',
@@ -106,8 +243,29 @@ class EventBookingManager:
                     },
                     'status': status.HTTP_400_BAD_REQUEST
                 }
-            availability.category_id = category_id
-            availability.save()
+            old_category_id, old_status = availability.category_id, availability.status
+            with write_atomic():
+                slot = EventAvailability.objects.filter(id=availability.id)
+                if capacity is not None and not slot.filter(booked_count__lte=capacity).update(
+                    capacity=capacity,
+                    status=Case(When(booked_count__gte=capacity, then=Value('BOOKED')), default=Value('AVAILABLE')),
+                    updated_at=now()
+                ):
+                    return {
+                        'body': {
+                            'result': 'Failed',
+                            'message': 'Capacity cannot be lower than the seats already booked.'
+                        },
+                        'status': status.HTTP_400_BAD_REQUEST
+                    }
+                # Saving the instance would overwrite the seat counters, so only the category is written.
+                slot.update(category_id=category_id, updated_at=now())
+                availability.refresh_from_db(fields=['category', 'capacity', 'booked_count', 'status'])
+                record_occupancy_changes([
+                    (selected_date, old_category_id, availability.time_slot_id, old_status, None),
+                    (selected_date, availability.category_id, availability.time_slot_id, None, availability.status),
+                ])
+            publish_slot_change(selected_date, availability.time_slot_id, availability.category_id, availability.status)
             return {
                 'body': {
                     'result': 'Success',
@@ -116,11 +274,15 @@ class EventBookingManager:
                 'status': status.HTTP_200_OK
             }
         else:
-            EventAvailability.objects.create(
-                date=selected_date,
-                time_slot_id=int(time_slot_id),
-                category_id=int(category_id)
-            )
+            with write_atomic():
+                EventAvailability.objects.create(
+                    date=selected_date,
+                    time_slot_id=int(time_slot_id),
+                    category_id=int(category_id),
+                    capacity=capacity or 1
+                )
+                record_occupancy_change(selected_date, int(category_id), int(time_slot_id), None, 'AVAILABLE')
+            publish_slot_change(selected_date, int(time_slot_id), int(category_id), 'AVAILABLE')
             return {
                 'body': {
                     'result': 'Success',
@@ -129,6 +291,141 @@ class EventBookingManager:
                 'status': status.HTTP_201_CREATED
             }
 
+    @staticmethod
+    def bulk_create_or_update_availability(request):
+        """
+                Creates or re-categorises availability for every (date, time slot) pair in a date
+                range, applying the same past-date and already-booked rules as
+                create_or_update_availability, but set-based in a single transaction.
+
+                Args:
+                    request (HttpRequest): The HTTP POST request containing 'start_date', 'end_date',
+                        'time_slots' (list of ids), 'category' and optional 'weekdays'
+                        (list of ints, Monday=0) and 'capacity' (seats of the created slots).
+
+                Returns:
+                    dict: Response body with a per-row outcome report and HTTP status code.
+                """
+
+        data = request.data
+        start_str = data.get('start_date')
+        end_str = data.get('end_date')
+        time_slot_ids = data.get('time_slots') or []
+        category_id = data.get('category')
+        weekdays = data.get('weekdays')
+
+        if not (start_str and end_str and time_slot_ids and category_id):
+            return {
+                'body': {
+                    'result': 'Failed',
+                    'message': 'Start date, End date, Time Slots, and Category are required.'
+                },
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        try:
+            capacity = EventBookingManager.requested_capacity(data) or 1
+        except (TypeError, ValueError):
+            return {
+                'body': {'result': 'Failed', 'message': 'Capacity must be a positive number.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
+        if end_date < start_date:
+            return {
+                'body': {'result': 'Failed', 'message': 'End date must not be before start date.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        time_slot_ids = {int(slot_id) for slot_id in time_slot_ids}
+        weekdays = set(range(7)) if weekdays is None else {int(day) for day in weekdays}
+        category_id = int(category_id)
+
+        if not EventCategory.objects.filter(id=category_id).exists():
+            return {
+                'body': {'result': 'Failed', 'message': 'Category not found.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+        found_slot_ids = set(TimeSlot.objects.filter(id__in=time_slot_ids).values_list('id', flat=True))
+        if found_slot_ids != time_slot_ids:
+            return {
+                'body': {
+                    'result': 'Failed',
+                    'message': 'Time slot(s) not found.',
+                    'time_slots': sorted(time_slot_ids - found_slot_ids)
+                },
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        dates = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+            if (start_date + timedelta(days=offset)).weekday() in weekdays
+        ]
+        today = now().date()
+
+        existing = {
+            (row['date'], row['time_slot_id']): row
+            for row in EventAvailability.objects.filter(
+                date__range=(start_date, end_date),
+                time_slot_id__in=time_slot_ids
+            ).annotate(
+                has_booking=Exists(UserBooking.objects.filter(event=OuterRef('pk'), status='ACTIVE'))
+            ).values('id', 'date', 'time_slot_id', 'category_id', 'status', 'has_booking')
+        }
+
+        rows, to_create, to_update, occupancy_changes = [], [], [], []
+        for slot_date in dates:
+            for time_slot_id in sorted(time_slot_ids):
+                row = {'date': slot_date.isoformat(), 'time_slot': time_slot_id}
+                current = existing.get((slot_date, time_slot_id))
+                if slot_date < today:
+                    row.update(outcome='skipped', message='Cannot update past dates.')
+                elif current and current['has_booking']:
+                    row.update(outcome='skipped', message='Cannot update category — slot already booked.')
+                elif current:
+                    to_update.append(current['id'])
+                    occupancy_changes += [
+                        (slot_date, current['category_id'], time_slot_id, current['status'], None),
+                        (slot_date, category_id, time_slot_id, None, current['status']),
+                    ]
+                    row.update(outcome='updated', message='Category updated for existing slot.')
+                else:
+                    to_create.append(EventAvailability(
+                        date=slot_date,
+                        time_slot_id=time_slot_id,
+                        category_id=category_id,
+                        capacity=capacity
+                    ))
+                    occupancy_changes.append((slot_date, category_id, time_slot_id, None, 'AVAILABLE'))
+                    row.update(outcome='created', message='New availability created.')
+                rows.append(row)
+
+        with write_atomic():
+            EventAvailability.objects.bulk_create(to_create, batch_size=500)
+            for offset in range(0, len(to_update), 500):
+                EventAvailability.objects.filter(
+                    id__in=to_update[offset:offset + 500]
+                ).update(category_id=category_id, updated_at=now())
+            record_occupancy_changes(occupancy_changes)
+            publish_slot_changes(
+                {'date': row['date'], 'time_slot': row['time_slot'], 'category': category_id, 'status': 'AVAILABLE'}
+                for row in rows if row['outcome'] in ('created', 'updated')
+            )
+
+        return {
+            'body': {
+                'result': 'Success',
+                'created': len(to_create),
+                'updated': len(to_update),
+                'skipped': len(rows) - len(to_create) - len(to_update),
+                'data': rows
+            },
+            'status': status.HTTP_201_CREATED if to_create else status.HTTP_200_OK
+        }
+
     @staticmethod
     def delete_availability(request):
         """
@@ -158,14 +455,238 @@ class EventBookingManager:
                 'status': status.HTTP_404_NOT_FOUND
             }
 
-        if availability.status == 'BOOKED':
+        if availability.booked_count:
             return {
                 'body': {'error': 'Cannot delete a booked slot.'},
                 'status': status.HTTP_400_BAD_REQUEST
             }
 
-        availability.delete()
+        with write_atomic():
+            availability.delete()
+            record_occupancy_change(
+                availability.date, availability.category_id, availability.time_slot_id, availability.status, None
+            )
+        publish_slot_change(availability.date, availability.time_slot_id, availability.category_id, 'DELETED')
         return {
             'body': {'message': 'Slot deleted successfully.'},
             'status': status.HTTP_200_OK
         }
+
+    @staticmethod
+    def _bulk_availability_queryset(data):
+        """
+                Builds the availability queryset targeted by a bulk operation from 'start_date',
+                'end_date' and the optional 'time_slots' / 'category' filters.
+
+                Returns:
+                    QuerySet or None: None when the date range is missing.
+                """
+
+        start_str = data.get('start_date')
+        end_str = data.get('end_date')
+        if not (start_str and end_str):
+            return None
+
+        start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
+        availability = EventAvailability.objects.filter(date__range=(start_date, end_date))
+        if data.get('time_slots'):
+            availability = availability.filter(time_slot_id__in=[int(slot_id) for slot_id in data['time_slots']])
+        if data.get('category'):
+            availability = availability.filter(category_id=int(data['category']))
+        return availability
+
+    @staticmethod
+    def _split_booked_availability(availability):
+        """
+                Splits a bulk availability queryset into the booked rows, reported as skipped,
+                and a queryset of the rows that are safe to modify.
+
+                Returns:
+                    tuple: (list of skipped rows, QuerySet of modifiable rows)
+                """
+
+        is_booked = Q(status='BOOKED') | Exists(
+            UserBooking.objects.filter(event=OuterRef('pk'), status='ACTIVE')
+        )
+        skipped = [
+            {'date': row['date'].isoformat(), 'time_slot': row['time_slot_id'], 'message': 'Slot already booked.'}
+            for row in availability.filter(is_booked).order_by('date', 'time_slot_id').values('date', 'time_slot_id')
+        ]
+        return skipped, availability.exclude(is_booked)
+
+    @staticmethod
+    def bulk_delete_availability(request):
+        """
+                Deletes every availability slot in a date range (optionally narrowed to time slots
+                and a category), skipping slots that are booked.
+
+                Args:
+                    request (HttpRequest): The HTTP DELETE request containing 'start_date', 'end_date'
+                        and optional 'time_slots' and 'category'.
+
+                Returns:
+                    dict: Response body with deleted count and skipped rows, and HTTP status code.
+                """
+
+        availability = EventBookingManager._bulk_availability_queryset(request.data)
+        if availability is None:
+            return {
+                'body': {'error': 'start_date and end_date are required.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        with write_atomic():
+            skipped, deletable = EventBookingManager._split_booked_availability(availability)
+            deleted_rows = list(deletable.values('date', 'time_slot_id', 'category_id', 'status'))
+            _, deleted_per_model = deletable.delete()
+            deleted = deleted_per_model.get(EventAvailability._meta.label, 0)
+            record_occupancy_changes(
+                (row['date'], row['category_id'], row['time_slot_id'], row['status'], None) for row in deleted_rows
+            )
+            publish_slot_changes(
+                {'date': str(row['date']), 'time_slot': row['time_slot_id'], 'category': row['category_id'],
+                 'status': 'DELETED'}
+                for row in deleted_rows
+            )
+
+        return {
+            'body': {
+                'result': 'Success',
+                'message': 'Slots deleted successfully.',
+                'deleted': deleted,
+                'skipped': skipped
+            },
+            'status': status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def bulk_update_availability_category(request):
+        """
+                Moves every availability slot in a date range (optionally narrowed to time slots
+                and a current category) to 'new_category', skipping past and booked slots.
+
+                Args:
+                    request (HttpRequest): The HTTP PUT request containing 'start_date', 'end_date',
+                        'new_category' and optional 'time_slots' and 'category'.
+
+                Returns:
+                    dict: Response body with updated count and skipped rows, and HTTP status code.
+                """
+
+        new_category_id = request.data.get('new_category')
+        availability = EventBookingManager._bulk_availability_queryset(request.data)
+        if availability is None or not new_category_id:
+            return {
+                'body': {'error': 'start_date, end_date and new_category are required.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        if not EventCategory.objects.filter(id=new_category_id).exists():
+            return {
+                'body': {'error': 'Category not found.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        today = now().date()
+        with write_atomic():
+            # Past slots are reported row by row, as bulk_create_or_update_availability does.
+            past = availability.filter(date__lt=today).order_by('date', 'time_slot_id').values('date', 'time_slot_id')
+            skipped = [
+                {'date': row['date'].isoformat(), 'time_slot': row['time_slot_id'],
+                 'message': 'Cannot update past dates.'}
+                for row in past
+            ]
+            skipped_booked, updatable = EventBookingManager._split_booked_availability(
+                availability.filter(date__gte=today)
+            )
+            skipped += skipped_booked
+            updated_rows = list(updatable.values('date', 'time_slot_id', 'category_id', 'status'))
+            updated = updatable.update(category_id=int(new_category_id), updated_at=now())
+            record_occupancy_changes(
+                change for row in updated_rows for change in (
+                    (row['date'], row['category_id'], row['time_slot_id'], row['status'], None),
+                    (row['date'], int(new_category_id), row['time_slot_id'], None, row['status']),
+                )
+            )
+            publish_slot_changes(
+                {'date': str(row['date']), 'time_slot': row['time_slot_id'], 'category': int(new_category_id),
+                 'status': row['status']}
+                for row in updated_rows
+            )
+
+        return {
+            'body': {
+                'result': 'Success',
+                'message': 'Category updated for slots.',
+                'updated': updated,
+                'skipped': skipped
+            },
+            'status': status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def fetch_occupancy_stats(request):
+        """
+                Reads booked vs available slot counts for a date range from the DailyOccupancy
+                summary, per day and category, with totals per time slot and per category.
+
+                Args:
+                    request (HttpRequest): The HTTP GET request containing 'start_date', 'end_date'
+                        and optional 'category' and 'time_slot'.
+
+                Returns:
+                    dict: Response body and HTTP status code.
+                """
+
+        start_str = request.GET.get('start_date')
+        end_str = request.GET.get('end_date')
+        if not (start_str and end_str):
+            return {
+                'body': {'result': 'Failed', 'message': 'start_date and end_date are required.'},
+                'status': status.HTTP_400_BAD_REQUEST
+            }
+
+        occupancy = DailyOccupancy.objects.filter(date__range=(
+            datetime.strptime(start_str, '%Y-%m-%d').date(),
+            datetime.strptime(end_str, '%Y-%m-%d').date()
+        ))
+        if request.GET.get('category'):
+            occupancy = occupancy.filter(category_id=int(request.GET['category']))
+        if request.GET.get('time_slot'):
+            occupancy = occupancy.filter(time_slot_id=int(request.GET['time_slot']))
+
+        daily = [{
+            'date': row['date'].isoformat(),
+            'category': {'id': row['category_id'], 'name': row['category__name']},
+            'available_slots': row['available'],
+            'booked_slots': row['booked'],
+        } for row in occupancy.values('date', 'category_id', 'category__name').annotate(
+            available=Sum('available_slots'), booked=Sum('booked_slots')
+        ).order_by('date', 'category_id')]
+        by_time_slot = [{
+            'time_slot': {
+                'id': row['time_slot_id'],
+                'start_time': fast_serializers.format_time(row['time_slot__start_time']),
+                'end_time': fast_serializers.format_time(row['time_slot__end_time']),
+            },
+            'available_slots': row['available'],
+            'booked_slots': row['booked'],
+        } for row in occupancy.values('time_slot_id', 'time_slot__start_time', 'time_slot__end_time').annotate(
+            available=Sum('available_slots'), booked=Sum('booked_slots')
+        ).order_by('time_slot__start_time', 'time_slot_id')]
+        by_category = [{
+            'category': {'id': row['category_id'], 'name': row['category__name']},
+            'available_slots': row['available'],
+            'booked_slots': row['booked'],
+        } for row in occupancy.values('category_id', 'category__name').annotate(
+            available=Sum('available_slots'), booked=Sum('booked_slots')
+        ).order_by('category_id')]
+
+        return {
+            'body': {
+                'result': 'Success',
+                'data': {'daily': daily, 'by_time_slot': by_time_slot, 'by_category': by_category}
+            },
+            'status': status.HTTP_200_OK
+        }
@@ -1,8 +1,16 @@
-from django.db import transaction, DatabaseError, OperationalError
-from django.utils.timezone import now
-from datetime import datetime
+from django.conf import settings
+from django.db import DatabaseError, OperationalError
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils.timezone import make_aware, now
+from datetime import datetime, time, timedelta
 
-from booking_app.models import EventAvailability, UserBooking
+from booking_app.broadcaster import publish_slot_change
+from booking_app.db import write_atomic
+from booking_app.models import (
+    ArchivedEventAvailability, ArchivedUserBooking, BookingIntent, EventAvailability, UserBooking, Waitlist
+)
+from booking_app.occupancy import record_occupancy_change
 
 
 class UserBookingManager:
@@ -11,10 +19,105 @@ class UserBookingManager:
     """
 
     @staticmethod
-    @transaction.atomic
     def create_booking(user, data):
         """
-        Handles the booking creation logic for a user.
+        Creates a booking using the strategy configured in settings.BOOKING_STRATEGY.
+
+        Args:
+            user (User): Authenticated user making the booking.
+            data (dict): Contains 'date', 'time_slot', and 'categoryId'.
+
+        Returns:
+            Tuple (dict, int): Response body and HTTP status.
+        """
+        if getattr(settings, 'BOOKING_STRATEGY', 'locking') == 'optimistic':
+            return UserBookingManager.create_booking_optimistic(user, data)
+        return UserBookingManager.create_booking_locking(user, data)
+
+    @staticmethod
+    def claim_seat(event):
+        """
+        Takes one seat of a slot with a single conditional UPDATE
+        (booked_count + 1 where booked_count < capacity), so concurrent bookings can
+        never oversell and no row is locked beforehand. The slot turns BOOKED when its
+        last seat is taken. Must run inside a transaction.
+
+        Args:
+            event (EventAvailability): Slot to book; its seat fields are refreshed.
+
+        Returns:
+            bool: False if the slot had no seat left.
+        """
+        claimed = EventAvailability.objects.filter(id=event.id, booked_count__lt=F('capacity')).update(
+            booked_count=F('booked_count') + 1,
+            status=Case(When(booked_count__gte=F('capacity') - 1, then=Value('BOOKED')), default=Value('AVAILABLE')),
+            updated_at=now()
+        )
+        if not claimed:
+            return False
+
+        # The row stays write-locked by this transaction, so this reads our own update.
+        event.booked_count, event.capacity, event.status = EventAvailability.objects.filter(
+            id=event.id
+        ).values_list('booked_count', 'capacity', 'status').get()
+        if event.status == 'BOOKED':
+            record_occupancy_change(event.date, event.category_id, event.time_slot_id, 'AVAILABLE', 'BOOKED')
+        return True
+
+    @staticmethod
+    def release_seat(event):
+        """
+        Gives back one seat of a slot with a conditional UPDATE (booked_count - 1),
+        the counterpart of claim_seat. Must run inside a transaction.
+
+        Args:
+            event (EventAvailability): Slot of the cancelled booking; its seat fields are refreshed.
+        """
+        released = EventAvailability.objects.filter(id=event.id, booked_count__gt=0).update(
+            booked_count=F('booked_count') - 1,
+            status=Value('AVAILABLE'),
+            updated_at=now()
+        )
+        if not released:
+            return
+
+        event.booked_count, event.capacity, event.status = EventAvailability.objects.filter(
+            id=event.id
+        ).values_list('booked_count', 'capacity', 'status').get()
+        if event.booked_count == event.capacity - 1:
+            record_occupancy_change(event.date, event.category_id, event.time_slot_id, 'BOOKED', 'AVAILABLE')
+
+    @staticmethod
+    def add_booking(user, event):
+        """
+        Claims a seat of `event` for `user` and records the booking. The claim and the
+        booking share a savepoint, so a duplicate booking gives the seat back.
+
+        Returns:
+            Tuple (dict, int) or None: Error response and HTTP status, or None on success.
+        """
+        if UserBooking.objects.filter(event_id=event.id, user=user, status='ACTIVE').exists():
+            return {"result": "Failed", "error": "You have already booked this event."}, 400
+
+        with write_atomic():
+            if not UserBookingManager.claim_seat(event):
+                return {"error": "Someone already booked this event."}, 400
+            UserBooking.objects.create(
+                user=user,
+                event_id=event.id,
+                booked_at=now(),
+                status='ACTIVE'
+            )
+            Waitlist.objects.filter(event_id=event.id, user=user).delete()
+
+        publish_slot_change(event.date, event.time_slot_id, event.category_id, event.status)
+        return None
+
+    @staticmethod
+    @write_atomic()
+    def create_booking_locking(user, data):
+        """
+        Handles the booking creation logic for a user by locking the slot row.
 
         Args:
             user (User): Authenticated user making the booking.
@@ -40,23 +143,9 @@ class UserBookingManager:
                 status='AVAILABLE'
             )
 
-            exists = UserBooking.objects.select_for_update(nowait=True).filter(
-                event_id=event.id,
-                status='ACTIVE'
-            ).exists()
-
-            if exists:
-                return {"error": "Someone already booked this event."}, 400
-
-            UserBooking.objects.create(
-                user=user,
-                event_id=event.id,
-                booked_at=now(),
-                status='ACTIVE'
-            )
-
-            event.status = 'BOOKED'
-            event.save()
+            error = UserBookingManager.add_booking(user, event)
+            if error:
+                return error
 
             return {"message": "Booking is successful", "result": "Success"}, 201
 
@@ -77,22 +166,263 @@ class UserBookingManager:
             }, 400
 
     @staticmethod
-    def get_user_bookings(user):
+    @write_atomic()
+    def create_booking_optimistic(user, data):
+        """
+        Handles the booking creation logic for a user without row locks.
+
+        The seat is claimed with a single conditional UPDATE
+        (booked_count < capacity); only a request whose UPDATE
+        changes the row gets to create the booking.
+
+        Args:
+            user (User): Authenticated user making the booking.
+            data (dict): Contains 'date', 'time_slot', and 'categoryId'.
+
+        Returns:
+            Tuple (dict, int): Response body and HTTP status.
+        """
+        try:
+            date_str = data.get('date')
+            slot_id = data.get('time_slot')
+            category_id = data.get('categoryId')
+
+            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+
+            if date < now().date():
+                return {"error": "Cannot book past events."}, 400
+
+            event = EventAvailability.objects.filter(
+                date=date,
+                category_id=category_id,
+                time_slot_id=slot_id,
+                status='AVAILABLE'
+            ).only('id', 'date', 'category_id', 'time_slot_id').first()
+
+            if event is None:
+                return {"result": "Failed", "error": "The selected event is not available."}, 200
+
+            error = UserBookingManager.add_booking(user, event)
+            if error:
+                return error
+
+            return {"message": "Booking is successful", "result": "Success"}, 201
+
+        except (DatabaseError, OperationalError):
+            return {
+                "result": "Failed",
+                "error": "Another booking is currently in progress. Please try again shortly."
+            }, 200
+
+        except Exception as err:
+            return {
+                "message": "Booking is unsuccessful",
+                "result": "Failed",
+                "error": str(err)
+            }, 400
+
+    @staticmethod
+    def enqueue_booking(user, data):
+        """
+        Queues a booking request for the booking queue worker (BOOKING_STRATEGY = 'queued').
+
+        Args:
+            user (User): Authenticated user making the booking.
+            data (dict): Contains 'date', 'time_slot', and 'categoryId'.
+
+        Returns:
+            Tuple (dict, int): Response body with the ticket id, and HTTP status.
+        """
+        # Imported here as booking_queue itself books through this manager.
+        from booking_app.booking_queue import notify_worker
+
+        try:
+            date = datetime.strptime(data.get('date'), '%Y-%m-%d').date()
+            slot_id = int(data.get('time_slot'))
+            category_id = int(data.get('categoryId'))
+        except (TypeError, ValueError):
+            return {"result": "Failed", "error": "date, time_slot and categoryId are required."}, 400
+
+        if date < now().date():
+            return {"error": "Cannot book past events."}, 400
+
+        with write_atomic():
+            intent = BookingIntent.objects.create(
+                user=user,
+                date=date,
+                time_slot=slot_id,
+                category=category_id
+            )
+            notify_worker()
+
+        return {
+            "result": "Queued",
+            "message": "Booking request received.",
+            "ticket": intent.id
+        }, 202
+
+    @staticmethod
+    def get_booking_intent(user, ticket):
+        """
+        Returns the state of one of the user's queued booking requests.
+
+        Returns:
+            Tuple (dict, int): Response body and HTTP status.
+        """
+        intent = BookingIntent.objects.filter(id=ticket, user=user).first()
+        if intent is None:
+            return {"result": "Failed", "error": "Ticket not found."}, 404
+        if intent.status == 'PENDING':
+            # The in-process worker only starts on demand; after a restart, this picks up
+            # the intents left pending.
+            from booking_app.booking_queue import ensure_worker
+            ensure_worker()
+
+        return {
+            "result": "Success",
+            "ticket": intent.id,
+            "status": intent.status,
+            "booking": intent.result,
+            "processed_at": intent.processed_at,
+        }, 200
+
+    @staticmethod
+    def get_user_bookings(user, filters=None):
         """
-        Returns bookings for the given user.
+        Returns bookings for the given user as flat rows, optionally filtered.
 
         Args:
             user (User): Authenticated user.
+            filters (dict): Optional 'status' ('ACTIVE' or 'CANCELLED') and
+                'when' ('upcoming' or 'past', by event date).
+
+        Returns:
+            QuerySet: UserBooking `.values()` rows with the fields of UserMyBookingSerializer.
+
+        Raises:
+            ValueError: If a filter value is not recognised.
+        """
+        filters = filters or {}
+        bookings = UserBooking.objects.filter(user=user)
+
+        booking_status = filters.get('status')
+        if booking_status:
+            if booking_status not in dict(UserBooking.STATUS_CHOICES):
+                raise ValueError('Invalid status filter.')
+            bookings = bookings.filter(status=booking_status)
+
+        when = filters.get('when')
+        if when == 'upcoming':
+            bookings = bookings.filter(event__date__gte=now().date())
+        elif when == 'past':
+            bookings = bookings.filter(event__date__lt=now().date())
+        elif when:
+            raise ValueError('Invalid when filter.')
+
+        return bookings.values(
+            'id', 'status', 'booked_at', 'cancelled_at',
+            category=F('event__category__name'),
+            start_time=F('event__time_slot__start_time'),
+            end_time=F('event__time_slot__end_time'),
+            date=F('event__date'),
+        ).order_by('-booked_at', '-id')
+
+    @staticmethod
+    def get_archived_user_bookings(user, filters=None):
+        """
+        Same as get_user_bookings, over the bookings moved to the archive by booking_app.archive.
+        Archived bookings are all in the past, so 'when=upcoming' matches none of them.
+
+        Returns:
+            QuerySet: ArchivedUserBooking `.values()` rows with the keys of get_user_bookings.
+
+        Raises:
+            ValueError: If a filter value is not recognised.
+        """
+        filters = filters or {}
+        bookings = ArchivedUserBooking.objects.filter(user=user)
+
+        booking_status = filters.get('status')
+        if booking_status:
+            if booking_status not in dict(UserBooking.STATUS_CHOICES):
+                raise ValueError('Invalid status filter.')
+            bookings = bookings.filter(status=booking_status)
+
+        when = filters.get('when')
+        if when == 'upcoming':
+            bookings = bookings.none()
+        elif when and when != 'past':
+            raise ValueError('Invalid when filter.')
+
+        return bookings.values(
+            'id', 'status', 'booked_at', 'cancelled_at',
+            category=F('event__category__name'),
+            start_time=F('event__time_slot__start_time'),
+            end_time=F('event__time_slot__end_time'),
+            date=F('event__date'),
+        ).order_by('-booked_at', '-id')
+
+    @staticmethod
+    def needs_archived_bookings(filters, rows, page_size):
+        """
+        Tells whether a page of get_user_bookings rows may have to be completed from the archive.
+
+        Bookings are made on or before their slot's date, so archived bookings were all
+        made before the day after the newest archived date. A full page (page_size + 1
+        rows fetched) that ends after that moment cannot contain archived bookings.
+
+        Args:
+            filters (dict): The request's filters.
+            rows (list): Rows fetched for the page, up to page_size + 1.
+            page_size (int): Requested page size.
+
+        Returns:
+            bool: True if the archive has to be read as well.
+        """
+        if (filters or {}).get('when') == 'upcoming':
+            return False
+        newest_date = ArchivedEventAvailability.objects.aggregate(newest=Max('date'))['newest']
+        if newest_date is None:
+            return False
+        if len(rows) <= page_size:
+            return True
+        archived_before = datetime.combine(newest_date + timedelta(days=1), time.min)
+        if settings.USE_TZ:
+            archived_before = make_aware(archived_before)
+        return rows[page_size]['booked_at'] < archived_before
+
+    @staticmethod
+    def get_bookings_for_export(filters):
+        """
+        Returns all bookings matching the export filters, oldest first.
+
+        Args:
+            filters (dict): Optional 'start_date' / 'end_date' (YYYY-MM-DD, by event date)
+                and 'status' ('ACTIVE' or 'CANCELLED').
 
         Returns:
             QuerySet: UserBooking queryset.
+
+        Raises:
+            ValueError: If a filter value is not recognised.
         """
-        return UserBooking.objects.filter(user=user).select_related(
-            'event__category', 'event__time_slot'
-        ).order_by('-booked_at')
+        bookings = UserBooking.objects.all()
+
+        if filters.get('start_date'):
+            bookings = bookings.filter(event__date__gte=datetime.strptime(filters['start_date'], '%Y-%m-%d').date())
+        if filters.get('end_date'):
+            bookings = bookings.filter(event__date__lte=datetime.strptime(filters['end_date'], '%Y-%m-%d').date())
+
+        booking_status = filters.get('status')
+        if booking_status:
+            if booking_status not in dict(UserBooking.STATUS_CHOICES):
+                raise ValueError('Invalid status filter.')
+            bookings = bookings.filter(status=booking_status)
+
+        return bookings.order_by('booked_at', 'id')
 
     @staticmethod
-    @transaction.atomic
+    @write_atomic()
     def cancel_booking(user, booking_id):
         """
         Cancels a user’s booking if valid.
@@ -113,13 +443,171 @@ class UserBookingManager:
         except UserBooking.DoesNotExist:
             return {'error': 'Booking not found or does not belong to the user.'}, 404
 
-        if booking.status == 'CANCELLED':
+        # Conditional on ACTIVE, so concurrent cancellations give the seat back only once.
+        cancelled = UserBooking.objects.filter(id=booking.id, status='ACTIVE').update(
+            status='CANCELLED',
+            cancelled_at=now(),
+            updated_at=now()
+        )
+        if not cancelled:
             return {'error': 'Booking is already cancelled.'}, 400
 
-        booking.status = 'CANCELLED'
-        booking.cancelled_at = now()
-        booking.save()
-        event_obj.status = 'AVAILABLE'
-        event_obj.save()
+        if UserBookingManager.promote_waitlist(event_obj):
+            return {'message': 'Booking cancelled successfully.'}, 200
+
+        UserBookingManager.release_seat(event_obj)
+        publish_slot_change(event_obj.date, event_obj.time_slot_id, event_obj.category_id, 'AVAILABLE')
 
         return {'message': 'Booking cancelled successfully.'}, 200
+
+    @staticmethod
+    def promote_waitlist(event_obj):
+        """
+        Hands the seat of a just-cancelled booking to the earliest waitlisted user, in the
+        caller's transaction, so the seat never shows as free in between. The seat
+        changes hands, so booked_count stays as it is.
+
+        Args:
+            event_obj (EventAvailability): Slot whose ACTIVE booking was cancelled.
+
+        Returns:
+            bool: True if a waitlisted user now holds the seat.
+        """
+        if event_obj.date is None or event_obj.date < now().date():
+            return False
+
+        entry = Waitlist.objects.select_for_update().filter(
+            event=event_obj
+        ).order_by('created_at', 'id').first()
+        if entry is None:
+            return False
+
+        UserBooking.objects.create(
+            user_id=entry.user_id,
+            event=event_obj,
+            booked_at=now(),
+            status='ACTIVE'
+        )
+        entry.delete()
+        publish_slot_change(event_obj.date, event_obj.time_slot_id, event_obj.category_id, event_obj.status)
+        return True
+
+    @staticmethod
+    def get_slot(data):
+        """
+        Looks up the slot given by 'date' and 'time_slot' in the request data.
+
+        Raises:
+            EventAvailability.DoesNotExist: If there is no such slot.
+            ValueError: If 'date' is missing or malformed.
+        """
+        date = datetime.strptime(data.get('date') or '', '%Y-%m-%d').date()
+        return EventAvailability.objects.get(date=date, time_slot_id=data.get('time_slot'))
+
+    @staticmethod
+    @write_atomic()
+    def join_waitlist(user, data):
+        """
+        Adds the user to the waitlist of a booked slot.
+
+        Args:
+            user (User): Authenticated user.
+            data (dict): Contains 'date' and 'time_slot'.
+
+        Returns:
+            Tuple (dict, int): Response body with the user's position, and HTTP status.
+        """
+        try:
+            event = UserBookingManager.get_slot(data)
+        except ValueError:
+            return {"result": "Failed", "error": "A valid date is required."}, 400
+        except EventAvailability.DoesNotExist:
+            return {"result": "Failed", "error": "The selected event does not exist."}, 404
+
+        if event.date < now().date():
+            return {"result": "Failed", "error": "Cannot join the waitlist of past events."}, 400
+        if event.status != 'BOOKED':
+            return {"result": "Failed", "error": "The selected event is available, book it instead."}, 400
+        if UserBooking.objects.filter(event=event, user=user, status='ACTIVE').exists():
+            return {"result": "Failed", "error": "You have already booked this event."}, 400
+
+        entry, created = Waitlist.objects.get_or_create(user=user, event=event)
+        if not created:
+            return {"result": "Failed", "error": "You are already on the waitlist."}, 400
+
+        return {
+            "result": "Success",
+            "message": "Added to the waitlist.",
+            "position": UserBookingManager.waitlist_position(entry)
+        }, 201
+
+    @staticmethod
+    def leave_waitlist(user, data):
+        """
+        Removes the user from the waitlist of a slot.
+
+        Args:
+            user (User): Authenticated user.
+            data (dict): Contains 'date' and 'time_slot'.
+
+        Returns:
+            Tuple (dict, int): Response body and HTTP status.
+        """
+        try:
+            event = UserBookingManager.get_slot(data)
+        except ValueError:
+            return {"result": "Failed", "error": "A valid date is required."}, 400
+        except EventAvailability.DoesNotExist:
+            return {"result": "Failed", "error": "The selected event does not exist."}, 404
+
+        deleted, _ = Waitlist.objects.filter(user=user, event=event).delete()
+        if not deleted:
+            return {"result": "Failed", "error": "You are not on the waitlist."}, 404
+        return {"result": "Success", "message": "Removed from the waitlist."}, 200
+
+    @staticmethod
+    def waitlist_ahead(entry_ref):
+        """
+        Waitlist entries queued before an entry on the same slot.
+
+        Args:
+            entry_ref (dict): The entry's 'event_id', 'created_at' and 'id', as values
+                or OuterRef expressions.
+        """
+        return Waitlist.objects.filter(event_id=entry_ref['event_id']).filter(
+            Q(created_at__lt=entry_ref['created_at']) |
+            Q(created_at=entry_ref['created_at'], id__lt=entry_ref['id'])
+        )
+
+    @staticmethod
+    def waitlist_position(entry):
+        """
+        1-based position of a waitlist entry in its slot's queue.
+        """
+        return UserBookingManager.waitlist_ahead({
+            'event_id': entry.event_id, 'created_at': entry.created_at, 'id': entry.id
+        }).count() + 1
+
+    @staticmethod
+    def get_user_waitlist(user):
+        """
+        Returns the user's waitlist entries for upcoming slots with their positions.
+
+        Returns:
+            QuerySet: `.values()` rows with 'date', 'time_slot', 'category', 'position' and 'created_at'.
+        """
+        ahead = UserBookingManager.waitlist_ahead({
+            'event_id': OuterRef('event_id'), 'created_at': OuterRef('created_at'), 'id': OuterRef('id')
+        }).order_by().values('event_id').annotate(count=Count('id')).values('count')
+
+        return Waitlist.objects.filter(
+            user=user,
+            event__date__gte=now().date()
+        ).annotate(
+            position=Coalesce(Subquery(ahead), 0) + 1
+        ).values(
+            'created_at', 'position',
+            date=F('event__date'),
+            time_slot=F('event__time_slot_id'),
+            category=F('event__category__name'),
+        ).order_by('event__date', 'event__time_slot_id')
@@ -0,0 +1,92 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from .auth_backends import get_session_user
+
+from .performance import RequestStats, metrics
+
+logger = logging.getLogger('booking_app.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Records latency, database query count and time, and response size per view.
+
+    Each response gets a Server-Timing header (when settings.PERF_SERVER_TIMING is on),
+    the figures are added to the histograms served at /api/metrics/, and a warning is
+    logged when a request runs more than settings.PERF_QUERY_BUDGET queries. Streaming
+    responses are measured until the response starts, not until the body is sent.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = stats.activate()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            RequestStats.deactivate(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = stats.activate()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestStats.deactivate(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        return f'{request.method} /{match.route}' if match else f'{request.method} <unmatched>'
+
+    def record(self, request, response, stats, duration):
+        view = self.view_name(request)
+        response_bytes = None if response.streaming else len(response.content)
+
+        budget = getattr(settings, 'PERF_QUERY_BUDGET', None)
+        over_budget = budget is not None and stats.queries > budget
+        if over_budget:
+            logger.warning(
+                '%s ran %d queries (budget %d) in %.1f ms',
+                view, stats.queries, budget, stats.db_time * 1000
+            )
+
+        metrics.observe(view, duration, stats, response_bytes, over_budget)
+
+        if getattr(settings, 'PERF_SERVER_TIMING', True):
+            response['Server-Timing'] = (
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                f'total;dur={duration * 1000:.1f}'
+            )
+        return response
+
+
+class SessionAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that resolves request.user with
+    booking_app.auth_backends.get_session_user, so sessions created through a legacy
+    backend keep working once it is no longer in AUTHENTICATION_BACKENDS.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_session_user(request))
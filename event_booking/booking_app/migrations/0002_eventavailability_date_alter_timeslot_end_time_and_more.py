@@ -10,11 +10,6 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.AddField(
-            model_name='eventavailability',
-            name='date',
-            field=models.DateField(null=True),
-        ),
         migrations.AlterField(
             model_name='timeslot',
             name='end_time',
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0004_alter_userbooking_event'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbooking',
+            index=models.Index(fields=['event', 'status'], name='user_booking_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userbooking',
+            index=models.Index(fields=['user', 'booked_at'], name='user_booking_user_booked_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventavailability',
+            constraint=models.UniqueConstraint(fields=('date', 'time_slot'), name='unique_availability_date_slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='userbooking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ACTIVE')), fields=('event',), name='unique_active_booking_per_event'),
+        ),
+    ]
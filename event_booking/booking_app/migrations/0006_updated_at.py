@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0005_booking_indexes_and_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventavailability',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='userbooking',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbooking',
+            index=models.Index(fields=['booked_at', 'id'], name='user_booking_booked_id_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.23 on 2026-10-18 12:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0007_userbooking_booked_at_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('available_slots', models.IntegerField(default=0)),
+                ('booked_slots', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='booking_app.eventcategory')),
+            ],
+            options={
+                'db_table': 'daily_occupancy',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyoccupancy',
+            constraint=models.UniqueConstraint(fields=('date', 'category'), name='unique_occupancy_date_category'),
+        ),
+    ]
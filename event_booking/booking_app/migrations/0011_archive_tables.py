@@ -0,0 +1,51 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0010_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEventAvailability',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('AVAILABLE', 'Available'), ('BOOKED', 'Booked')], max_length=10)),
+                ('date', models.DateField(null=True)),
+                ('updated_at', models.DateTimeField(null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='booking_app.eventcategory')),
+                ('time_slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='booking_app.timeslot')),
+            ],
+            options={
+                'db_table': 'event_availability_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedUserBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('booked_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('ACTIVE', 'Active'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('cancelled_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='booking_app.archivedeventavailability')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_booking_archive',
+                'indexes': [models.Index(fields=['user', 'booked_at'], name='booking_archive_user_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedeventavailability',
+            index=models.Index(fields=['date'], name='availability_archive_date_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_booked_seats(apps, schema_editor):
+    # Existing slots have a single seat, taken when they have an ACTIVE booking.
+    for slot_model, booking_model in (('EventAvailability', 'UserBooking'),
+                                      ('ArchivedEventAvailability', 'ArchivedUserBooking')):
+        bookings = apps.get_model('booking_app', booking_model)
+        active = bookings.objects.filter(event=OuterRef('pk'), status='ACTIVE').order_by().values('event')
+        apps.get_model('booking_app', slot_model).objects.update(booked_count=Coalesce(
+            Subquery(active.annotate(count=Count('id')).values('count')), 0
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0011_archive_tables'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='userbooking',
+            name='unique_active_booking_per_event',
+        ),
+        migrations.AddField(
+            model_name='archivedeventavailability',
+            name='booked_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedeventavailability',
+            name='capacity',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='eventavailability',
+            name='booked_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventavailability',
+            name='capacity',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(count_booked_seats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventavailability',
+            constraint=models.CheckConstraint(check=models.Q(('booked_count__lte', models.F('capacity'))), name='availability_not_overbooked'),
+        ),
+        migrations.AddConstraint(
+            model_name='userbooking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ACTIVE')), fields=('event', 'user'), name='unique_active_booking_per_event_user'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-18 15:02
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def clear_occupancy(apps, schema_editor):
+    # Per day and category rows cannot be split by time slot; they are rebuilt below.
+    apps.get_model('booking_app', 'DailyOccupancy').objects.all().delete()
+
+
+def rebuild_occupancy(apps, schema_editor):
+    occupancy = apps.get_model('booking_app', 'DailyOccupancy')
+    totals = {}
+    for slot_model in ('EventAvailability', 'ArchivedEventAvailability'):
+        summary = apps.get_model('booking_app', slot_model).objects.filter(date__isnull=False).values(
+            'date', 'category_id', 'time_slot_id'
+        ).annotate(
+            available=Count('id', filter=Q(status='AVAILABLE')),
+            booked=Count('id', filter=Q(status='BOOKED')),
+        ).order_by()
+        for row in summary:
+            counts = totals.setdefault((row['date'], row['category_id'], row['time_slot_id']), [0, 0])
+            counts[0] += row['available']
+            counts[1] += row['booked']
+    occupancy.objects.bulk_create([
+        occupancy(date=date, category_id=category_id, time_slot_id=time_slot_id,
+                  available_slots=available, booked_slots=booked)
+        for (date, category_id, time_slot_id), (available, booked) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_app', '0012_seat_capacity'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_occupancy, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='dailyoccupancy',
+            name='unique_occupancy_date_category',
+        ),
+        migrations.AddField(
+            model_name='dailyoccupancy',
+            name='time_slot',
+            field=models.ForeignKey(default=None, on_delete=django.db.models.deletion.CASCADE, to='booking_app.timeslot'),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name='dailyoccupancy',
+            constraint=models.UniqueConstraint(fields=('date', 'category', 'time_slot'), name='unique_occupancy_date_category_slot'),
+        ),
+        migrations.RunPython(rebuild_occupancy, clear_occupancy),
+    ]
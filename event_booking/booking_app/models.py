@@ -21,6 +21,11 @@ class TimeSlot(models.Model):
         db_table = 'time_slot'
 
 class EventAvailability(models.Model):
+    """
+    A bookable slot with `capacity` seats. `booked_count` is the number of ACTIVE
+    bookings and only changes through conditional F() updates (see
+    UserBookingManager.claim_seat); the slot is BOOKED while every seat is taken.
+    """
     STATUS_CHOICES = [
         ('AVAILABLE', 'Available'),
         ('BOOKED', 'Booked')
@@ -30,8 +35,19 @@ class EventAvailability(models.Model):
     time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='AVAILABLE')
     date = models.DateField(null=True)
+    capacity = models.PositiveIntegerField(default=1)
+    booked_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         db_table = 'event_availability'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'time_slot'], name='unique_availability_date_slot'),
+            models.CheckConstraint(
+                check=models.Q(booked_count__lte=models.F('capacity')),
+                name='availability_not_overbooked'
+            ),
+        ]
 
 class UserBooking(models.Model):
     STATUS_CHOICES = [
@@ -44,6 +60,128 @@ class UserBooking(models.Model):
     booked_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ACTIVE')
     cancelled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_booking'
+        indexes = [
+            models.Index(fields=['event', 'status'], name='user_booking_event_status_idx'),
+            models.Index(fields=['user', 'booked_at'], name='user_booking_user_booked_idx'),
+            models.Index(fields=['booked_at', 'id'], name='user_booking_booked_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'user'],
+                condition=models.Q(status='ACTIVE'),
+                name='unique_active_booking_per_event_user'
+            ),
+        ]
+
+
+class Waitlist(models.Model):
+    """
+    A user waiting for a booked slot; the earliest entry is promoted to the
+    booking when the current one is cancelled.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    event = models.ForeignKey(EventAvailability, on_delete=models.CASCADE, related_name='waitlist')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'waitlist'
+        indexes = [
+            models.Index(fields=['event', 'created_at'], name='waitlist_event_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'event'], name='unique_waitlist_user_event'),
+        ]
+
+
+class DailyOccupancy(models.Model):
+    """
+    Per day, category and time slot count of available and booked slots, kept up
+    to date incrementally by booking_app.occupancy.
+    """
+    date = models.DateField()
+    category = models.ForeignKey(EventCategory, on_delete=models.CASCADE)
+    time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
+    available_slots = models.IntegerField(default=0)
+    booked_slots = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_occupancy'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'category', 'time_slot'], name='unique_occupancy_date_category_slot'
+            ),
+        ]
+
+
+class BookingIntent(models.Model):
+    """
+    A queued booking request, processed in FIFO order by booking_app.booking_queue.
+    Slot and category ids are kept as submitted and validated when processed.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    time_slot = models.IntegerField()
+    category = models.IntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    result = models.JSONField(null=True, blank=True)
+    result_code = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'booking_intent'
+        indexes = [
+            models.Index(fields=['status', 'id'], name='booking_intent_status_id_idx'),
+        ]
+
+
+class ArchivedEventAvailability(models.Model):
+    """
+    A past EventAvailability row moved out of the hot table by booking_app.archive,
+    keeping its original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    category = models.ForeignKey(EventCategory, on_delete=models.CASCADE, related_name='+')
+    time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE, related_name='+')
+    status = models.CharField(max_length=10, choices=EventAvailability.STATUS_CHOICES)
+    date = models.DateField(null=True)
+    capacity = models.PositiveIntegerField(default=1)
+    booked_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'event_availability_archive'
+        indexes = [
+            models.Index(fields=['date'], name='availability_archive_date_idx'),
+        ]
+
+
+class ArchivedUserBooking(models.Model):
+    """
+    A UserBooking of an archived slot, keeping its original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    event = models.ForeignKey(ArchivedEventAvailability, on_delete=models.CASCADE, related_name='bookings')
+    booked_at = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=UserBooking.STATUS_CHOICES)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        db_table = 'user_booking'
\ No newline at end of file
+        db_table = 'user_booking_archive'
+        indexes = [
+            models.Index(fields=['user', 'booked_at'], name='booking_archive_user_idx'),
+        ]
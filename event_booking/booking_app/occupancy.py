@@ -0,0 +1,102 @@
+from collections import Counter
+
+from django.db import router, transaction
+from django.db.models import Count, Q
+
+from .db import write_atomic
+from .models import ArchivedEventAvailability, DailyOccupancy, EventAvailability
+
+STATUS_COUNTERS = {'AVAILABLE': 'available_slots', 'BOOKED': 'booked_slots'}
+
+
+def record_occupancy_changes(changes):
+    """
+    Applies slot transitions to the DailyOccupancy summary, in the caller's transaction.
+
+    Args:
+        changes (iterable): (date, category_id, time_slot_id, old_status, new_status) tuples,
+            where a status of None means the slot did not exist before / no longer exists.
+    """
+    deltas = Counter()
+    for date, category_id, time_slot_id, old_status, new_status in changes:
+        if date is None or old_status == new_status:
+            continue
+        if old_status in STATUS_COUNTERS:
+            deltas[(date, category_id, time_slot_id, STATUS_COUNTERS[old_status])] -= 1
+        if new_status in STATUS_COUNTERS:
+            deltas[(date, category_id, time_slot_id, STATUS_COUNTERS[new_status])] += 1
+
+    rows = {}
+    for (date, category_id, time_slot_id, counter), delta in deltas.items():
+        if delta:
+            rows.setdefault((date, category_id, time_slot_id), {})[counter] = delta
+    if not rows:
+        return
+
+    # One INSERT ... ON CONFLICT DO UPDATE per batch adds the deltas to existing rows
+    # and creates the missing ones, so bulk changes cost a few statements rather than
+    # one per key, and concurrent writers to the same key never overwrite each other.
+    connection = transaction.get_connection(router.db_for_write(DailyOccupancy))
+    columns = ['date', 'category_id', 'time_slot_id', 'available_slots', 'booked_slots']
+    table, date_column, category_column, slot_column, available, booked = map(
+        connection.ops.quote_name, [DailyOccupancy._meta.db_table, *columns]
+    )
+    items = list(rows.items())
+    # As many keys per statement as the backend takes parameters, like bulk_create.
+    batch_size = connection.ops.bulk_batch_size(columns, items)
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        params = []
+        for (date, category_id, time_slot_id), counters in batch:
+            params += [
+                connection.ops.adapt_datefield_value(date), category_id, time_slot_id,
+                counters.get('available_slots', 0), counters.get('booked_slots', 0),
+            ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({date_column}, {category_column}, {slot_column}, {available}, {booked}) '
+                f'VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(batch))} '
+                f'ON CONFLICT ({date_column}, {category_column}, {slot_column}) DO UPDATE SET '
+                f'{available} = {table}.{available} + EXCLUDED.{available}, '
+                f'{booked} = {table}.{booked} + EXCLUDED.{booked}',
+                params
+            )
+
+
+def record_occupancy_change(date, category_id, time_slot_id, old_status, new_status):
+    """
+    Applies a single slot transition to the DailyOccupancy summary.
+    """
+    record_occupancy_changes([(date, category_id, time_slot_id, old_status, new_status)])
+
+
+@write_atomic()
+def rebuild_occupancy():
+    """
+    Recomputes the whole DailyOccupancy summary from EventAvailability and its archive.
+
+    Returns:
+        int: Number of summary rows written.
+    """
+    DailyOccupancy.objects.all().delete()
+    totals = {}
+    # A date being archived can briefly be split between the two tables, so sum per key.
+    for model in (EventAvailability, ArchivedEventAvailability):
+        summary = model.objects.filter(date__isnull=False).values('date', 'category_id', 'time_slot_id').annotate(
+            available=Count('id', filter=Q(status='AVAILABLE')),
+            booked=Count('id', filter=Q(status='BOOKED')),
+        ).order_by()
+        for row in summary:
+            counts = totals.setdefault((row['date'], row['category_id'], row['time_slot_id']), [0, 0])
+            counts[0] += row['available']
+            counts[1] += row['booked']
+    rows = DailyOccupancy.objects.bulk_create([
+        DailyOccupancy(
+            date=date,
+            category_id=category_id,
+            time_slot_id=time_slot_id,
+            available_slots=available,
+            booked_slots=booked,
+        ) for (date, category_id, time_slot_id), (available, booked) in totals.items()
+    ], batch_size=1000)
+    return len(rows)
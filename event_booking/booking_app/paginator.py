@@ -1,10 +1,163 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Max, Q
+
+DEFAULT_PAGE_SIZE = 10
+
+
+def get_page_size(request):
+    """
+    Reads 'page_size' from the query params, clamped to 1..settings.MAX_PAGE_SIZE.
+    Missing or non-numeric values fall back to DEFAULT_PAGE_SIZE.
+    """
+    try:
+        page_size = int(request.get('page_size') or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        page_size = DEFAULT_PAGE_SIZE
+    return min(max(page_size, 1), getattr(settings, 'MAX_PAGE_SIZE', 100))
 
 
 def paginator_func(request, object_list):
 
-    number_of_items = int(request.get('page_size')) or 10
+    number_of_items = get_page_size(request)
     paginator = Paginator(object_list, number_of_items)
     page_obj = paginator.get_page(request.get('page') or 1)
 
-    return page_obj, paginator.count
\ No newline at end of file
+    return page_obj, paginator.count
+
+
+def encode_cursor(values):
+    # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate.
+    payload = json.dumps(values, default=lambda value: value.isoformat())
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor, model, fields):
+    """
+    Decodes an opaque cursor back into its key values, parsed as `model`'s `fields`
+    (e.g. booked_at into a datetime and id into an int).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as err:
+        raise ValueError('Invalid cursor') from err
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError('Invalid cursor')
+
+    parsed = []
+    for field, value in zip(fields, values):
+        try:
+            value = model._meta.get_field(field).to_python(value)
+        except (TypeError, ValidationError) as err:
+            raise ValueError('Invalid cursor') from err
+        if value is None:
+            raise ValueError('Invalid cursor')
+        parsed.append(value)
+    return parsed
+
+
+def keyset_queryset(request, object_list, fields=('booked_at', 'id')):
+    """
+    Cursor (keyset) pagination, newest first by `fields`: returns the query for one page.
+
+    Instead of OFFSET, each page continues strictly after the key of the previous
+    page's last row, so page latency does not depend on depth when `fields` is
+    backed by an index.
+
+    Args:
+        request (QueryDict): Query params with optional 'page_size' (clamped by
+            get_page_size) and 'cursor'.
+        object_list (QuerySet): Rows to paginate.
+        fields (tuple): Unique key to order and paginate by, most significant first.
+
+    Returns:
+        Tuple (QuerySet, int): Query for up to page_size + 1 rows, and the page size.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    page_size = get_page_size(request)
+    queryset = object_list.order_by(*[f'-{field}' for field in fields])
+
+    cursor = request.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, object_list.model, fields)
+        after_cursor = Q()
+        for position, field in enumerate(fields):
+            after_cursor |= Q(
+                **{fields[earlier]: values[earlier] for earlier in range(position)},
+                **{f'{field}__lt': values[position]}
+            )
+        # The redundant bound on the leading field lets the database seek into the
+        # index instead of scanning it from the top past every newer row.
+        queryset = queryset.filter(after_cursor, **{f'{fields[0]}__lte': values[0]})
+
+    return queryset[:page_size + 1], page_size
+
+
+def keyset_page(rows, page_size, fields=('booked_at', 'id')):
+    """
+    Splits the rows fetched from keyset_queryset into the page and the next page's cursor.
+    Works with model instances and `.values()` rows.
+
+    Returns:
+        Tuple (list, str or None): Page rows and the cursor of the next page.
+    """
+    next_cursor = None
+    if len(rows) > page_size:
+        last = rows[page_size - 1]
+        next_cursor = encode_cursor([
+            last[field] if isinstance(last, dict) else getattr(last, field) for field in fields
+        ])
+    return rows[:page_size], next_cursor
+
+
+def keyset_merge(row_lists, page_size, fields=('booked_at', 'id')):
+    """
+    Merges rows fetched by keyset_queryset from several tables into one result,
+    newest first by `fields`, keeping the first row seen for each id.
+
+    Returns:
+        list: Up to page_size + 1 rows, ready for keyset_page.
+    """
+    merged = {}
+    for rows in row_lists:
+        for row in rows:
+            merged.setdefault(row['id'], row)
+    ordered = sorted(merged.values(), key=lambda row: tuple(row[field] for field in fields), reverse=True)
+    return ordered[:page_size + 1]
+
+
+def keyset_paginator_func(request, object_list, fields=('booked_at', 'id')):
+    """
+    Cursor (keyset) pagination, newest first by `fields`.
+
+    Returns:
+        Tuple (list, str or None): Page rows and the cursor of the next page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    queryset, page_size = keyset_queryset(request, object_list, fields)
+    return keyset_page(list(queryset), page_size, fields)
+
+
+def approximate_count(model):
+    """
+    Cheap estimate of a table's row count: planner statistics on PostgreSQL,
+    the highest primary key elsewhere.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [model._meta.db_table])
+            row = cursor.fetchone()
+        return max(row[0], 0) if row else None
+    return model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0
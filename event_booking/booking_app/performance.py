@@ -0,0 +1,143 @@
+"""
+Per-view request metrics collected by booking_app.middleware.PerformanceMiddleware.
+
+Queries are counted by a database execute wrapper installed on every connection
+(see signals.py) that reports into the stats of the request being handled. The
+stats are found through a context variable, which sync_to_async carries into its
+worker thread, so async views are measured too.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """
+    Database work done while handling one request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+    def activate(self):
+        return _current_stats.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current_stats.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query's count and time to the current request's stats.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {cumulative}'
+
+
+class _ViewMetrics:
+    def __init__(self):
+        self.duration = _Histogram(DURATION_BUCKETS)
+        self.queries = _Histogram(QUERY_BUCKETS)
+        self.db_time = 0.0
+        self.response_bytes = 0
+        self.over_budget = 0
+
+
+class RequestMetrics:
+    """
+    In-process histograms of latency and query count, and totals of DB time,
+    response size and query budget overruns, per view.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, duration, stats, response_bytes, over_budget):
+        with self._lock:
+            metrics = self._views.get(view)
+            if metrics is None:
+                metrics = self._views[view] = _ViewMetrics()
+            metrics.duration.observe(duration)
+            metrics.queries.observe(stats.queries)
+            metrics.db_time += stats.db_time
+            metrics.response_bytes += response_bytes or 0
+            metrics.over_budget += over_budget
+
+    def render_prometheus(self):
+        """
+        Returns a snapshot in the Prometheus text exposition format.
+        """
+        families = {
+            'booking_request_duration_seconds': ('histogram', 'Request latency by view.'),
+            'booking_request_db_queries': ('histogram', 'Database queries per request by view.'),
+            'booking_request_db_seconds_total': ('counter', 'Time spent in database queries by view.'),
+            'booking_response_bytes_total': ('counter', 'Response body size by view (streaming bodies excluded).'),
+            'booking_request_query_budget_exceeded_total': ('counter', 'Requests over PERF_QUERY_BUDGET by view.'),
+        }
+        samples = {name: [] for name in families}
+        with self._lock:
+            for view, metrics in sorted(self._views.items()):
+                labels = f'view="{_escape(view)}"'
+                samples['booking_request_duration_seconds'].extend(
+                    metrics.duration.lines('booking_request_duration_seconds', labels))
+                samples['booking_request_db_queries'].extend(
+                    metrics.queries.lines('booking_request_db_queries', labels))
+                samples['booking_request_db_seconds_total'].append(
+                    f'booking_request_db_seconds_total{{{labels}}} {metrics.db_time}')
+                samples['booking_response_bytes_total'].append(
+                    f'booking_response_bytes_total{{{labels}}} {metrics.response_bytes}')
+                samples['booking_request_query_budget_exceeded_total'].append(
+                    f'booking_request_query_budget_exceeded_total{{{labels}}} {metrics.over_budget}')
+
+        lines = []
+        for name, (kind, description) in families.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples[name])
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = RequestMetrics()
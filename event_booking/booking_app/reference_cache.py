@@ -0,0 +1,110 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import EventCategory, TimeSlot
+from .serializers import EventCategorySerializer, TimeSlotSerializer
+
+
+# In-process copy of each reference table, keyed by name: {'version', 'data', 'etag', 'last_modified'}.
+_local_entries = {}
+
+_LOADERS = {
+    'categories': lambda: [dict(row) for row in EventCategorySerializer(EventCategory.objects.all(), many=True).data],
+    'timeslots': lambda: [dict(row) for row in TimeSlotSerializer(TimeSlot.objects.all(), many=True).data],
+}
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'REFERENCE_DATA_CACHE_ALIAS', 'default')]
+
+
+def _version_key(name):
+    return f'reference:{name}:version'
+
+
+def _data_key(name):
+    return f'reference:{name}:data'
+
+
+def reference_version(name):
+    """
+    Current version of a reference table ('categories' or 'timeslots'), bumped by
+    invalidate_reference_data whenever a row is saved or deleted. It is stored without
+    a timeout, as a new version changes the ETag of every response built on it.
+
+    Returns:
+        int: Version, from the shared Django cache.
+    """
+    cache = _shared_cache()
+    version = cache.get(_version_key(name))
+    if version is None:
+        cache.add(_version_key(name), int(time.time()), timeout=None)
+        version = cache.get(_version_key(name))
+    return version
+
+
+def get_reference_data(name):
+    """
+    Returns the cached entry for a reference table ('categories' or 'timeslots').
+
+    The current version lives in the shared Django cache, so every process sees an
+    invalidation; the serialized rows are kept both in the shared cache and in-process.
+
+    Returns:
+        dict: 'data' (serialized rows), 'etag' and 'last_modified' (epoch seconds).
+    """
+    cache = _shared_cache()
+    version = reference_version(name)
+
+    entry = _local_entries.get(name)
+    if entry and entry['version'] == version:
+        return entry
+
+    entry = cache.get(_data_key(name))
+    if entry is None or entry['version'] != version:
+        entry = {
+            'version': version,
+            'data': _LOADERS[name](),
+            'etag': quote_etag(f'{name}-{version}'),
+            'last_modified': version,
+        }
+        # One key per table, replaced on the next version, so it needs no timeout either.
+        cache.set(_data_key(name), entry, timeout=None)
+    _local_entries[name] = entry
+    return entry
+
+
+def invalidate_reference_data(name):
+    """
+    Bumps the version of a reference table so every process reloads it on next read.
+    """
+    cache = _shared_cache()
+    current = cache.get(_version_key(name)) or 0
+    cache.set(_version_key(name), max(int(time.time()), current + 1), timeout=None)
+    _local_entries.pop(name, None)
+
+
+def set_validators(response, entry):
+    """
+    Adds ETag and Last-Modified headers for a reference data entry to a response.
+    """
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    return response
+
+
+def not_modified_response(request, entry):
+    """
+    Returns a 304 response when the client's If-None-Match / If-Modified-Since
+    validators still match the entry, otherwise None.
+    """
+    response = get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified']
+    )
+    if response is not None:
+        set_validators(response, entry)
+    return response
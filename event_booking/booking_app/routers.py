@@ -0,0 +1,102 @@
+"""
+Read replica routing.
+
+Views decorated with read_from_replica send their reads to the database alias in
+settings.DATABASE_REPLICA_ALIAS; all other reads and every write go to 'default'.
+After a session writes (a booking, a cancellation, an availability change)
+pin_to_primary keeps that session's reads on 'default' for REPLICA_PIN_SECONDS, so
+users see their own changes even while the replica lags behind.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+
+PIN_SESSION_KEY = 'pin_primary_until'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the alias chosen by read_from_replica for the current request,
+    and everything else to 'default'.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Sessions and users are always read from the primary, so a fresh login is
+        # seen at once, including when an async view resolves request.user lazily.
+        if model._meta.app_label == 'sessions' or model._meta.label == settings.AUTH_USER_MODEL:
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+
+def replica_alias():
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def replica_for(request):
+    """
+    Returns the replica alias to read from for this request, or None for the primary.
+    """
+    alias = replica_alias()
+    if alias is None:
+        return None
+    if request.session.get(PIN_SESSION_KEY, 0) > time.time():
+        return None
+    return alias
+
+
+def pin_to_primary(request):
+    """
+    Keeps the session's replica-routed reads on the primary for REPLICA_PIN_SECONDS.
+    """
+    if replica_alias() is not None:
+        request.session[PIN_SESSION_KEY] = time.time() + getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+
+def read_from_replica(view):
+    """
+    Decorator for read-only views (sync or async) whose reads may be served by the replica.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _read_alias.set(await sync_to_async(replica_for)(request))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _read_alias.set(replica_for(request))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+def pins_primary(view):
+    """
+    Decorator for write views: a successful response pins the session to the primary.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if response.status_code < 400:
+            pin_to_primary(request)
+        return response
+    return wrapper
@@ -29,13 +29,22 @@ class EventAvailabilitySerializer(serializers.ModelSerializer):
     time_slot = TimeSlotSerializer()
     user = serializers.SerializerMethodField()
     is_self_booked = serializers.BooleanField()
+    remaining_seats = serializers.SerializerMethodField()
 
     class Meta:
         model = EventAvailability
-        fields = ['category', 'time_slot', 'status', 'date', 'user', 'is_self_booked']
+        fields = ['category', 'time_slot', 'status', 'date', 'capacity', 'remaining_seats', 'user', 'is_self_booked']
+
+    def get_remaining_seats(self, obj):
+        return obj.capacity - obj.booked_count
 
     def get_user(self, obj):
-        booking = obj.user_booking.filter(status='ACTIVE').first()
+        # Use the ACTIVE bookings prefetched by fetch_availability when present,
+        # so the calendar does not run extra queries per slot.
+        if hasattr(obj, 'active_bookings'):
+            booking = obj.active_bookings[0] if obj.active_bookings else None
+        else:
+            booking = obj.user_booking.filter(status='ACTIVE').select_related('user').first()
         if booking:
             return {
                 "id": booking.user.id,
@@ -64,13 +73,15 @@ class UserBookingSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'booked_at', 'cancelled_at']
 
 
-class UserMyBookingSerializer(serializers.ModelSerializer):
-    category = serializers.CharField(source='event.category.name')
-    start_time = serializers.TimeField(source='event.time_slot.start_time')
-    end_time = serializers.TimeField(source='event.time_slot.end_time')
-    date = serializers.DateField(source='event.date')
+class UserMyBookingSerializer(serializers.Serializer):
+    """
+    Serializes the flat `.values()` rows returned by UserBookingManager.get_user_bookings.
+    """
+    id = serializers.IntegerField()
+    category = serializers.CharField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    date = serializers.DateField()
     status = serializers.CharField()
-
-    class Meta:
-        model = UserBooking
-        fields = ['id', 'category', 'start_time', 'end_time', 'date', 'status', 'booked_at', 'cancelled_at']
\ No newline at end of file
+    booked_at = serializers.DateTimeField()
+    cancelled_at = serializers.DateTimeField()
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth_backends import invalidate_cached_user
+from .db import apply_sqlite_pragmas
+from .models import EventCategory, TimeSlot, User
+from .performance import record_query
+from .reference_cache import invalidate_reference_data
+
+
+@receiver([post_save, post_delete], sender=EventCategory)
+def invalidate_categories(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_reference_data('categories'))
+
+
+@receiver([post_save, post_delete], sender=TimeSlot)
+def invalidate_timeslots(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_reference_data('timeslots'))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    # Again after commit, in case another request cached the old row in between.
+    invalidate_cached_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
+
+
+@receiver(connection_created)
+def count_queries(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
@@ -1,3 +1,831 @@
-from django.test import TestCase
+import threading
+import tracemalloc
+from datetime import date, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, authenticate
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, connections
+from django.utils import timezone
+from django.utils.crypto import pbkdf2
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from booking_app import fast_serializers, throttling
+from booking_app.archive import archive_history
+from booking_app.managers.booking_manager import EventBookingManager
+from booking_app.managers.user_manager import UserBookingManager
+from booking_app.models import (
+    BookingIntent, DailyOccupancy, EventAvailability, EventCategory, TimeSlot, User, UserBooking, Waitlist
+)
+from booking_app.occupancy import rebuild_occupancy
+from booking_app.paginator import encode_cursor
+from booking_app.routers import PIN_SESSION_KEY
+from booking_app.serializers import EventAvailabilitySerializer, UserBookingSerializer, UserMyBookingSerializer
+
+
+def create_calendar(days, slots_per_day=4, start=None):
+    """
+    Creates `days` days of availability from `start` (default tomorrow), with every
+    other slot booked by one of a few users.
+
+    Returns:
+        list: The dates created.
+    """
+    start = start or date.today() + timedelta(days=1)
+    category = EventCategory.objects.create(name=f'Category {EventCategory.objects.count() + 1}')
+    slots = [
+        TimeSlot.objects.create(start_time=time(8 + hour), end_time=time(9 + hour))
+        for hour in range(slots_per_day)
+    ]
+    users = [User.objects.create_user(username=f'booker{User.objects.count()}', password='pass') for _ in range(3)]
+    dates = [start + timedelta(days=offset) for offset in range(days)]
+    for day, slot_date in enumerate(dates):
+        for position, slot in enumerate(slots):
+            booked = position % 2 == 0
+            event = EventAvailability.objects.create(
+                date=slot_date,
+                time_slot=slot,
+                category=category,
+                status='BOOKED' if booked else 'AVAILABLE',
+                booked_count=1 if booked else 0
+            )
+            if booked:
+                UserBooking.objects.create(user=users[(day + position) % len(users)], event=event, status='ACTIVE')
+    return dates
+
+
+def race(calls):
+    """
+    Runs the calls on one thread each, released together.
+
+    Returns:
+        list: The status code returned by each call.
+    """
+    barrier = threading.Barrier(len(calls))
+    codes = []
+
+    def run(call):
+        barrier.wait()
+        try:
+            codes.append(call()[1])
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(call,)) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return codes
+
+
+class AvailabilityQueryBudgetTests(TestCase):
+    """
+    /api/availability/ must run a fixed number of queries however many dates are requested.
+    """
+    # Two for the ETag versions, two for the slots and their active bookers.
+    QUERY_BUDGET = 4
+
+    def setUp(self):
+        self.dates = create_calendar(31)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='viewer', password='pass'))
+
+    def assert_budget(self, days):
+        dates = ','.join(str(slot_date) for slot_date in self.dates[:days])
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get('/api/availability/', {'dates': dates})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), days * 4)
+
+    def test_query_budget_fast_serialization(self):
+        with override_settings(FAST_SERIALIZATION=True):
+            for days in (1, 7, 31):
+                self.assert_budget(days)
+
+    def test_query_budget_drf_serializer(self):
+        with override_settings(FAST_SERIALIZATION=False):
+            for days in (1, 7, 31):
+                self.assert_budget(days)
+
+
+class AvailabilityETagTests(TestCase):
+    """
+    The availability ETag must change when the reference data embedded in the response does.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.dates = create_calendar(2)
+        self.admin = User.objects.create_user(username='admin', password='pass', is_admin=True)
+        self.client = APIClient()
+        self.client.force_login(self.admin)
+
+    def assert_rename_changes_etag(self, url):
+        params = {'dates': ','.join(str(slot_date) for slot_date in self.dates)}
+        etag = self.client.get(url, params)['ETag']
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        category = EventCategory.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(f'/api/categories/{category.id}/', {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['category']['name'], 'Renamed')
+
+    def test_category_rename_changes_etag(self):
+        self.assert_rename_changes_etag('/api/availability/')
+
+    def test_category_rename_changes_etag_async(self):
+        self.assert_rename_changes_etag('/api/async/availability/')
+
+    def test_etags_outlive_the_cache_timeout(self):
+        params = {'dates': ','.join(str(slot_date) for slot_date in self.dates)}
+        etags = {url: self.client.get(url, params)['ETag'] for url in ('/api/availability/', '/api/categories/')}
+        # A day later, past any default cache timeout, nothing has changed.
+        later = timezone.now().timestamp() + 86400
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            for url, etag in etags.items():
+                self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+
+
+@override_settings(MAX_PAGE_SIZE=20)
+class PaginationTests(TestCase):
+    """
+    Page sizes are clamped and malformed cursors are rejected with 400, never 500.
+    """
+
+    def setUp(self):
+        create_calendar(20)
+        self.user = User.objects.get(username='booker0')
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def test_page_size_is_clamped(self):
+        for params, expected in (({'page_size': 0}, 1), ({'page_size': -5}, 1), ({'page_size': 'abc'}, 10),
+                                 ({'page_size': 10 ** 6}, 20)):
+            for extra in ({}, {'pagination': 'cursor'}):
+                response = self.client.get('/api/user-bookings/', {**params, **extra})
+                self.assertEqual(response.status_code, 200, (params, extra))
+                self.assertEqual(len(response.json()['data']), expected, (params, extra))
+
+            response = self.client.get('/api/my-bookings/', params)
+            self.assertEqual(response.status_code, 200, params)
+            self.assertEqual(len(response.json()['data']), min(expected, UserBooking.objects.filter(user=self.user).count()), params)
+
+    def test_malformed_cursor_is_rejected(self):
+        cursors = [
+            encode_cursor(['x', 1]),
+            encode_cursor(['2024-01-01T00:00:00+00:00', 'x']),
+            encode_cursor([None, 1]),
+            encode_cursor(['2024-01-01T00:00:00+00:00']),
+            encode_cursor({'booked_at': 1}),
+            'not-a-cursor',
+        ]
+        for cursor in cursors:
+            for url, params in (('/api/user-bookings/', {'pagination': 'cursor'}), ('/api/my-bookings/', {}),
+                                ('/api/async/my-bookings/', {})):
+                response = self.client.get(url, {**params, 'cursor': cursor})
+                self.assertEqual(response.status_code, 400, (url, cursor))
+
+    def test_cursor_walks_every_booking_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': 7, **({'cursor': cursor} if cursor else {})}
+            body = self.client.get('/api/my-bookings/', params).json()
+            seen.extend(booking['id'] for booking in body['data'])
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), sorted(UserBooking.objects.filter(user=self.user).values_list('id', flat=True)))
+
+
+class FastSerializerParityTests(TestCase):
+    """
+    booking_app.fast_serializers must produce exactly what the DRF serializers do.
+    """
+
+    def setUp(self):
+        self.dates = create_calendar(3)
+        User.objects.filter(username='booker0').update(first_name='Ada', last_name='Lovelace')
+        User.objects.filter(username='booker1').update(first_name='Grace')
+        self.user = User.objects.get(username='booker0')
+
+        # A shared slot with two seats taken and a cancelled booking.
+        shared = EventAvailability.objects.filter(status='AVAILABLE').first()
+        EventAvailability.objects.filter(pk=shared.pk).update(capacity=5, booked_count=2)
+        for username in ('booker1', 'booker0'):
+            UserBooking.objects.create(user=User.objects.get(username=username), event=shared, status='ACTIVE')
+        UserBooking.objects.create(
+            user=User.objects.get(username='booker2'), event=shared, status='CANCELLED', cancelled_at=timezone.now()
+        )
+
+    def test_serialize_availability(self):
+        slots = EventAvailability.objects.filter(date__in=self.dates)
+        fast = fast_serializers.serialize_availability(
+            fast_serializers.availability_values(slots, self.user),
+            fast_serializers.active_booker_values(slots)
+        )
+        drf = EventAvailabilitySerializer(
+            EventBookingManager.availability_queryset(self.dates, self.user), many=True
+        ).data
+
+        def key(slot):
+            return slot['date'], slot['time_slot']['id'], slot['category']['id']
+
+        self.assertEqual(len(fast), len(self.dates) * 4)
+        self.assertEqual(sorted(fast, key=key), sorted(drf, key=key))
+
+    def test_serialize_bookings(self):
+        bookings = UserBooking.objects.select_related('event__category', 'event__time_slot', 'user').order_by('id')
+        fast = fast_serializers.serialize_bookings(fast_serializers.booking_values(bookings))
+        self.assertEqual(fast, UserBookingSerializer(bookings, many=True).data)
+
+    def test_serialize_my_bookings(self):
+        rows = list(UserBookingManager.get_user_bookings(self.user).order_by('id'))
+        self.assertTrue(rows)
+        self.assertEqual(fast_serializers.serialize_my_bookings(rows), UserMyBookingSerializer(rows, many=True).data)
+
+
+class BookingExportMemoryTests(TestCase):
+    """
+    Streaming /api/user-bookings/export/ must use about the same memory for any number of rows.
+    """
+    # Both sizes span several EXPORT_CHUNK_SIZE chunks, so both peaks include the rows in flight.
+    SMALL, LARGE = 5000, 20000
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', is_admin=True)
+        self.client = APIClient()
+        self.client.force_login(self.admin)
+        self.async_client.force_login(self.admin)
+        self.category = EventCategory.objects.create(name='Export')
+        self.slots = [TimeSlot.objects.create(start_time=time(hour), end_time=time(hour, 59)) for hour in range(24)]
+        self.created = 0
+
+    def add_bookings(self, count):
+        events = EventAvailability.objects.bulk_create([
+            EventAvailability(
+                date=date.today() + timedelta(days=index // len(self.slots)),
+                time_slot=self.slots[index % len(self.slots)],
+                category=self.category, status='BOOKED', booked_count=1
+            )
+            for index in range(self.created, self.created + count)
+        ])
+        UserBooking.objects.bulk_create([UserBooking(user=self.admin, event=event, status='ACTIVE') for event in events])
+        self.created += count
+
+    def stream(self, export_format):
+        response = self.client.get('/api/user-bookings/export/', {'export_format': export_format})
+        self.assertEqual(response.status_code, 200)
+        return sum(chunk.count(b'\n') for chunk in response.streaming_content)
+
+    async def astream(self, export_format):
+        response = await self.async_client.get('/api/user-bookings/export/', {'export_format': export_format})
+        self.assertEqual(response.status_code, 200)
+        # Iterating the response itself, as Django's ASGIHandler does when sending it.
+        return sum([chunk.count(b'\n') async for chunk in response])
+
+    def export_peak(self, export_format, asgi=False):
+        """
+        Streams the export, keeping no chunk, and returns its line count and peak traced memory.
+        """
+        tracemalloc.start()
+        try:
+            lines = async_to_sync(self.astream)(export_format) if asgi else self.stream(export_format)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return lines, peak
+
+    def assert_peak_memory_does_not_grow_with_rows(self, asgi):
+        self.add_bookings(self.SMALL)
+        small = {export_format: self.export_peak(export_format, asgi) for export_format in ('ndjson', 'csv')}
+        self.add_bookings(self.LARGE - self.SMALL)
+        large = {export_format: self.export_peak(export_format, asgi) for export_format in ('ndjson', 'csv')}
+
+        for export_format, header_lines in (('ndjson', 0), ('csv', 1)):
+            self.assertEqual(small[export_format][0], self.SMALL + header_lines)
+            self.assertEqual(large[export_format][0], self.LARGE + header_lines)
+            # Four times the rows; a response built in memory would need about four times the peak.
+            self.assertLess(large[export_format][1], small[export_format][1] * 1.5, export_format)
+
+    def test_peak_memory_does_not_grow_with_rows(self):
+        self.assert_peak_memory_does_not_grow_with_rows(asgi=False)
+
+    def test_peak_memory_does_not_grow_with_rows_asgi(self):
+        self.assert_peak_memory_does_not_grow_with_rows(asgi=True)
+
+
+class OccupancyConsistencyTests(TestCase):
+    """
+    The incrementally maintained DailyOccupancy must match a rebuild after any mix of writes.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', is_admin=True)
+        self.users = [User.objects.create_user(username=f'guest{index}', password='pass') for index in range(3)]
+        self.category, self.other_category = (EventCategory.objects.create(name=name) for name in ('Yoga', 'Pilates'))
+        self.slots = [TimeSlot.objects.create(start_time=time(8 + hour), end_time=time(9 + hour)) for hour in range(4)]
+        self.days = [date.today() + timedelta(days=offset) for offset in range(1, 6)]
+
+    def call(self, user, method, url, data, expected):
+        client = APIClient()
+        client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(client, method)(url, data, format='json')
+        self.assertEqual(response.status_code, expected, (method, url, data, response.content))
+        return response
+
+    def book(self, user, day, slot, expected=201):
+        return self.call(user, 'post', '/api/user-bookings/', {
+            'date': str(day), 'time_slot': slot.id, 'categoryId': self.category.id
+        }, expected)
+
+    def snapshot(self):
+        return sorted(DailyOccupancy.objects.exclude(available_slots=0, booked_slots=0).values_list(
+            'date', 'category_id', 'time_slot_id', 'available_slots', 'booked_slots'
+        ))
+
+    def assert_consistent(self):
+        incremental = self.snapshot()
+        rebuild_occupancy()
+        self.assertEqual(incremental, self.snapshot())
+        self.assertTrue(incremental)
+
+    def test_mixed_writes(self):
+        # Past slots, as left by earlier days, then archived half way through.
+        for offset in (100, 101):
+            for slot in self.slots[:2]:
+                EventAvailability.objects.create(date=date.today() - timedelta(days=offset), time_slot=slot,
+                                                 category=self.category, status='BOOKED', booked_count=1)
+        rebuild_occupancy()
+
+        self.call(self.admin, 'post', '/api/availability/bulk/', {
+            'start_date': str(self.days[0]), 'end_date': str(self.days[-1]),
+            'time_slots': [slot.id for slot in self.slots], 'category': self.category.id
+        }, 201)
+        self.call(self.admin, 'post', '/api/availability/', {
+            'date': str(self.days[0]), 'time_slot': self.slots[0].id, 'category': self.category.id, 'capacity': 3
+        }, 200)
+        for user in self.users:
+            self.book(user, self.days[0], self.slots[0])
+        self.book(self.users[0], self.days[1], self.slots[1])
+        self.book(self.users[1], self.days[1], self.slots[1], expected=200)  # Full: refused.
+        self.book(self.users[1], self.days[2], self.slots[2])
+        self.call(self.users[2], 'post', '/api/waitlist/', {'date': str(self.days[2]), 'time_slot': self.slots[2].id}, 201)
+        self.assert_consistent()
+
+        for user, day, slot in ((self.users[0], self.days[0], self.slots[0]), (self.users[1], self.days[2], self.slots[2])):
+            booking = UserBooking.objects.get(user=user, event__date=day, event__time_slot=slot, status='ACTIVE')
+            self.call(user, 'delete', f'/api/my-bookings/{booking.id}/', None, 200)
+        self.call(self.admin, 'post', '/api/availability/', {
+            'date': str(self.days[3]), 'time_slot': self.slots[3].id, 'category': self.other_category.id
+        }, 200)
+        self.call(self.admin, 'put', '/api/availability/bulk/', {
+            'start_date': str(self.days[3]), 'end_date': str(self.days[4]), 'new_category': self.other_category.id
+        }, 200)
+        self.call(self.admin, 'delete', '/api/availability/', {'date': str(self.days[4]), 'time_slot': self.slots[0].id}, 200)
+        self.call(self.admin, 'delete', '/api/availability/bulk/', {
+            'start_date': str(self.days[1]), 'end_date': str(self.days[1])
+        }, 200)
+        archive_history(date.today())
+        self.assert_consistent()
+
+    def test_bulk_writes_update_the_summary_set_based(self):
+        # 40 times the slots of a small range may cost a few more batches, never a query per slot.
+        slots = [TimeSlot.objects.create(start_time=time(hour), end_time=time(hour, 59)) for hour in range(10)]
+        counts = {}
+        for days in (2, 80):
+            end = self.days[0] + timedelta(days=days - 1)
+            requests = [
+                ('post', {'start_date': str(self.days[0]), 'end_date': str(end),
+                          'time_slots': [slot.id for slot in slots], 'category': self.category.id}, 201),
+                ('put', {'start_date': str(self.days[0]), 'end_date': str(end),
+                         'new_category': self.other_category.id}, 200),
+                ('delete', {'start_date': str(self.days[0]), 'end_date': str(end)}, 200),
+            ]
+            for method, data, expected in requests:
+                with CaptureQueriesContext(connection) as queries:
+                    self.call(self.admin, method, '/api/availability/bulk/', data, expected)
+                counts[method, days] = len(queries)
+                if method != 'delete':
+                    self.assert_consistent()
+        for method in ('post', 'put', 'delete'):
+            self.assertLessEqual(counts[method, 80], counts[method, 2] + 20, counts)
+
+    def test_stats_per_time_slot(self):
+        self.call(self.admin, 'post', '/api/availability/bulk/', {
+            'start_date': str(self.days[0]), 'end_date': str(self.days[1]),
+            'time_slots': [slot.id for slot in self.slots], 'category': self.category.id
+        }, 201)
+        self.book(self.users[0], self.days[0], self.slots[1])
+        self.book(self.users[1], self.days[1], self.slots[1])
+
+        data = self.call(self.admin, 'get', '/api/stats/occupancy/', {
+            'start_date': str(self.days[0]), 'end_date': str(self.days[1])
+        }, 200).json()['data']
+        self.assertEqual(
+            [(row['time_slot']['id'], row['available_slots'], row['booked_slots']) for row in data['by_time_slot']],
+            [(self.slots[0].id, 2, 0), (self.slots[1].id, 0, 2), (self.slots[2].id, 2, 0), (self.slots[3].id, 2, 0)]
+        )
+        self.assertEqual(
+            [(row['date'], row['available_slots'], row['booked_slots']) for row in data['daily']],
+            [(str(self.days[0]), 3, 1), (str(self.days[1]), 3, 1)]
+        )
+
+
+class BulkAvailabilityTests(TestCase):
+    """
+    Bulk delete and re-categorise leave booked slots alone and report every slot they skip.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', is_admin=True)
+        self.client = APIClient()
+        self.client.force_login(self.admin)
+        self.category, self.other_category = (EventCategory.objects.create(name=name) for name in ('Yoga', 'Pilates'))
+        self.slots = [TimeSlot.objects.create(start_time=time(8 + hour), end_time=time(9 + hour)) for hour in range(2)]
+        self.today = date.today()
+        self.events = {
+            (offset, slot.id): EventAvailability.objects.create(
+                date=self.today + timedelta(days=offset), time_slot=slot, category=self.category, capacity=2
+            )
+            for offset in (-1, 1, 2) for slot in self.slots
+        }
+        # One slot full, one with a seat left: both count as booked.
+        for offset, booked in ((1, 2), (2, 1)):
+            event = self.events[offset, self.slots[0].id]
+            for user in User.objects.bulk_create([User(username=f'guest{offset}-{n}') for n in range(booked)]):
+                UserBooking.objects.create(user=user, event=event, status='ACTIVE')
+            event.booked_count = booked
+            event.status = 'BOOKED' if booked == 2 else 'AVAILABLE'
+            event.save()
+        self.range = {
+            'start_date': str(self.today - timedelta(days=1)), 'end_date': str(self.today + timedelta(days=2))
+        }
+
+    def skipped(self, response, message):
+        return [(row['date'], row['time_slot']) for row in response.json()['skipped'] if row['message'] == message]
+
+    def key(self, offset, slot):
+        return str(self.today + timedelta(days=offset)), slot.id
+
+    def test_recategorise_skips_past_and_booked_slots(self):
+        response = self.client.put('/api/availability/bulk/', {**self.range, 'new_category': self.other_category.id},
+                                   format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertEqual(self.skipped(response, 'Cannot update past dates.'),
+                         [self.key(-1, self.slots[0]), self.key(-1, self.slots[1])])
+        self.assertEqual(self.skipped(response, 'Slot already booked.'),
+                         [self.key(1, self.slots[0]), self.key(2, self.slots[0])])
+        moved = set(EventAvailability.objects.filter(category=self.other_category).values_list('date', 'time_slot_id'))
+        self.assertEqual(moved, {(self.today + timedelta(days=offset), self.slots[1].id) for offset in (1, 2)})
+
+    def test_delete_skips_booked_slots(self):
+        response = self.client.delete('/api/availability/bulk/', self.range, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['deleted'], 4)
+        self.assertEqual(self.skipped(response, 'Slot already booked.'),
+                         [self.key(1, self.slots[0]), self.key(2, self.slots[0])])
+        self.assertEqual(
+            set(EventAvailability.objects.values_list('id', flat=True)),
+            {self.events[1, self.slots[0].id].id, self.events[2, self.slots[0].id].id}
+        )
+        self.assertEqual(UserBooking.objects.filter(status='ACTIVE').count(), 3)
+
+
+class TokenBucketThrottleTests(TestCase):
+    """
+    Rate limits key clients by an address they cannot forge, and a refused request spends no tokens.
+    """
+
+    def setUp(self):
+        throttling._store = None
+        self.user = User.objects.create_user(username='guest', password='pass')
+        self.client = APIClient()
+
+    def tearDown(self):
+        throttling._store = None
+
+    def post_booking(self, address):
+        return self.client.post('/api/user-bookings/', {}, format='json', REMOTE_ADDR=address).status_code
+
+    @override_settings(RATE_LIMITS={'booking': {'user': '2/min', 'ip': '1/min'}})
+    def test_refused_request_spends_no_tokens(self):
+        self.client.force_login(self.user)
+        self.assertNotEqual(self.post_booking('10.0.0.1'), 429)
+        # Refused by the empty IP bucket: the user's second token must survive.
+        self.assertEqual(self.post_booking('10.0.0.1'), 429)
+        self.assertNotEqual(self.post_booking('10.0.0.2'), 429)
+        self.assertEqual(self.post_booking('10.0.0.3'), 429)
+
+    @override_settings(RATE_LIMITS={'login': {'ip': '1/min'}})
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        statuses = [
+            self.client.post('/api/login/', {'username': 'guest', 'password': 'wrong'}, format='json',
+                             HTTP_X_FORWARDED_FOR=f'203.0.113.{index}').status_code
+            for index in range(2)
+        ]
+        self.assertNotEqual(statuses[0], 429)
+        self.assertEqual(statuses[1], 429)
+
+    @override_settings(RATE_LIMITS={'login': {'ip': '1/min'}})
+    def test_forwarded_for_is_used_behind_a_proxy(self):
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            statuses = [
+                self.client.post('/api/login/', {'username': 'guest', 'password': 'wrong'}, format='json',
+                                 HTTP_X_FORWARDED_FOR=f'203.0.113.{index}').status_code
+                for index in range(2)
+            ]
+        self.assertNotIn(429, statuses)
+
+
+class BookingQueueRestartTests(TestCase):
+    """
+    Intents left PENDING by a previous process are booked once a worker runs again.
+    """
+
+    def setUp(self):
+        self.dates = create_calendar(1)
+        self.user = User.objects.create_user(username='queued', password='pass')
+        free = EventAvailability.objects.filter(status='AVAILABLE').first()
+        self.intent = BookingIntent.objects.create(
+            user=self.user, date=free.date, time_slot=free.time_slot_id, category=free.category_id
+        )
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def test_command_books_pending_intents(self):
+        call_command('process_booking_queue', '--once', stdout=mock.MagicMock())
+        self.intent.refresh_from_db()
+        self.assertEqual(self.intent.status, 'SUCCEEDED')
+        self.assertTrue(UserBooking.objects.filter(user=self.user, status='ACTIVE').exists())
+
+    def test_polling_a_pending_ticket_starts_the_thread_worker(self):
+        url = f'/api/user-bookings/queue/{self.intent.id}/'
+        with mock.patch('booking_app.booking_queue.start_worker_thread') as start:
+            with override_settings(BOOKING_QUEUE_WORKER=None):
+                self.assertEqual(self.client.get(url).json()['status'], 'PENDING')
+            start.assert_not_called()
+            with override_settings(BOOKING_QUEUE_WORKER='thread'):
+                self.client.get(url)
+            start.assert_called_once()
+
+
+class SessionAuthTests(TestCase):
+    """
+    Sessions end everywhere on logout and stay valid across the configured auth backends.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='member', password='pass')
+
+    def check_session(self, client):
+        return client.get('/api/check-session/').json()['authenticated']
+
+    def test_logout_ends_the_session_for_every_client(self):
+        client = APIClient()
+        client.force_login(self.user)
+        # A second client holding the same cookie, as another worker process would see it.
+        other = APIClient()
+        other.cookies['sessionid'] = client.cookies['sessionid'].value
+        self.assertTrue(self.check_session(other))
+
+        client.post('/api/logout/')
+        self.assertFalse(self.check_session(other))
+
+    def test_sessions_of_the_legacy_backend_are_accepted(self):
+        for backend in ('booking_app.auth_backends.CachedModelBackend', 'django.contrib.auth.backends.ModelBackend'):
+            client = APIClient()
+            client.force_login(self.user, backend=backend)
+            self.assertTrue(self.check_session(client), backend)
+            session = SessionStore(client.cookies['sessionid'].value)
+            self.assertEqual(session[BACKEND_SESSION_KEY], 'booking_app.auth_backends.CachedModelBackend')
+
+    def test_failed_login_hashes_once(self):
+        for username, password in (('member', 'pass'), ('member', 'wrong'), ('nobody', 'pass')):
+            with mock.patch('django.contrib.auth.hashers.pbkdf2', wraps=pbkdf2) as hashed:
+                authenticate(username=username, password=password)
+            self.assertEqual(hashed.call_count, 1, username)
+
+
+class SeatCounterConcurrencyTests(TransactionTestCase):
+    """
+    Concurrent bookings never sell more seats than the slot has, and concurrent
+    cancellations give each seat back once, with every booking strategy.
+    """
+    THREADS = 30
+    CAPACITY = 5
+
+    def setUp(self):
+        category = EventCategory.objects.create(name='Workshop')
+        slot = TimeSlot.objects.create(start_time=time(9), end_time=time(10))
+        self.event = EventAvailability.objects.create(
+            date=date.today() + timedelta(days=1), time_slot=slot, category=category, capacity=self.CAPACITY
+        )
+        self.users = User.objects.bulk_create([User(username=f'racer{index}') for index in range(self.THREADS)])
+
+    def assert_seats(self, booked):
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.booked_count, booked)
+        self.assertEqual(UserBooking.objects.filter(event=self.event, status='ACTIVE').count(), booked)
+        self.assertEqual(self.event.status, 'BOOKED' if booked == self.CAPACITY else 'AVAILABLE')
+
+    def book_and_cancel(self):
+        data = {'date': str(self.event.date), 'time_slot': self.event.time_slot_id, 'categoryId': self.event.category_id}
+        codes = race([lambda user=user: UserBookingManager.create_booking(user, data) for user in self.users])
+        self.assertEqual(codes.count(201), self.CAPACITY)
+        self.assert_seats(self.CAPACITY)
+
+        # Every booking is cancelled twice at once; only one of each gives the seat back.
+        bookings = UserBooking.objects.filter(event=self.event, status='ACTIVE').select_related('user')
+        codes = race([
+            lambda booking=booking: UserBookingManager.cancel_booking(booking.user, booking.id)
+            for booking in bookings for _ in range(2)
+        ])
+        self.assertEqual(codes.count(200), self.CAPACITY)
+        self.assert_seats(0)
+
+    def test_optimistic(self):
+        with override_settings(BOOKING_STRATEGY='optimistic'):
+            self.book_and_cancel()
+
+    def test_locking(self):
+        with override_settings(BOOKING_STRATEGY='locking'):
+            self.book_and_cancel()
+
+
+class WaitlistTests(TransactionTestCase):
+    """
+    A cancelled seat goes to the earliest waitlisted user in the cancelling transaction,
+    leaving booked_count as it was; past slots and empty waitlists just free the seat.
+    """
+
+    def setUp(self):
+        self.category = EventCategory.objects.create(name='Workshop')
+        self.slot = TimeSlot.objects.create(start_time=time(9), end_time=time(10))
+        self.users = User.objects.bulk_create([User(username=f'member{index}') for index in range(6)])
+
+    def full_slot(self, capacity=1, days=1):
+        """
+        Creates a slot `days` from today with every seat booked by the first users.
+
+        Returns:
+            EventAvailability: The slot, with its bookings in self.bookings.
+        """
+        event = EventAvailability.objects.create(
+            date=date.today() + timedelta(days=days), time_slot=self.slot, category=self.category,
+            capacity=capacity, booked_count=capacity, status='BOOKED'
+        )
+        self.bookings = [UserBooking.objects.create(user=user, event=event, status='ACTIVE')
+                         for user in self.users[:capacity]]
+        return event
+
+    def join(self, user, event, expected=201):
+        body, code = UserBookingManager.join_waitlist(user, {'date': str(event.date), 'time_slot': self.slot.id})
+        self.assertEqual(code, expected, body)
+        return body
+
+    def holders(self, event):
+        return set(UserBooking.objects.filter(event=event, status='ACTIVE').values_list('user_id', flat=True))
+
+    def assert_seats(self, event, booked, status):
+        event.refresh_from_db()
+        self.assertEqual((event.booked_count, event.status), (booked, status))
+        self.assertEqual(len(self.holders(event)), booked)
+
+    def test_join_and_leave(self):
+        event = self.full_slot()
+        self.assertEqual(self.join(self.users[1], event)['position'], 1)
+        self.assertEqual(self.join(self.users[2], event)['position'], 2)
+        self.join(self.users[1], event, expected=400)  # Already waiting.
+        self.join(self.users[0], event, expected=400)  # Holds the seat.
+
+        data = {'date': str(event.date), 'time_slot': self.slot.id}
+        self.assertEqual(UserBookingManager.leave_waitlist(self.users[1], data)[1], 200)
+        self.assertEqual(UserBookingManager.leave_waitlist(self.users[1], data)[1], 404)
+        self.assertEqual([row['position'] for row in UserBookingManager.get_user_waitlist(self.users[2])], [1])
+
+        event.booked_count, event.status = 0, 'AVAILABLE'
+        event.save()
+        self.join(self.users[3], event, expected=400)  # Free: book it instead.
+
+    def test_promotes_in_join_order(self):
+        event = self.full_slot()
+        for user in self.users[1:4]:
+            self.join(user, event)
+
+        for index in range(3):
+            booking = UserBooking.objects.get(user=self.users[index], event=event, status='ACTIVE')
+            self.assertEqual(UserBookingManager.cancel_booking(self.users[index], booking.id)[1], 200)
+            self.assertEqual(self.holders(event), {self.users[index + 1].id})
+            self.assert_seats(event, 1, 'BOOKED')
+        self.assertFalse(Waitlist.objects.filter(event=event).exists())
+
+    def test_promotion_rolls_back_with_the_cancellation(self):
+        event = self.full_slot()
+        self.join(self.users[1], event)
+        with mock.patch.object(Waitlist, 'delete', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                UserBookingManager.cancel_booking(self.users[0], self.bookings[0].id)
+        self.assertEqual(self.holders(event), {self.users[0].id})
+        self.assertTrue(Waitlist.objects.filter(event=event, user=self.users[1]).exists())
+        self.assert_seats(event, 1, 'BOOKED')
+
+    def test_no_promotion_for_past_slots_or_empty_waitlists(self):
+        past = self.full_slot(days=-1)
+        Waitlist.objects.create(user=self.users[1], event=past)
+        self.assertEqual(UserBookingManager.cancel_booking(self.users[0], self.bookings[0].id)[1], 200)
+        self.assert_seats(past, 0, 'AVAILABLE')
+        self.assertTrue(Waitlist.objects.filter(event=past).exists())
+
+        upcoming = self.full_slot(days=2)
+        self.assertEqual(UserBookingManager.cancel_booking(self.users[0], self.bookings[0].id)[1], 200)
+        self.assert_seats(upcoming, 0, 'AVAILABLE')
+
+    def test_concurrent_cancellations_promote_each_waiting_user_once(self):
+        event = self.full_slot(capacity=3)
+        waiting = self.users[3:6]
+        for user in waiting:
+            self.join(user, event)
+        codes = race([
+            lambda booking=booking: UserBookingManager.cancel_booking(booking.user, booking.id)
+            for booking in self.bookings for _ in range(2)
+        ])
+        self.assertEqual(codes.count(200), 3)
+        self.assertEqual(self.holders(event), {user.id for user in waiting})
+        self.assert_seats(event, 3, 'BOOKED')
+        self.assertFalse(Waitlist.objects.filter(event=event).exists())
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica', REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Decorated reads go to the replica, writes to the primary, and a session that has
+    just written reads from the primary until its pin expires.
+    """
+    # The replica mirrors the primary's test database, so it sees committed rows.
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.dates = create_calendar(2)
+        self.user = User.objects.create_user(username='reader', password='pass')
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def slot_queries(self, request):
+        """
+        Runs the request and returns the number of event_availability queries per alias.
+        """
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = request()
+        self.assertLess(response.status_code, 400, response.content)
+        return {
+            alias: sum('event_availability' in query['sql'] for query in queries.captured_queries)
+            for alias, queries in (('default', primary), ('replica', replica))
+        }
+
+    def read(self):
+        params = {'dates': ','.join(str(slot_date) for slot_date in self.dates)}
+        return {
+            url: self.slot_queries(lambda: self.client.get(url, params))
+            for url in ('/api/availability/', '/api/async/availability/')
+        }
+
+    def test_reads_replica_until_the_session_writes(self):
+        for url, queries in self.read().items():
+            self.assertEqual(queries['default'], 0, url)
+            self.assertGreater(queries['replica'], 0, url)
+
+        free = EventAvailability.objects.filter(status='AVAILABLE').first()
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post('/api/user-bookings/', {
+                'date': str(free.date), 'time_slot': free.time_slot_id, 'categoryId': free.category_id
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(replica.captured_queries, [])
+        self.assertTrue(UserBooking.objects.using('default').filter(user=self.user, event=free).exists())
+
+        # Pinned to the primary after the write, whichever view reads.
+        for url, queries in self.read().items():
+            self.assertEqual(queries['replica'], 0, url)
+            self.assertGreater(queries['default'], 0, url)
+
+        # Back on the replica once the pin has expired.
+        session = self.client.session
+        session[PIN_SESSION_KEY] = 0
+        session.save()
+        for url, queries in self.read().items():
+            self.assertEqual(queries['default'], 0, url)
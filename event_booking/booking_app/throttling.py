@@ -0,0 +1,178 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parses a DRF-style rate such as '10/min' or '5/s' into a token bucket.
+
+    Returns:
+        Tuple (int, float): Bucket capacity and refill rate in tokens per second.
+    """
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class BaseBucketStore:
+    """
+    Interface for token bucket storage shared by the rate throttles.
+    """
+
+    def consume(self, buckets):
+        """
+        Takes one token from each bucket, refilling them for the time elapsed, but only
+        if every one of them has a token; otherwise none is spent.
+
+        Args:
+            buckets (list): (key, capacity, refill_rate) tuples.
+
+        Returns:
+            float: 0 if the tokens were taken, else seconds until all buckets have one.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _take(states, buckets, now):
+        """
+        Refills and debits the bucket `states` (None for a new, full bucket).
+
+        Returns:
+            Tuple (list, float): New states, to store only when the wait is 0, and the wait.
+        """
+        refilled, wait = [], 0
+        for state, (_, capacity, refill_rate) in zip(states, buckets):
+            tokens, updated = state if state else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            refilled.append(tokens)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / refill_rate)
+        if wait:
+            return None, wait
+        return [(tokens - 1, now) for tokens in refilled], 0
+
+
+class InMemoryBucketStore(BaseBucketStore):
+    """
+    Per-process buckets; each worker process enforces its own budget.
+    """
+
+    prune_every = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._operations = 0
+
+    def consume(self, buckets):
+        now = time.monotonic()
+        with self._lock:
+            states, wait = self._take(
+                [self._buckets.get(key, (None,))[0] for key, _, _ in buckets], buckets, now
+            )
+            if states:
+                for state, (key, capacity, refill_rate) in zip(states, buckets):
+                    # Past the second timestamp the bucket is full again, so pruning it is lossless.
+                    self._buckets[key] = (state, now + (capacity - state[0]) / refill_rate)
+            self._operations += 1
+            if self._operations % self.prune_every == 0:
+                self._buckets = {
+                    key: entry for key, entry in self._buckets.items() if entry[1] > now
+                }
+        return wait
+
+
+class CacheBucketStore(BaseBucketStore):
+    """
+    Buckets kept in the Django cache set by settings.RATE_LIMIT_CACHE_ALIAS, so that
+    all processes share one budget. Read-modify-write is not atomic across processes,
+    so concurrent requests can occasionally overdraw a bucket by a token.
+    """
+
+    def __init__(self):
+        self._cache = caches[getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', 'default')]
+
+    def consume(self, buckets):
+        keys = [f'ratelimit:{key}' for key, _, _ in buckets]
+        stored = self._cache.get_many(keys)
+        states, wait = self._take([stored.get(key) for key in keys], buckets, time.time())
+        if states:
+            for key, state, (_, capacity, refill_rate) in zip(keys, states, buckets):
+                self._cache.set(key, state, timeout=int(capacity / refill_rate) + 1)
+        return wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    """
+    Returns the process-wide bucket store configured by settings.RATE_LIMIT_STORE.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = getattr(settings, 'RATE_LIMIT_STORE', 'booking_app.throttling.InMemoryBucketStore')
+                _store = import_string(backend)()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket throttle with a per-user and a per-IP bucket for each scope.
+
+    Budgets come from settings.RATE_LIMITS[scope], e.g. {'user': '10/min', 'ip': '60/min'};
+    a missing entry leaves that bucket unlimited. Only requests whose method is in
+    `methods` are counted. When throttled, DRF answers 429 with Retry-After.
+
+    The IP bucket is keyed by DRF's get_ident, which only reads X-Forwarded-For when
+    REST_FRAMEWORK['NUM_PROXIES'] says how many trusted proxies sit in front of the app.
+    """
+
+    scope = None
+    methods = ('POST',)
+
+    def __init__(self):
+        self._wait = None
+
+    def get_buckets(self, request):
+        buckets = []
+        if request.user and request.user.is_authenticated:
+            buckets.append(('user', request.user.pk))
+        buckets.append(('ip', self.get_ident(request)))
+        return buckets
+
+    def allow_request(self, request, view):
+        if request.method not in self.methods:
+            return True
+
+        rates = getattr(settings, 'RATE_LIMITS', {}).get(self.scope, {})
+        buckets = [
+            (f'{self.scope}:{kind}:{ident}', *parse_rate(rates[kind]))
+            for kind, ident in self.get_buckets(request) if rates.get(kind)
+        ]
+        if not buckets:
+            return True
+        # All or nothing, so a request refused by one bucket does not spend the others.
+        self._wait = get_bucket_store().consume(buckets)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+class BookingRateThrottle(TokenBucketThrottle):
+    scope = 'booking'
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    scope = 'login'
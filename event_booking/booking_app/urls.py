@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import (EventCategoryView, TimeSlotView, EventAvailabilityView, UserBookingAPIView,
-                    CheckSessionView, LoginView, RegisterView, LogoutView, MyBookingsView, get_csrf)
+
+from . import async_views
+from .views import (EventCategoryView, TimeSlotView, EventAvailabilityView, EventAvailabilityBulkView,
+                    UserBookingAPIView, BookingTicketView, UserBookingExportView, CheckSessionView, LoginView,
+                    RegisterView, LogoutView, MyBookingsView, WaitlistView, OccupancyStatsView, MetricsView, get_csrf,
+                    slot_events)
 
 
 urlpatterns = [
@@ -13,8 +17,24 @@ urlpatterns = [
     path('categories/<int:pk>/', EventCategoryView.as_view()),
     path('timeslots/', TimeSlotView.as_view()),
     path('availability/', EventAvailabilityView.as_view()),
+    path('availability/bulk/', EventAvailabilityBulkView.as_view()),
+    path('availability/events/', slot_events),
     path('user-bookings/', UserBookingAPIView.as_view()),
+    path('user-bookings/export/', UserBookingExportView.as_view()),
+    path('user-bookings/queue/<int:ticket>/', BookingTicketView.as_view()),
     path('my-bookings/', MyBookingsView.as_view()),
     path('my-bookings/<int:pk>/', MyBookingsView.as_view()),
+    path('waitlist/', WaitlistView.as_view()),
+    path('stats/occupancy/', OccupancyStatsView.as_view()),
+    path('metrics/', MetricsView.as_view()),
+
+    # ASGI-native read endpoints, same responses as their sync counterparts above.
+    path('async/login/', async_views.login_view),
+    path('async/register/', async_views.register_view),
+    path('async/check-session/', async_views.check_session),
+    path('async/categories/', async_views.categories),
+    path('async/timeslots/', async_views.timeslots),
+    path('async/availability/', async_views.availability),
+    path('async/my-bookings/', async_views.my_bookings),
 
 ]
@@ -1,19 +1,34 @@
-from datetime import time
+import asyncio
+import csv
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 
+from . import fast_serializers
+from .broadcaster import get_broadcaster
 from .managers.booking_manager import EventBookingManager
 from .managers.user_manager import UserBookingManager
-from .models import EventCategory, TimeSlot, UserBooking, User, EventAvailability
-from .paginator import paginator_func
+from .models import EventCategory, UserBooking, User
+from .paginator import approximate_count, keyset_merge, keyset_page, keyset_paginator_func, keyset_queryset, \
+    paginator_func
+from .performance import metrics
 from .permission_classes import IsAdminUser
-from .serializers import EventCategorySerializer, TimeSlotSerializer, UserBookingSerializer, \
+from .reference_cache import get_reference_data, not_modified_response, set_validators
+from .routers import pins_primary, read_from_replica
+from .throttling import BookingRateThrottle, LoginRateThrottle
+from .serializers import EventCategorySerializer, UserBookingSerializer, \
     UserMyBookingSerializer
 from django.views.decorators.csrf import ensure_csrf_cookie
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 
@@ -23,6 +38,52 @@ def get_csrf(request):
     return JsonResponse({'detail': 'CSRF cookie set'})
 
 
+async def slot_events(request):
+    """
+    Stream slot status changes for the requested dates as Server-Sent Events.
+
+    Each change to a subscribed date (booking, cancellation, availability created,
+    re-categorised or deleted) is sent as an `event: slot` message whose data is
+    {"date", "time_slot", "category", "status"}. A comment line is sent every
+    SLOT_EVENTS_KEEPALIVE seconds to keep idle connections open, and the stream is
+    closed after SLOT_EVENTS_MAX_AGE seconds so that subscriptions of disconnected
+    clients are released; EventSource clients reconnect automatically.
+
+    Must be served through the ASGI application.
+    """
+    is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not is_authenticated:
+        return JsonResponse({'result': 'Failed', 'message': 'Authentication required'}, status=401)
+
+    dates = EventBookingManager.requested_dates(request)
+    if not dates:
+        return JsonResponse({'result': 'Failed', 'message': 'Date range required'}, status=400)
+
+    keepalive = getattr(settings, 'SLOT_EVENTS_KEEPALIVE', 15)
+    max_age = getattr(settings, 'SLOT_EVENTS_MAX_AGE', 300)
+
+    async def stream():
+        broadcaster = get_broadcaster()
+        subscription = broadcaster.subscribe(dates)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_age
+        try:
+            yield 'retry: 3000\n\n'
+            while loop.time() < deadline:
+                event = await subscription.get(timeout=min(keepalive, max(deadline - loop.time(), 0)))
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield f'event: slot\ndata: {json.dumps(event)}\n\n'
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 class EventCategoryView(APIView):
     """
     API view to handle Event Category operations.
@@ -34,16 +95,20 @@ class EventCategoryView(APIView):
     @staticmethod
     def get(request):
         """
-        Retrieve all event categories.
+        Retrieve all event categories from the reference data cache.
 
         Returns:
             200 OK: List of all categories.
+            304 Not Modified: If the client's ETag / Last-Modified is still current.
             500 Internal Server Error: If an exception occurs.
         """
         try:
-            categories = EventCategory.objects.all()
-            serializer = EventCategorySerializer(categories, many=True)
-            return Response({'data': serializer.data, "result": "Success"}, status=status.HTTP_200_OK)
+            entry = get_reference_data('categories')
+            not_modified = not_modified_response(request, entry)
+            if not_modified:
+                return not_modified
+            response = Response({'data': entry['data'], "result": "Success"}, status=status.HTTP_200_OK)
+            return set_validators(response, entry)
         except Exception as e:
             return Response({
                 'result': 'Failed',
@@ -120,9 +185,9 @@ class EventCategoryView(APIView):
 
 class TimeSlotView(APIView):
     """
-    API view to manage and retrieve time slots.
+    API view to retrieve time slots.
 
-    Automatically initializes default time slots if none exist.
+    Time slots are seeded with the `seed_timeslots` management command.
     Requires authentication.
     """
     permission_classes = [IsAuthenticated]
@@ -130,38 +195,23 @@ class TimeSlotView(APIView):
     @staticmethod
     def get(request):
         """
-        Retrieve all time slots.
-
-        If no time slots exist, initialize with predefined slots:
-        - 9:00 AM to 12:00 PM
-        - 12:00 PM to 3:00 PM
-        - 3:00 PM to 6:00 PM
+        Retrieve all time slots from the reference data cache.
 
         Returns:
             200 OK: Success response with time slot data.
+            304 Not Modified: If the client's ETag / Last-Modified is still current.
             500 Internal Server Error: If an exception occurs.
         """
         try:
-            if TimeSlot.objects.count() == 0:
-                predefined_slots = [
-                    {"start": time(9, 0), "end": time(12, 0)},
-                    {"start": time(12, 0), "end": time(15, 0)},
-                    {"start": time(15, 0), "end": time(18, 0)},
-                ]
-
-                for slot in predefined_slots:
-                    TimeSlot.objects.create(
-                        start_time=slot["start"],
-                        end_time=slot["end"]
-                    )
-                print("Time slots inserted successfully.")
-
-            slots = TimeSlot.objects.all()
-            serializer = TimeSlotSerializer(slots, many=True)
-            return Response({
+            entry = get_reference_data('timeslots')
+            not_modified = not_modified_response(request, entry)
+            if not_modified:
+                return not_modified
+            response = Response({
                 'status': 'Success',
-                'data': serializer.data
+                'data': entry['data']
             }, status=status.HTTP_200_OK)
+            return set_validators(response, entry)
         except Exception as e:
             return Response({
                 'status': 'Failed',
@@ -197,13 +247,26 @@ class EventAvailabilityView(APIView):
     permission_classes = [IsAuthenticated]
 
     @staticmethod
+    @read_from_replica
     def get(request):
         """
         Fetch availability for provided dates.
+
+        Returns 304 Not Modified without serializing the slots when the client's
+        If-None-Match still matches the availability ETag.
         """
         try:
+            etag = EventBookingManager.availability_etag(request)
+            if etag:
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified:
+                    not_modified['ETag'] = etag
+                    return not_modified
             result = EventBookingManager.fetch_availability(request)
-            return Response(result['body'], status=result['status'])
+            response = Response(result['body'], status=result['status'])
+            if etag:
+                response['ETag'] = etag
+            return response
         except Exception as err:
             return Response({
                 'result': 'Failed',
@@ -212,6 +275,7 @@ class EventAvailabilityView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @staticmethod
+    @pins_primary
     def post(request):
         """
         Create or update availability for a date and time slot.
@@ -227,6 +291,7 @@ class EventAvailabilityView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @staticmethod
+    @pins_primary
     def delete(request):
         """
         Delete a time slot if it's not already booked.
@@ -242,60 +307,336 @@ class EventAvailabilityView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class EventAvailabilityBulkView(APIView):
+    """
+    API view for admins to manage availability over a date range in one request.
+
+    Supports:
+    - POST: Create or update slots for the range.
+    - PUT: Re-categorise unbooked slots in the range.
+    - DELETE: Delete unbooked slots in the range.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @staticmethod
+    @pins_primary
+    def post(request):
+        """
+        Create or update availability for every matching date and time slot.
+        """
+        try:
+            result = EventBookingManager.bulk_create_or_update_availability(request)
+            return Response(result['body'], status=result['status'])
+        except Exception as e:
+            return Response({
+                'result': 'Failed',
+                'message': 'Internal server error.',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    @pins_primary
+    def put(request):
+        """
+        Move every unbooked slot in a date range to a new category.
+        """
+        try:
+            result = EventBookingManager.bulk_update_availability_category(request)
+            return Response(result['body'], status=result['status'])
+        except Exception as e:
+            return Response({
+                'result': 'Failed',
+                'message': 'Internal server error.',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    @pins_primary
+    def delete(request):
+        """
+        Delete every unbooked slot in a date range.
+        """
+        try:
+            result = EventBookingManager.bulk_delete_availability(request)
+            return Response(result['body'], status=result['status'])
+        except Exception as e:
+            return Response({
+                'result': 'Failed',
+                'message': 'Internal server error.',
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OccupancyStatsView(APIView):
+    """
+    API view for admins to read booked vs available slot statistics.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        """
+        Fetch occupancy for a date range: per day and category, per time slot and per category.
+        """
+        try:
+            result = EventBookingManager.fetch_occupancy_stats(request)
+            return Response(result['body'], status=result['status'])
+        except Exception as err:
+            return Response({
+                'result': 'Failed',
+                'message': 'Something went wrong',
+                'error': str(err)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class MetricsView(APIView):
+    """
+    API view exposing the request metrics of this process (admin only).
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        """
+        Per-view latency and query count histograms, DB time, response size and query
+        budget overruns, in the Prometheus text format.
+        """
+        return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class UserBookingAPIView(APIView):
     """
     API view to handle user bookings (GET and POST).
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [BookingRateThrottle]
 
     @staticmethod
+    @read_from_replica
     def get(request):
-        """List all bookings of the logged-in user."""
+        """
+        List all bookings, newest first.
+
+        Query params:
+            - page, page_size: Page number pagination (default).
+            - pagination=cursor, cursor, page_size: Keyset pagination by (booked_at, id);
+              the response carries `next_cursor` for the following page.
+            - count: 'exact' or 'approximate' to include a total count in cursor mode.
+        """
         filters = request.query_params
-        bookings = UserBooking.objects.select_related('event').order_by(
-            '-booked_at', '-cancelled_at'
-        )
-        data, total_no_of_objs = paginator_func(filters, bookings)
-        serializer = UserBookingSerializer(data, many=True)
+        fast = getattr(settings, 'FAST_SERIALIZATION', False)
+        bookings = UserBooking.objects.select_related('event__category', 'event__time_slot', 'user')
+        if fast:
+            bookings = fast_serializers.booking_values(bookings)
+
+        if filters.get('pagination') != 'cursor' and not filters.get('cursor'):
+            data, total_no_of_objs = paginator_func(filters, bookings.order_by('-booked_at', '-cancelled_at'))
+            return Response({
+                "result": "Success",
+                "data": fast_serializers.serialize_bookings(data) if fast else UserBookingSerializer(data, many=True).data,
+                "count": total_no_of_objs
+            }, status=status.HTTP_200_OK)
+
+        try:
+            data, next_cursor = keyset_paginator_func(filters, bookings)
+        except ValueError as err:
+            return Response({"result": "Failed", "message": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+
+        count = None
+        if filters.get('count') == 'exact':
+            count = UserBooking.objects.count()
+        elif filters.get('count') == 'approximate':
+            count = approximate_count(UserBooking)
+
         return Response({
             "result": "Success",
-            "data": serializer.data,
-            "count": total_no_of_objs
+            "data": fast_serializers.serialize_bookings(data) if fast else UserBookingSerializer(data, many=True).data,
+            "count": count,
+            "next_cursor": next_cursor
         }, status=status.HTTP_200_OK)
 
     @staticmethod
+    @pins_primary
     def post(request):
-        """Create a booking using manager logic."""
-        data, code = UserBookingManager.create_booking(request.user, request.data)
+        """
+        Create a booking using manager logic.
+
+        With BOOKING_STRATEGY = 'queued' the request is only queued: the response is
+        202 with a `ticket` to poll at /api/user-bookings/queue/<ticket>/.
+        """
+        if getattr(settings, 'BOOKING_STRATEGY', 'locking') == 'queued':
+            data, code = UserBookingManager.enqueue_booking(request.user, request.data)
+        else:
+            data, code = UserBookingManager.create_booking(request.user, request.data)
         return Response(data, status=code)
 
 
+class BookingTicketView(APIView):
+    """
+    API view to check the outcome of a queued booking request.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def get(request, ticket):
+        """
+        Returns the ticket's status ('PENDING', 'SUCCEEDED' or 'FAILED') and, once
+        processed, the booking response under `booking`.
+        """
+        try:
+            data, code = UserBookingManager.get_booking_intent(request.user, ticket)
+            return Response(data, status=code)
+        except Exception as e:
+            return Response({
+                "result": "Failed",
+                "message": "Something went wrong",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer rows can be streamed.
+    """
+
+    @staticmethod
+    def write(value):
+        return value
+
+
+class UserBookingExportView(APIView):
+    """
+    API view for admins to export booking history as a stream.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    EXPORT_CHUNK_SIZE = 2000
+    CSV_HEADER = [
+        'id', 'user_id', 'username', 'email', 'category', 'date', 'start_time', 'end_time',
+        'event_status', 'status', 'booked_at', 'cancelled_at'
+    ]
+
+    @staticmethod
+    def get(request):
+        """
+        Stream every booking matching the filters, oldest first.
+
+        Query params:
+            - export_format: 'ndjson' (default, one UserBookingSerializer object per line) or 'csv'.
+            - start_date, end_date: Event date range (YYYY-MM-DD).
+            - status: 'ACTIVE' or 'CANCELLED'.
+
+        Rows are read with a chunked iterator and written as they are produced, so
+        memory use does not grow with the size of the export.
+        """
+        filters = request.query_params
+        export_format = filters.get('export_format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            return Response({'result': 'Failed', 'message': 'export_format must be ndjson or csv.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            bookings = UserBookingManager.get_bookings_for_export(filters)
+        except ValueError as err:
+            return Response({'result': 'Failed', 'message': str(err)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = fast_serializers.booking_values(bookings).iterator(chunk_size=UserBookingExportView.EXPORT_CHUNK_SIZE)
+        if export_format == 'csv':
+            lines, content_type = UserBookingExportView.csv_lines(rows), 'text/csv'
+        else:
+            lines, content_type = UserBookingExportView.ndjson_lines(rows), 'application/x-ndjson'
+        # Under ASGI, Django would read a sync iterator into a list before sending it.
+        if isinstance(request._request, ASGIRequest):
+            lines = UserBookingExportView.async_chunks(lines, UserBookingExportView.EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bookings.{export_format}"'
+        return response
+
+    @staticmethod
+    async def async_chunks(lines, size):
+        """
+        Streams a sync line iterator from an async response, advancing it `size` lines
+        at a time in the thread that runs sync code, where its database cursor lives.
+        """
+        next_chunk = sync_to_async(lambda: ''.join(itertools.islice(lines, size)))
+        try:
+            while chunk := await next_chunk():
+                yield chunk
+        finally:
+            await sync_to_async(lines.close)()
+
+    @staticmethod
+    def ndjson_lines(rows):
+        for row in rows:
+            yield json.dumps(fast_serializers.serialize_bookings([row])[0]) + '\n'
+
+    @staticmethod
+    def csv_lines(rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(UserBookingExportView.CSV_HEADER)
+        for row in rows:
+            yield writer.writerow([
+                row['id'], row['user_id'], row['user__username'], row['user__email'],
+                row['event__category__name'], fast_serializers.format_date(row['event__date']),
+                fast_serializers.format_time(row['event__time_slot__start_time']),
+                fast_serializers.format_time(row['event__time_slot__end_time']),
+                row['event__status'], row['status'],
+                fast_serializers.format_datetime(row['booked_at']),
+                fast_serializers.format_datetime(row['cancelled_at']) or '',
+            ])
+
+
 class MyBookingsView(APIView):
     """
     API view to handle retrieval and cancellation of user's bookings.
 
-    - GET: Returns a list of the user's current and past bookings.
+    - GET: Returns a page of the user's current and past bookings.
     - DELETE: Cancels a booking made by the authenticated user.
     """
     permission_classes = [IsAuthenticated]
 
     @staticmethod
+    @read_from_replica
     def get(request):
         """
-        Get all bookings for the authenticated user.
+        Get the authenticated user's bookings, newest first, one page at a time.
+        Pages reaching back past the archive boundary also include archived bookings.
+
+        Query params:
+            - status: 'ACTIVE' or 'CANCELLED'.
+            - when: 'upcoming' or 'past'.
+            - page_size, cursor: Keyset pagination; pass back `next_cursor` for the next page.
 
         Returns:
-            Response: JSON object containing a list of bookings and a success message.
+            Response: JSON object containing a page of bookings and the next page's cursor.
         """
-        bookings = UserBookingManager.get_user_bookings(request.user)
-        serializer = UserMyBookingSerializer(bookings, many=True)
+        filters = request.query_params
+        try:
+            bookings, page_size = keyset_queryset(filters, UserBookingManager.get_user_bookings(request.user, filters))
+            rows = list(bookings)
+            if UserBookingManager.needs_archived_bookings(filters, rows, page_size):
+                archived, _ = keyset_queryset(
+                    filters, UserBookingManager.get_archived_user_bookings(request.user, filters)
+                )
+                rows = keyset_merge([rows, list(archived)], page_size)
+            data, next_cursor = keyset_page(rows, page_size)
+        except ValueError as err:
+            return Response({"result": "Failed", "message": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if getattr(settings, 'FAST_SERIALIZATION', False):
+            data = fast_serializers.serialize_my_bookings(data)
+        else:
+            data = UserMyBookingSerializer(data, many=True).data
         return Response({
             "result": "Success",
-            "data": serializer.data
+            "data": data,
+            "next_cursor": next_cursor
         }, status=status.HTTP_200_OK)
 
     @staticmethod
+    @pins_primary
     def delete(request, pk):
         """
         Cancel a booking made by the authenticated user.
@@ -310,6 +651,44 @@ class MyBookingsView(APIView):
         return Response(response_data, status=code)
 
 
+class WaitlistView(APIView):
+    """
+    API view for the current user's waitlist entries (GET, POST and DELETE).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def get(request):
+        """List the user's waitlist entries for upcoming slots, with their positions."""
+        try:
+            return Response({
+                "result": "Success",
+                "data": list(UserBookingManager.get_user_waitlist(request.user))
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                "result": "Failed",
+                "message": "Something went wrong",
+                "error": str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def post(request):
+        """
+        Join the waitlist of a booked slot given by 'date' and 'time_slot'. When the
+        booking is cancelled, the earliest waitlisted user gets the slot.
+        """
+        data, code = UserBookingManager.join_waitlist(request.user, request.data)
+        return Response(data, status=code)
+
+    @staticmethod
+    def delete(request):
+        """Leave the waitlist of the slot given by 'date' and 'time_slot'."""
+        data, code = UserBookingManager.leave_waitlist(request.user, request.data)
+        return Response(data, status=code)
+
+
 class CheckSessionView(APIView):
     """
     API view to check the current session's authentication status.
@@ -346,6 +725,8 @@ class LoginView(APIView):
     API view to authenticate and log in a user.
     """
 
+    throttle_classes = [LoginRateThrottle]
+
     @staticmethod
     def post(request):
         """
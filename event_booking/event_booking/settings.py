@@ -24,10 +24,11 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # <-- very important: cors middleware before CommonMiddleware
     'django.middleware.security.SecurityMiddleware',
+    'booking_app.middleware.PerformanceMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'booking_app.middleware.SessionAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -55,14 +56,89 @@ WSGI_APPLICATION = 'event_booking.wsgi.application'
 # Database
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Django's SQLite backend, plus BEGIN IMMEDIATE for booking_app.db.write_atomic.
+        'ENGINE': 'booking_app.db_backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # A file rather than the default in-memory database: threads in the
+        # concurrency tests then queue on busy_timeout like separate processes,
+        # instead of failing on shared-cache table locks.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    },
+    # Replica for booking_app.routers, unused until DATABASE_REPLICA_ALIAS = 'replica'.
+    # To try the routing locally, copy db.sqlite3 to this file. Tests read the
+    # primary's test database through it.
+    'replica': {
+        'ENGINE': 'booking_app.db_backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# Applied to every new SQLite connection (booking_app.db.apply_sqlite_pragmas):
+# writers wait up to busy_timeout ms for the lock instead of failing with
+# "database is locked". settings_prod adds WAL; journal_mode is stored in the
+# database file, so setting it here would rewrite the committed db.sqlite3.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'mmap_size': 134217728,
+    'cache_size': -20000,
+}
+
+# Read replica: views marked read_from_replica (availability, booking lists) read from
+# this alias when it is in DATABASES; a session that just wrote stays on 'default' for
+# REPLICA_PIN_SECONDS (booking_app.routers).
+DATABASE_ROUTERS = ['booking_app.routers.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = None
+REPLICA_PIN_SECONDS = 10
+
+# Slots (and their bookings) dated more than ARCHIVE_AFTER_DAYS ago are moved to the
+# archive tables by `manage.py archive_history`; /api/my-bookings/ still lists them.
+ARCHIVE_AFTER_DAYS = 90
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Cache alias backing categories and time slots (see booking_app.reference_cache)
+REFERENCE_DATA_CACHE_ALIAS = 'default'
+
 # Authentication model (if you have custom user)
 AUTH_USER_MODEL = 'booking_app.User'
 
+# Sessions live in the database. 'django.contrib.sessions.backends.cached_db' reads them
+# through SESSION_CACHE_ALIAS, but only use it with a cache shared by every process
+# (Redis, Memcached): with the per-process LocMemCache, other workers keep serving a
+# session after logout. settings_prod switches to it when such a cache is configured.
+# 'django.contrib.sessions.backends.signed_cookies' keeps sessions client-side instead.
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+SESSION_CACHE_ALIAS = 'default'
+
+# request.user is loaded through a short-lived per-process cache (booking_app.auth_backends).
+# A single backend, as authenticate() tries each one and a failed login would hash the
+# password once per backend. Sessions logged in through ModelBackend are moved over by
+# booking_app.middleware.SessionAuthenticationMiddleware.
+AUTHENTICATION_BACKENDS = [
+    'booking_app.auth_backends.CachedModelBackend',
+]
+USER_CACHE_TTL = 30
+
+# Password hashing: the first hasher hashes new passwords, the others only verify
+# existing hashes, which are rehashed with the first one on the user's next login
+# (as are PBKDF2 hashes made with a different PASSWORD_HASH_ITERATIONS).
+PASSWORD_HASHERS = [
+    'booking_app.hashing.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = 600000
+# Processes hashing passwords for the async login/register views (0: threads instead).
+PASSWORD_HASH_WORKERS = 2
+
 # CORS CONFIGURATION
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
@@ -88,6 +164,46 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
     ),
+    # Trusted reverse proxies in front of the app. Rate limits key clients by the
+    # address this many hops back in X-Forwarded-For; 0 uses REMOTE_ADDR and ignores
+    # the header, which clients can otherwise forge to get a fresh bucket.
+    'NUM_PROXIES': 0,
 }
 
+# Booking strategy used by UserBookingManager.create_booking:
+# 'locking' locks the slot with select_for_update(nowait=True),
+# 'optimistic' claims it with a conditional UPDATE on status.
+# 'queued' only records the request; booking_app.booking_queue books it in arrival order.
+BOOKING_STRATEGY = 'locking'
+
+# Queue worker for the 'queued' strategy: 'thread' runs it inside the web process,
+# which only keeps FIFO order with a single process such as the development server;
+# None expects one `manage.py process_booking_queue` per database (settings_prod).
+BOOKING_QUEUE_WORKER = 'thread'
+BOOKING_QUEUE_POLL_INTERVAL = 1.0
+
+# Serialize availability and booking lists from .values() rows with plain dicts
+# (booking_app.fast_serializers) instead of the nested DRF serializers.
+FAST_SERIALIZATION = True
+
+# Largest page_size accepted by page and cursor pagination (booking_app.paginator).
+MAX_PAGE_SIZE = 100
+
+# Slot status push (Server-Sent Events at /api/availability/events/)
+SLOT_EVENTS_BROADCASTER = 'booking_app.broadcaster.InMemoryBroadcaster'
+SLOT_EVENTS_KEEPALIVE = 15
+SLOT_EVENTS_MAX_AGE = 300
+
+# Token bucket rate limits (booking_app.throttling) per scope and bucket kind,
+# as 'capacity/period'; 429 with Retry-After once a bucket is empty.
+RATE_LIMIT_STORE = 'booking_app.throttling.InMemoryBucketStore'
+RATE_LIMIT_CACHE_ALIAS = 'default'
+RATE_LIMITS = {
+    'booking': {'user': '10/min', 'ip': '60/min'},
+    'login': {'ip': '20/min'},
+}
 
+# Request instrumentation (booking_app.middleware.PerformanceMiddleware): Server-Timing
+# headers, per-view metrics at /api/metrics/, and a warning above this many queries.
+PERF_SERVER_TIMING = True
+PERF_QUERY_BUDGET = 30
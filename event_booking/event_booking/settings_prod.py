@@ -0,0 +1,142 @@
+"""
+Production settings: `DJANGO_SETTINGS_MODULE=event_booking.settings_prod`.
+
+Everything not overridden here comes from settings.py (the development settings).
+Configuration is read from environment variables:
+
+    DJANGO_SECRET_KEY       required
+    DJANGO_ALLOWED_HOSTS    comma-separated host names
+    DJANGO_DEBUG            '1' to enable DEBUG (keeps every query in memory; avoid)
+    CORS_ALLOWED_ORIGINS    comma-separated origins of the UI; also trusted for CSRF
+    DB_ENGINE               'sqlite' (default) or 'postgresql'
+    DB_NAME                 SQLite file path or PostgreSQL database name
+    DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+                            PostgreSQL connection parameters
+    DB_CONN_MAX_AGE         seconds to keep a connection open between requests (default 60)
+    DB_REPLICA_NAME, DB_REPLICA_HOST, DB_REPLICA_PORT
+                            read replica, used by the read-only views when either name or
+                            host is set; other settings are shared with the primary
+    CACHE_BACKEND           'locmem' (default, per process), 'redis' (needs the redis
+                            package) or 'memcached' (needs pymemcache); shared by
+                            every process, it also enables cached_db sessions
+    CACHE_LOCATION          comma-separated server URLs or host:port pairs
+    DJANGO_NUM_PROXIES           reverse proxies in front of the app that append to
+                            X-Forwarded-For (default 0: rate limit by REMOTE_ADDR)
+    BOOKING_QUEUE_WORKER    'thread' to book queued intents inside the web process (a
+                            single process only); by default run one
+                            `manage.py process_booking_queue` per database instead
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, CACHES, REST_FRAMEWORK, SQLITE_PRAGMAS
+
+
+def env_list(name, default=''):
+    return [item.strip() for item in os.environ.get(name, default).split(',') if item.strip()]
+
+
+def database_from_env(prefix='DB_'):
+    """
+    Builds a database from the environment variables named `prefix` + NAME, USER,
+    PASSWORD, HOST and PORT, falling back to the DB_* ones.
+
+    Connections are kept open for DB_CONN_MAX_AGE seconds and checked before reuse
+    (CONN_HEALTH_CHECKS), so requests skip the connect, and for SQLite the
+    per-connection PRAGMAs, without being handed a connection that has gone away.
+    Under ASGI, each thread running sync database code keeps its own connection.
+    """
+    engine = os.environ.get('DB_ENGINE', 'sqlite')
+    conn_max_age = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+
+    def env(name, default=''):
+        return os.environ.get(prefix + name, os.environ.get('DB_' + name, default))
+
+    if engine == 'sqlite':
+        return {
+            'ENGINE': 'booking_app.db_backends.sqlite3',
+            'NAME': env('NAME', str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': conn_max_age,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    if engine == 'postgresql':
+        return {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env('NAME', 'event_booking'),
+            'USER': env('USER'),
+            'PASSWORD': env('PASSWORD'),
+            'HOST': env('HOST'),
+            'PORT': env('PORT'),
+            'CONN_MAX_AGE': conn_max_age,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE '{engine}', expected 'sqlite' or 'postgresql'.")
+
+
+def cache_from_env():
+    """
+    Builds the default cache from CACHE_BACKEND and CACHE_LOCATION. Sessions, rate
+    limits and reference data go through it, so deployments with several processes
+    need Redis or Memcached; LocMemCache is kept for a single process.
+    """
+    backend = os.environ.get('CACHE_BACKEND', 'locmem')
+    location = env_list('CACHE_LOCATION')
+
+    if backend == 'locmem':
+        return dict(CACHES['default'])
+    if backend == 'redis':
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': location or 'redis://127.0.0.1:6379/1',
+        }
+    if backend == 'memcached':
+        return {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': location or '127.0.0.1:11211',
+        }
+    raise ImproperlyConfigured(
+        f"Unsupported CACHE_BACKEND '{backend}', expected 'locmem', 'redis' or 'memcached'."
+    )
+
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Set the DJANGO_SECRET_KEY environment variable.')
+
+DEBUG = os.environ.get('DJANGO_DEBUG') == '1'
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', 'localhost')
+
+DATABASES = {
+    'default': database_from_env(),
+}
+if os.environ.get('DB_REPLICA_NAME') or os.environ.get('DB_REPLICA_HOST'):
+    # Tests read the primary's test database through the replica alias.
+    DATABASES['replica'] = {**database_from_env('DB_REPLICA_'), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICA_ALIAS = 'replica'
+
+# WAL lets reads run alongside the single writer; with WAL, synchronous=NORMAL only
+# syncs at checkpoints and stays safe against corruption.
+SQLITE_PRAGMAS = {**SQLITE_PRAGMAS, 'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'NUM_PROXIES': int(os.environ.get('DJANGO_NUM_PROXIES', 0))}
+
+CACHES = {
+    'default': cache_from_env(),
+}
+
+# Cached sessions need a cache every process shares, or a logout in one worker leaves
+# the session alive in the others.
+if CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache':
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Every web worker process would start its own queue thread, breaking FIFO order.
+BOOKING_QUEUE_WORKER = os.environ.get('BOOKING_QUEUE_WORKER') or None
+
+CORS_ALLOWED_ORIGINS = env_list('CORS_ALLOWED_ORIGINS', 'http://127.0.0.1:5173')
+CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
+
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import useAxios from '../../useAxios';
 import { Modal, Button, Form, Toast, ToastContainer, Card } from 'react-bootstrap';
-import { Pencil, Plus, Trash } from 'lucide-react';
+import { Clock, Pencil, Plus, Trash } from 'lucide-react';
 import { useSelector } from 'react-redux';
 
 const CalendarSlotManager = () => {
@@ -15,6 +15,7 @@ const CalendarSlotManager = () => {
   const [confirmModal, setConfirmModal] = useState(false);
   const [selectedSlot, setSelectedSlot] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('');
+  const [capacity, setCapacity] = useState('');
   const [filterCategory, setFilterCategory] = useState('');
   const [maxSlotCount, setMaxSlotCount] = useState(1);
 
@@ -22,6 +23,7 @@ const CalendarSlotManager = () => {
   const [catResp, , , fetchCategories] = useAxios();
   const [slotResp, , , fetchSlots] = useAxios();
   const [submitResp, , , submitAvailability] = useAxios();
+  const [ticketResp, , , fetchTicket] = useAxios();
 
   const [currentWeekStart, setCurrentWeekStart] = useState(() => {
     const today = new Date();
@@ -60,10 +62,30 @@ const CalendarSlotManager = () => {
     if (submitResp?.result === 'Success') {
       setToast({ show: true, message: submitResp?.message, variant: 'success' });
     } else if (submitResp?.result === 'Failed') {
-      setToast({ show: true, message: submitResp?.message || 'An error occurred.', variant: 'danger' });
+      setToast({ show: true, message: submitResp?.message || submitResp?.error || 'An error occurred.', variant: 'danger' });
+    } else if (submitResp?.result === 'Queued') {
+      fetchTicket({ method: 'GET', url: `/api/user-bookings/queue/${submitResp.ticket}/` });
     }
   }, [submitResp]);
 
+  // Queued bookings: poll the ticket until the booking worker has processed it.
+  useEffect(() => {
+    if (ticketResp?.status === 'PENDING') {
+      const timer = setTimeout(() => {
+        fetchTicket({ method: 'GET', url: `/api/user-bookings/queue/${ticketResp.ticket}/` });
+      }, 500);
+      return () => clearTimeout(timer);
+    }
+    if (ticketResp?.status === 'SUCCEEDED') {
+      setToast({ show: true, message: ticketResp.booking?.message, variant: 'success' });
+    } else if (ticketResp?.status === 'FAILED') {
+      setToast({ show: true, message: ticketResp.booking?.error || 'An error occurred.', variant: 'danger' });
+    }
+    if (ticketResp?.status) {
+      fetchAvailability({ method: 'GET', url: '/api/availability/', params: { dates: weekDates } });
+    }
+  }, [ticketResp]);
+
   useEffect(() => {
     calculateMaxSlotCount();
   }, [availability, filterCategory]);
@@ -99,6 +121,7 @@ const CalendarSlotManager = () => {
 
     if (userRole === 'admin') {
       setSelectedSlot({ date, slot: slotId, category, categoryId });
+      setCapacity(slotData?.capacity || 1);
       setShowModal(true);
     }
   };
@@ -110,7 +133,8 @@ const CalendarSlotManager = () => {
       data: {
         date: selectedSlot.date,
         time_slot: selectedSlot.slot,
-        category: selectedCategory || selectedSlot?.categoryId
+        category: selectedCategory || selectedSlot?.categoryId,
+        capacity: capacity || 1
       }
     });
     setConfirmModal(false);
@@ -134,6 +158,14 @@ const CalendarSlotManager = () => {
     setSelectedCategory('');
   };
 
+  const handleJoinWaitlist = (date, slotId) => {
+    submitAvailability({
+      method: 'POST',
+      url: '/api/waitlist/',
+      data: { date, time_slot: slotId }
+    });
+  };
+
   const handleDeleteSlot = () => {
     submitAvailability({
       method: 'DELETE',
@@ -146,6 +178,7 @@ const CalendarSlotManager = () => {
 
   const handleCloseModal = () => {
   setSelectedCategory('');  
+  setCapacity('');
   setShowModal(false);
   };
 
@@ -234,17 +267,25 @@ const CalendarSlotManager = () => {
                           <div>
                             <div>{formatTime(slot.start_time)} - {formatTime(slot.end_time)}</div>
                             <div className="small text-muted">{slotData?.category?.name || 'N/A'}</div>
-                            {isBooked && auth?.is_admin && <div className="fw-bold" >Booked by: {slotData.user?.name}</div>}
+                            {slotData?.capacity > 1 && (
+                              <div className="small">{slotData.remaining_seats} of {slotData.capacity} seats left</div>
+                            )}
+                            {isBooked && auth?.is_admin && !(slotData.capacity > 1) && <div className="fw-bold" >Booked by: {slotData.user?.name}</div>}
                           </div>
 
                           {!isPastSlot() && (
                             <div>
                               {userRole === 'user' ? (
-                                !isBooked && slotData?.category ? (
+                                !isBooked && !selfBooked && slotData?.category ? (
                                   <Plus role="button" size={16} onClick={() =>
                                     handleSlotClick(date, slot.id, slotData?.category?.name, slotData?.category?.id)}
                                     className="text-success"
                                   />
+                                ) : isBooked && !selfBooked ? (
+                                  <Clock role="button" size={16} title="Join waitlist"
+                                    onClick={() => handleJoinWaitlist(date, slot.id)}
+                                    className="text-warning"
+                                  />
                                 ) : null
                               ) : (
                                 !isBooked &&
@@ -281,6 +322,10 @@ const CalendarSlotManager = () => {
             <option value="">Select Category</option>
             {categories.map(c => <option key={c.id} value={c.id}>{c.name}</option>)}
           </Form.Select>
+          <Form.Group className="mt-3">
+            <Form.Label>Seats</Form.Label>
+            <Form.Control type="number" min={1} value={capacity} onChange={(e) => setCapacity(e.target.value)} />
+          </Form.Group>
         </Modal.Body>
         <Modal.Footer>
           <Button variant="secondary" onClick={handleCloseModal}>Cancel</Button>
@@ -5,16 +5,27 @@ import moment from 'moment';
 
 const MyBookingsPage = () => {
   const [bookings, setBookings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [bookingResp, , loading, fetchBookings] = useAxios();
   const [, , , deleteBooking] = useAxios(); // for cancel/delete
 
+  const loadBookings = (cursor) => {
+    fetchBookings({
+      method: 'GET',
+      url: '/api/my-bookings/',
+      params: cursor ? { page_size: 20, cursor } : { page_size: 20 },
+    });
+  };
+
   useEffect(() => {
-    fetchBookings({ method: 'GET', url: '/api/my-bookings/' });
+    loadBookings();
   }, []);
 
   useEffect(() => {
     if (bookingResp?.result === 'Success') {
-      setBookings(bookingResp.data);
+      // Pages after the first are appended ("Load more").
+      setBookings((prev) => (nextCursor ? [...prev, ...bookingResp.data] : bookingResp.data));
+      setNextCursor(bookingResp.next_cursor);
     }
   }, [bookingResp]);
 
@@ -47,7 +58,7 @@ const MyBookingsPage = () => {
     <div className=" mt-4">
       <h3 className="mb-4 text-center">📅 My Bookings</h3>
 
-      {loading ? (
+      {loading && bookings.length === 0 ? (
         <div className="text-center my-5">
           <Spinner animation="border" variant="primary" />
         </div>
@@ -97,6 +108,11 @@ const MyBookingsPage = () => {
       </Card.Body>
     </Card>
   ))}
+  {nextCursor && (
+    <Button variant="outline-primary" disabled={loading} onClick={() => loadBookings(nextCursor)}>
+      {loading ? 'Loading...' : 'Load more'}
+    </Button>
+  )}
 </div>
 
       )}